@@ -1,6 +1,10 @@
 from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter, SimpleRouter
 
+from kyc_aml.api.views import DocumentUploadViewSet
+from kyc_aml.views import local_upload_view
+from locations.api.views import CityViewSet, StateViewSet
 from vigolend.users.api.views import UserViewSet
 
 if settings.DEBUG:
@@ -9,7 +13,16 @@ else:
     router = SimpleRouter()
 
 router.register("users", UserViewSet)
+router.register("states", StateViewSet, basename="state")
+router.register("cities", CityViewSet, basename="city")
+router.register("kyc-uploads", DocumentUploadViewSet, basename="kyc-upload")
 
 
 app_name = "api"
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path(
+        "kyc-uploads/local/<str:token>/",
+        local_upload_view,
+        name="kyc-local-upload",
+    ),
+]
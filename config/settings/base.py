@@ -133,6 +133,7 @@ MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "vigolend.utils.performance.PerformanceMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -156,6 +157,11 @@ STATICFILES_FINDERS = [
     "django.contrib.staticfiles.finders.FileSystemFinder",
     "django.contrib.staticfiles.finders.AppDirectoriesFinder",
 ]
+# Static files build (`manage.py build_static`): worker processes minifying and
+# compressing (one per CPU by default), and the directory their results are
+# reused from by later builds.
+STATICFILES_PROCESSES = env.int("STATICFILES_PROCESSES", default=None)
+STATICFILES_BUILD_CACHE = env("STATICFILES_BUILD_CACHE", default=str(ROOT_DIR / ".cache" / "staticfiles"))
 
 # MEDIA
 # ------------------------------------------------------------------------------
@@ -249,19 +255,94 @@ LOGGING = {
         "verbose": {
             "format": "%(levelname)s %(asctime)s %(module)s "
             "%(process)d %(thread)d %(message)s"
-        }
+        },
+        "message": {"format": "%(message)s"},
     },
     "handlers": {
         "console": {
             "level": "DEBUG",
             "class": "logging.StreamHandler",
             "formatter": "verbose",
-        }
+        },
+        # One JSON object per line.
+        "structured": {
+            "level": "DEBUG",
+            "class": "logging.StreamHandler",
+            "formatter": "message",
+        },
     },
     "root": {"level": "INFO", "handlers": ["console"]},
+    "loggers": {
+        "vigolend.utils.performance": {
+            "level": "INFO",
+            "handlers": ["structured"],
+            "propagate": False,
+        },
+    },
 }
 
 
+# Celery
+# ------------------------------------------------------------------------------
+if USE_TZ:
+    # http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-timezone
+    CELERY_TIMEZONE = TIME_ZONE
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-broker_url
+CELERY_BROKER_URL = env(
+    "CELERY_BROKER_URL", default=env("REDIS_URL", default="redis://localhost:6379/0")
+)
+# Priorities 0 (highest) to 9 are served from separate Redis lists.
+# http://docs.celeryproject.org/en/latest/userguide/routing.html#redis-message-priorities
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-task_default_priority
+CELERY_TASK_DEFAULT_PRIORITY = 5
+# Nothing reads task results back.
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-task_ignore_result
+CELERY_TASK_IGNORE_RESULT = True
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-accept_content
+CELERY_ACCEPT_CONTENT = ["json"]
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#std:setting-task_serializer
+CELERY_TASK_SERIALIZER = "json"
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-time-limit
+CELERY_TASK_TIME_LIMIT = 5 * 60
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-soft-time-limit
+CELERY_TASK_SOFT_TIME_LIMIT = 60
+# Tasks are acknowledged once done, so a crashed worker's tasks are redelivered,
+# and workers reserve one task at a time, so priorities are honoured.
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-acks-late
+CELERY_TASK_ACKS_LATE = True
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#worker-prefetch-multiplier
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+# Per worker rate limits.
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#task-annotations
+CELERY_TASK_ANNOTATIONS = {
+    "vigolend.users.tasks.send_email_message": {
+        "rate_limit": env("EMAIL_TASK_RATE_LIMIT", default="120/m")
+    },
+}
+# http://docs.celeryproject.org/en/latest/userguide/configuration.html#beat-schedule
+CELERY_BEAT_SCHEDULE = {
+    "release-stale-kyc-review-claims": {
+        "task": "kyc_aml.tasks.release_stale_review_claims",
+        "schedule": 15 * 60,
+    },
+    "refresh-kyc-funnel": {
+        "task": "kyc_aml.tasks.refresh_kyc_funnel",
+        "schedule": 5 * 60,
+    },
+    "sweep-expired-kyc-documents": {
+        "task": "kyc_aml.tasks.sweep_expired_kyc_documents",
+        "schedule": 60 * 60,
+    },
+    "maintain-kyc-partitions": {
+        "task": "kyc_aml.tasks.maintain_kyc_partitions",
+        "schedule": 24 * 60 * 60,
+    },
+}
 # django-allauth
 # ------------------------------------------------------------------------------
 ACCOUNT_ALLOW_REGISTRATION = env.bool("DJANGO_ACCOUNT_ALLOW_REGISTRATION", True)
@@ -312,6 +393,32 @@ REST_FRAMEWORK = {
 CORS_URLS_REGEX = r"^/api/.*$"
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Memory-mapped locations snapshot, built with `manage.py export_locations_snapshot`.
+LOCATIONS_SNAPSHOT_PATH = env(
+    "LOCATIONS_SNAPSHOT_PATH", default=str(ROOT_DIR / "locations.snapshot")
+)
+# Consolidated sanctions/PEP list (CSV) applicants are screened against.
+KYC_SCREENING_LIST_PATH = env(
+    "KYC_SCREENING_LIST_PATH", default=str(ROOT_DIR / "screening_list.csv")
+)
+# Verified applications whose ID expires within this many days are unverified.
+KYC_ID_EXPIRY_NOTICE_DAYS = env.int("KYC_ID_EXPIRY_NOTICE_DAYS", default=14)
+# Monthly partitions of KYC tables older than this are detached to the archive
+# schema; unset keeps every partition attached.
+KYC_PARTITION_RETENTION_MONTHS = env.int("KYC_PARTITION_RETENTION_MONTHS", default=None)
+# Marketing pages: seconds rendered pages are kept in the cache (they are also
+# invalidated on change), and seconds browsers and CDNs may reuse them.
+FRONTEND_CACHE_TIMEOUT = env.int("FRONTEND_CACHE_TIMEOUT", default=60 * 60 * 24)
+FRONTEND_CACHE_MAX_AGE = env.int("FRONTEND_CACHE_MAX_AGE", default=5 * 60)
+# Static export of the public pages, built with `manage.py prerender_pages`.
+FRONTEND_EXPORT_ROOT = env("FRONTEND_EXPORT_ROOT", default=str(ROOT_DIR / "prerendered"))
+# Request profiling (`vigolend.utils.performance`): share of the requests
+# profiled, from 0 to 1, whether profiles are sent to staff users in a
+# `Server-Timing` header, and how many runs of one SQL statement in a request
+# are flagged as N+1.
+PERFORMANCE_SAMPLE_RATE = env.float("PERFORMANCE_SAMPLE_RATE", default=0.01)
+PERFORMANCE_SERVER_TIMING = env.bool("PERFORMANCE_SERVER_TIMING", default=False)
+PERFORMANCE_N_PLUS_ONE_THRESHOLD = env.int("PERFORMANCE_N_PLUS_ONE_THRESHOLD", default=10)
 
 JAZZMIN_SETTINGS = {
     # title of the window (Will default to current_admin_site.site_title if absent or None)
@@ -392,6 +499,12 @@ JAZZMIN_SETTINGS = {
 
     # Custom links to append to app groups, keyed on app name
     "custom_links": {
+        "kyc_aml": [{
+            "name": "KYC Dashboard",
+            "url": "admin:kyc_aml_kycapplication_dashboard",
+            "icon": "fas fa-chart-line",
+            "permissions": ["kyc_aml.view_kycapplication"]
+        }],
         "books": [{
             "name": "Make Messages",
             "url": "make_messages",
@@ -79,7 +79,7 @@ AWS_S3_CUSTOM_DOMAIN = env("DJANGO_AWS_S3_CUSTOM_DOMAIN", default=None)
 aws_s3_domain = AWS_S3_CUSTOM_DOMAIN or f"{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com"
 # STATIC
 # ------------------------
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+STATICFILES_STORAGE = "vigolend.utils.staticfiles.MinifiedManifestStaticFilesStorage"
 # MEDIA
 # ------------------------------------------------------------------------------
 DEFAULT_FILE_STORAGE = "vigolend.utils.storages.MediaRootS3Boto3Storage"
@@ -165,7 +165,8 @@ LOGGING = {
         "verbose": {
             "format": "%(levelname)s %(asctime)s %(module)s "
             "%(process)d %(thread)d %(message)s"
-        }
+        },
+        "message": {"format": "%(message)s"},
     },
     "handlers": {
         "mail_admins": {
@@ -178,6 +179,12 @@ LOGGING = {
             "class": "logging.StreamHandler",
             "formatter": "verbose",
         },
+        # One JSON object per line.
+        "structured": {
+            "level": "DEBUG",
+            "class": "logging.StreamHandler",
+            "formatter": "message",
+        },
     },
     "root": {"level": "INFO", "handlers": ["console"]},
     "loggers": {
@@ -191,6 +198,11 @@ LOGGING = {
             "handlers": ["console", "mail_admins"],
             "propagate": True,
         },
+        "vigolend.utils.performance": {
+            "level": "INFO",
+            "handlers": ["structured"],
+            "propagate": False,
+        },
     },
 }
 
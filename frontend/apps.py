@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class FrontendConfig(AppConfig):
     name = 'frontend'
+
+    def ready(self):
+        import frontend.signals  # noqa F401
@@ -0,0 +1,77 @@
+"""
+Caching of the public marketing pages.
+
+The pages are the same for every visitor but for their language, so whole
+rendered pages are cached per language and path in the shared ``default``
+cache (Redis in production). A cache hit neither queries the database nor
+renders a template. Parts of a page built from the database are cached as
+template fragments as well, so a page only re-renders what changed.
+
+Both are keyed by a version number, bumped when a ``TeamMember`` changes
+(see ``signals.py``): stale entries are never read again and simply expire.
+Responses carry an ``ETag`` and a public ``Cache-Control`` max-age, so
+browsers and CDNs revalidate or reuse them too, and vary on both inputs of
+the language: ``Accept-Language`` and the language cookie.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers, set_response_etag
+
+VERSION_KEY = 'frontend:pages:version'
+PAGE_KEY = 'frontend:page:{version}:{language}:{path}'
+
+
+def pages_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def invalidate():
+    """Publish a new version, so that every cached page and fragment is rebuilt."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def page_key(request, version):
+    # The query string is ignored: the pages do not depend on it, and
+    # tracking parameters would otherwise fill the cache with copies.
+    return PAGE_KEY.format(version=version, language=translation.get_language(), path=request.path)
+
+
+def cached_page(view):
+    """
+    Serve a marketing page from the cache, rendering and storing it on a miss.
+    Only ``GET`` and ``HEAD`` requests answered with 200 are cached.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        version = request.pages_version = pages_version()
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        key = page_key(request, version)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type, etag = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['ETag'] = etag
+        else:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming:
+                return response
+            set_response_etag(response)
+            cache.set(key, (response.content, response['Content-Type'], response['ETag']),
+                      settings.FRONTEND_CACHE_TIMEOUT)
+        patch_cache_control(response, public=True, max_age=settings.FRONTEND_CACHE_MAX_AGE)
+        # The language comes from the language cookie or else Accept-Language.
+        patch_vary_headers(response, ('Accept-Language', 'Cookie'))
+        return get_conditional_response(request, etag=response['ETag'], response=response)
+    return wrapper
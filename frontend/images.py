@@ -0,0 +1,92 @@
+"""
+Responsive renditions of ``TeamMember`` photos.
+
+Uploaded photos are resized to each of ``WIDTHS`` (never upscaled) and
+encoded as AVIF, WebP and JPEG, as far as the installed Pillow can write
+them. Renditions are stored through the photo's storage under
+``variants/`` next to the original; the list of renditions is kept on the
+member (``photo_variants``), so pages build their ``srcset`` without
+asking the storage what exists. Rendering runs on a Celery worker, after
+the upload has been saved.
+"""
+import io
+import os
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+WIDTHS = (160, 320, 640, 960)
+QUALITY = 80
+
+
+def _can_write(image_format):
+    Image.init()
+    return image_format in Image.SAVE
+
+
+# (Pillow format, MIME type, extension), preferred first. AVIF needs a Pillow
+# built with libavif.
+FORMATS = tuple(
+    (image_format, mime_type, extension)
+    for image_format, mime_type, extension in (
+        ('AVIF', 'image/avif', '.avif'),
+        ('WEBP', 'image/webp', '.webp'),
+        ('JPEG', 'image/jpeg', '.jpg'),
+    )
+    if _can_write(image_format)
+)
+
+
+def variant_name(name, width, extension):
+    """Storage name of the rendition ``width`` pixels wide of the image stored as ``name``."""
+    directory, filename = os.path.split(name)
+    return '{}/variants/{}-{}w{}'.format(directory, os.path.splitext(filename)[0], width, extension)
+
+
+def render_variants(content, widths=WIDTHS):
+    """
+    Return ``[(width, format, bytes)]`` for the image ``content``. Images
+    narrower than a width get a single rendition at their own width instead.
+    """
+    variants = []
+    with Image.open(io.BytesIO(content)) as original:
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ('RGB', 'L'):
+            original = original.convert('RGB')
+        sizes = sorted({min(width, original.width) for width in widths})
+        for width in sizes:
+            image = original.resize((width, max(1, round(original.height * width / original.width))),
+                                    Image.LANCZOS)
+            for image_format, _, _ in FORMATS:
+                output = io.BytesIO()
+                image.save(output, image_format, quality=QUALITY)
+                variants.append((width, image_format, output.getvalue()))
+    return variants
+
+
+def generate_variants(photo):
+    """
+    Render and store the renditions of the image field file ``photo``.
+    Returns the manifest to keep in ``TeamMember.photo_variants``.
+    """
+    storage = photo.storage
+    with storage.open(photo.name, 'rb') as source:
+        content = source.read()
+    extensions = {image_format: (mime_type, extension) for image_format, mime_type, extension in FORMATS}
+    variants = {}
+    for width, image_format, data in render_variants(content):
+        mime_type, extension = extensions[image_format]
+        name = variant_name(photo.name, width, extension)
+        if storage.exists(name):
+            storage.delete(name)
+        variants.setdefault(mime_type, []).append([width, storage.save(name, ContentFile(data))])
+    return {'source': photo.name, 'variants': variants}
+
+
+def srcset(photo, manifest, mime_type):
+    """The ``srcset`` attribute of the ``mime_type`` renditions of ``photo``, empty if there are none."""
+    if not photo or manifest.get('source') != photo.name:
+        # Not generated yet, or generated for a previous photo.
+        return ''
+    return ', '.join(
+        '{} {}w'.format(photo.storage.url(name), width) for width, name in manifest['variants'].get(mime_type, ()))
@@ -0,0 +1,44 @@
+import os
+import time
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+from vigolend.utils.staticfiles import compress_directory
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the static files for a deploy: compress the offline compressor bundles, then collect, minify, "
+        "hash and precompress the static files, reusing the results of earlier builds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=settings.STATICFILES_PROCESSES,
+                            help="Worker processes (default: one per CPU, 0: none).")
+
+    def handle(self, *args, **options):
+        if options['processes'] is not None:
+            settings.STATICFILES_PROCESSES = options['processes']
+        started = time.monotonic()
+        steps = []
+        if settings.COMPRESS_ENABLED and settings.COMPRESS_OFFLINE:
+            call_command('compress', verbosity=0)
+            steps.append(('Bundles', compress_directory(
+                os.path.join(settings.COMPRESS_ROOT, settings.COMPRESS_OUTPUT_DIR))))
+        call_command('collectstatic', interactive=False, verbosity=0)
+        # Only set by MinifiedManifestStaticFilesStorage.
+        for label, attribute in (('Minified', 'minified'), ('Compressed', 'compressed')):
+            stats = getattr(staticfiles_storage, attribute, None)
+            if stats is not None:
+                steps.append((label, stats))
+
+        for label, stats in steps:
+            self.stdout.write("{}: {} files processed, {} reused, {} -> {}, saved {:.1f}s".format(
+                label, stats.processed, stats.cached, filesizeformat(stats.size),
+                filesizeformat(stats.output_size), stats.time_saved))
+        self.stdout.write(self.style.SUCCESS("Built the static files in {:.1f}s, saved {:.1f}s".format(
+            time.monotonic() - started, sum(stats.time_saved for _, stats in steps))))
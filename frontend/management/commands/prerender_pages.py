@@ -0,0 +1,21 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from frontend.prerender import export
+
+
+class Command(BaseCommand):
+    help = "Pre-render the public pages in every language into compressed static files."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.FRONTEND_EXPORT_ROOT, help="Export directory.")
+        parser.add_argument('--incremental', action='store_true',
+                            help="Only render pages whose templates or team members changed since the last export.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        written, unchanged, skipped = export(options['output'], incremental=options['incremental'])
+        self.stdout.write(self.style.SUCCESS("Wrote {} pages ({} unchanged, {} skipped) in {:.1f}s".format(
+            written, unchanged, skipped, time.monotonic() - started)))
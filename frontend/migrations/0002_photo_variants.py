@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frontend', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teammember',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized renditions of the photo, by MIME type (see frontend.images).', verbose_name='Photo Variants'),
+        ),
+    ]
@@ -34,6 +34,13 @@ class TeamMember(BaseModel):
         upload_to='team',
         help_text=_("The photo of the team member."))
 
+    photo_variants = models.JSONField(
+        verbose_name=_("Photo Variants"),
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_("Resized renditions of the photo, by MIME type (see frontend.images)."))
+
     # Metadata
     class Meta:
         verbose_name = _("Team Member")
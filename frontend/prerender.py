@@ -0,0 +1,160 @@
+"""
+Static export of the public pages.
+
+Every page of ``PAGES`` is rendered through its view for every language with
+translations in ``LOCALE_PATHS`` and written as ``<path>/index.html`` under
+the export directory, next to gzip and Brotli compressed copies. Pages in
+the default language are written at the root, other languages under
+``/<language>/``. Whitenoise (``WHITENOISE_ROOT``) or a CDN can then serve
+them without running Django.
+
+``prerender.json`` in the export directory records, per page and language,
+a fingerprint of what the page was rendered from: the template files and
+the rows of the models it shows. An incremental export only renders the
+pages whose fingerprint changed, and only rewrites files whose content did.
+"""
+import gzip
+import hashlib
+import json
+import os
+
+import brotli
+from django.conf import settings
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils import translation
+
+from . import cache
+from .models import TeamMember
+
+# (URL name, models the page shows)
+PAGES = (
+    ('index', ()),
+    ('borrow', ()),
+    ('invest', ()),
+    ('about_us', (TeamMember,)),
+    ('teams', ()),
+    ('about', (TeamMember,)),
+)
+MANIFEST_NAME = 'prerender.json'
+
+
+def languages():
+    """The default language, then every language with translations in ``LOCALE_PATHS``."""
+    found = [settings.LANGUAGE_CODE]
+    for locale_path in settings.LOCALE_PATHS:
+        if not os.path.isdir(locale_path):
+            continue
+        for entry in sorted(os.listdir(locale_path)):
+            language = translation.to_language(entry)
+            if os.path.isdir(os.path.join(locale_path, entry, 'LC_MESSAGES')) and language not in found:
+                found.append(language)
+    return found
+
+
+def templates_fingerprint():
+    """Fingerprint of the names, sizes and modification times of all template files."""
+    checksum = hashlib.sha256()
+    directories = list(engines['django'].engine.dirs) + list(get_app_template_dirs('templates'))
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                stat = os.stat(os.path.join(root, name))
+                checksum.update('{}:{}:{}\n'.format(os.path.join(root, name), stat.st_size, stat.st_mtime_ns).encode())
+    return checksum.hexdigest()
+
+
+def data_fingerprint(model):
+    """Fingerprint of every row of ``model``; the pages only show small tables."""
+    checksum = hashlib.sha256()
+    for row in model.objects.order_by('pk').values_list():
+        checksum.update(repr(row).encode())
+    return checksum.hexdigest()
+
+
+def page_path(language, path):
+    """Path of the export of ``path`` in ``language``, relative to the export directory."""
+    prefix = [] if language == settings.LANGUAGE_CODE else [language]
+    return os.path.join(*prefix, *[part for part in path.split('/') if part], 'index.html')
+
+
+def render_page(name, language):
+    """The HTML of the page named ``name`` in ``language``, as served to anonymous visitors."""
+    with translation.override(language):
+        path = reverse(name)
+        request = RequestFactory().get(path)
+        request.LANGUAGE_CODE = language
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+    if response.status_code != 200:
+        raise ValueError('{} answered {} in {!r}'.format(path, response.status_code, language))
+    return response.content
+
+
+def write_page(target, content):
+    """Write ``content`` to ``target`` and its ``.gz`` and ``.br`` siblings, each atomically."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    for path, data in (
+        (target, content),
+        (target + '.gz', gzip.compress(content, compresslevel=9, mtime=0)),
+        (target + '.br', brotli.compress(content, mode=brotli.MODE_TEXT)),
+    ):
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as output:
+            output.write(data)
+        os.replace(temporary, path)
+
+
+def export(root, incremental=False):
+    """
+    Export the public pages into the directory ``root``. With ``incremental``,
+    pages rendered from unchanged templates and rows are skipped. Returns the
+    numbers of pages written, unchanged and skipped.
+    """
+    manifest_path = os.path.join(root, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as source:
+            previous = json.load(source)
+    except (FileNotFoundError, ValueError):
+        previous = {}
+
+    templates = templates_fingerprint()
+    if templates != previous.get('templates'):
+        # Cached pages and fragments were rendered from the previous templates.
+        cache.invalidate()
+    models = {model for _, dependencies in PAGES for model in dependencies}
+    data = {model: data_fingerprint(model) for model in models}
+
+    pages = {}
+    written = unchanged = skipped = 0
+    for language in languages():
+        for name, dependencies in PAGES:
+            key = '{}:{}'.format(language, name)
+            inputs = hashlib.sha256(
+                ':'.join([templates, language] + [data[model] for model in dependencies]).encode()).hexdigest()
+            entry = previous.get('pages', {}).get(key, {})
+            target = os.path.join(root, entry.get('path', ''))
+            if incremental and entry.get('inputs') == inputs and os.path.isfile(target):
+                pages[key] = entry
+                skipped += 1
+                continue
+            content = render_page(name, language)
+            with translation.override(language):
+                path = page_path(language, reverse(name))
+            digest = hashlib.sha256(content).hexdigest()
+            if entry.get('content') == digest and entry.get('path') == path and os.path.isfile(target):
+                unchanged += 1
+            else:
+                write_page(os.path.join(root, path), content)
+                written += 1
+            pages[key] = {'path': path, 'inputs': inputs, 'content': digest}
+
+    os.makedirs(root, exist_ok=True)
+    with open(manifest_path, 'w') as output:
+        json.dump({'templates': templates, 'pages': pages}, output, indent=2, sort_keys=True)
+    return written, unchanged, skipped
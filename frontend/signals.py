@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from vigolend.utils.tasks import PRIORITY_LOW, enqueue_on_commit
+
+from .cache import invalidate
+from .models import TeamMember
+from .tasks import generate_photo_variants
+
+
+@receiver(post_save, sender=TeamMember)
+@receiver(post_delete, sender=TeamMember)
+def invalidate_pages(sender, **kwargs):
+    # Published once the change is visible, so no page is rebuilt from stale rows.
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=TeamMember)
+def photo_saved(sender, instance, raw=False, **kwargs):
+    if not raw and instance.photo and instance.photo_variants.get('source') != instance.photo.name:
+        enqueue_on_commit(generate_photo_variants, str(instance.pk), priority=PRIORITY_LOW)
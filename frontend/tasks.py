@@ -0,0 +1,21 @@
+from config import celery_app
+
+from . import cache
+from .images import generate_variants
+from .models import TeamMember
+
+
+@celery_app.task(soft_time_limit=4 * 60)
+def generate_photo_variants(member_id):
+    """Render the responsive renditions of a team member's photo."""
+    member = TeamMember.objects.filter(pk=member_id).first()
+    if member is None or not member.photo:
+        return
+    try:
+        manifest = generate_variants(member.photo)
+    except OSError:
+        # Missing file, or not an image Pillow can read: the original is served.
+        return
+    # Only if the photo was not replaced meanwhile: the new one has its own task.
+    if TeamMember.objects.filter(pk=member_id, photo=manifest['source']).update(photo_variants=manifest):
+        cache.invalidate()
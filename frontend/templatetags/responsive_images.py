@@ -0,0 +1,31 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from frontend.images import FORMATS, srcset
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(photo, manifest, alt='', sizes='100vw'):
+    """
+    ``<picture>`` element offering the renditions of ``photo`` in each format,
+    best compression first, falling back to the original.
+
+    Usage: ``{% picture member.photo member.photo_variants alt=member.name sizes="33vw" %}``
+    """
+    sources = []
+    for _, mime_type, _ in FORMATS:
+        value = srcset(photo, manifest, mime_type)
+        if value:
+            sources.append((mime_type, value, sizes))
+    return format_html(
+        '<picture>{}<img src="{}" alt="{}" loading="lazy"></picture>',
+        format_html_join('', '<source type="{}" srcset="{}" sizes="{}">', sources),
+        photo.url, alt)
+
+
+@register.simple_tag
+def photo_srcset(photo, manifest, mime_type='image/jpeg'):
+    """The ``srcset`` of the ``mime_type`` renditions of ``photo``."""
+    return srcset(photo, manifest, mime_type)
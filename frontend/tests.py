@@ -1,3 +1,180 @@
-from django.test import TestCase
+import gzip
+import io
+import os
 
-# Create your tests here.
+import brotli
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from PIL import Image
+
+from .images import FORMATS, render_variants
+from .prerender import PAGES, export, languages
+from .models import TeamMember
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def media_storage(settings, tmpdir):
+    settings.MEDIA_ROOT = tmpdir.strpath
+
+
+def _jpeg(width, height):
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "teal").save(output, "JPEG")
+    return output.getvalue()
+
+
+def _member(name):
+    return TeamMember.objects.create(name=name, designation="Engineer", twitter=name, photo="team/photo.jpg")
+
+
+def test_about_page_is_cached_until_team_changes(client):
+    _member("Ada")
+    url = reverse("about_us")
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "Ada" in response.content.decode()
+    assert "public" in response["Cache-Control"] and "max-age=" in response["Cache-Control"]
+    assert {"Accept-Language", "Cookie"} <= {value.strip() for value in response["Vary"].split(",")}
+
+    with CaptureQueriesContext(connection) as queries:
+        cached = client.get(url, {"utm_source": "newsletter"})
+    assert not queries.captured_queries
+    assert cached.content == response.content
+    assert cached["ETag"] == response["ETag"]
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+
+    _member("Grace")
+    updated = client.get(url)
+    assert "Grace" in updated.content.decode()
+    assert updated["ETag"] != response["ETag"]
+
+
+def test_pages_are_cached_per_language(client, settings):
+    settings.LANGUAGES = [("en", "English"), ("fr", "French")]
+    url = reverse("index")
+
+    client.get(url, HTTP_ACCEPT_LANGUAGE="en")
+    response = client.get(url, HTTP_ACCEPT_LANGUAGE="fr")
+
+    assert response["Content-Language"] == "fr"
+    assert cache.get("frontend:page:1:fr:/") is not None
+    assert cache.get("frontend:page:1:en:/") is not None
+
+    # A language chosen with the cookie wins over the browser's.
+    client.cookies[settings.LANGUAGE_COOKIE_NAME] = "en"
+    response = client.get(url, HTTP_ACCEPT_LANGUAGE="fr")
+    assert response["Content-Language"] == "en"
+    assert "Cookie" in response["Vary"]
+
+
+def test_render_variants_never_upscales():
+    variants = render_variants(_jpeg(500, 250), widths=(160, 320, 640))
+
+    assert sorted({width for width, _, _ in variants}) == [160, 320, 500]
+    assert len(variants) == 3 * len(FORMATS)
+    with Image.open(io.BytesIO(variants[0][2])) as image:
+        assert image.size == (160, 80)
+
+
+def test_uploaded_photo_gets_variants_and_srcset(client):
+    member = TeamMember.objects.create(
+        name="Ada", designation="Engineer", twitter="ada", photo=SimpleUploadedFile("ada.jpg", _jpeg(1200, 800)))
+
+    member.refresh_from_db()
+    assert member.photo_variants["source"] == member.photo.name
+    webp = member.photo_variants["variants"]["image/webp"]
+    assert [width for width, _ in webp] == [160, 320, 640, 960]
+    assert all(member.photo.storage.exists(name) for _, name in webp)
+
+    content = client.get(reverse("about_us")).content.decode()
+    assert '<source type="image/webp" srcset="/media/team/variants/' in content
+    assert "-160w.webp 160w" in content
+
+    # Saving without a new photo does not render the variants again.
+    member.name = "Ada L."
+    member.save()
+    member.refresh_from_db()
+    assert member.photo_variants["variants"]["image/webp"] == webp
+
+
+def test_prerender_export_is_incremental(tmpdir):
+    _member("Ada")
+    root = tmpdir.strpath
+
+    assert export(root) == (len(PAGES), 0, 0)
+    about = os.path.join(root, "about-us", "index.html")
+    with open(about, "rb") as page:
+        content = page.read()
+    assert b"Ada" in content
+    with open(about + ".gz", "rb") as page:
+        assert gzip.decompress(page.read()) == content
+    with open(about + ".br", "rb") as page:
+        assert brotli.decompress(page.read()) == content
+    assert os.path.isfile(os.path.join(root, "index.html"))
+
+    assert export(root, incremental=True) == (0, 0, len(PAGES))
+    _member("Grace")
+    # Only the two about pages show team members.
+    assert export(root, incremental=True) == (2, 0, len(PAGES) - 2)
+    assert export(root) == (0, len(PAGES), 0)
+
+
+def test_prerender_languages(settings, tmpdir):
+    os.makedirs(os.path.join(tmpdir.strpath, "pt_BR", "LC_MESSAGES"))
+    os.makedirs(os.path.join(tmpdir.strpath, "empty"))
+    settings.LOCALE_PATHS = [tmpdir.strpath]
+
+    assert languages() == [settings.LANGUAGE_CODE, "pt-br"]
+
+
+def test_build_static_minifies_hashes_and_reuses_results(settings, tmpdir):
+    source = tmpdir.mkdir("source")
+    source.join("site.css").write("/* Site styles */\nbody {\n    color: teal;\n}\n" * 20)
+    source.join("site.js").write("// Site script\nvar answer = 42;\n" * 20)
+    source.join("vendor.min.js").write("var x = 1; // kept\n")
+    settings.STATICFILES_DIRS = [source.strpath]
+    settings.STATICFILES_FINDERS = ["django.contrib.staticfiles.finders.FileSystemFinder"]
+    settings.STATICFILES_STORAGE = "vigolend.utils.staticfiles.MinifiedManifestStaticFilesStorage"
+    settings.STATICFILES_BUILD_CACHE = tmpdir.join("cache").strpath
+    settings.COMPRESS_ENABLED = False
+
+    def build(root):
+        settings.STATIC_ROOT = tmpdir.join(root).strpath
+        output = io.StringIO()
+        call_command("build_static", processes=2, stdout=output)
+        return staticfiles_storage, output.getvalue()
+
+    storage, output = build("static")
+    hashed = storage.path(storage.stored_name("site.css"))
+    with open(hashed, "rb") as css:
+        content = css.read()
+    assert content.count(b"color:teal") == 20 and b"Site styles" not in content
+    with open(hashed + ".br", "rb") as css:
+        assert brotli.decompress(css.read()) == content
+    with open(storage.path("vendor.min.js")) as js:
+        assert js.read() == "var x = 1; // kept\n"
+    assert storage.minified.processed == 2
+    assert "Built the static files" in output
+
+    # A fresh STATIC_ROOT gets the same files, from the build cache.
+    storage, output = build("static2")
+    assert (storage.minified.processed, storage.minified.cached) == (0, 2)
+    assert storage.compressed.processed == 0
+    with open(storage.path(storage.stored_name("site.css")), "rb") as css:
+        assert css.read() == content
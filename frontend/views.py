@@ -1,8 +1,11 @@
+from django.conf import settings
 from django.shortcuts import render
 
+from .cache import cached_page
 from .models import TeamMember
 
 
+@cached_page
 def index(request):
     """
     View function for rendering homepage
@@ -12,6 +15,7 @@ def index(request):
     )
 
 
+@cached_page
 def borrow(request):
     """
     View function for rendering Borrower page
@@ -21,6 +25,7 @@ def borrow(request):
     )
 
 
+@cached_page
 def invest(request):
     """
     View function for rendering Invest page
@@ -30,19 +35,26 @@ def invest(request):
     )
 
 
+@cached_page
 def about_us(request):
     """
     View function for rendering about us page
     """
+    # Only queried when the cached team fragment is missing.
     team_members = TeamMember.objects.all()
 
-    context = {'team_members': team_members}
+    context = {
+        'team_members': team_members,
+        'pages_version': request.pages_version,
+        'fragment_timeout': settings.FRONTEND_CACHE_TIMEOUT,
+    }
 
     return render(
         request, 'pages/about.html', context
     )
 
 
+@cached_page
 def teams(request):
     """
     View function for rendering our teams page
@@ -1,3 +1,267 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.exceptions import PermissionDenied
+from django.db.models import Exists, OuterRef
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.translation import gettext_lazy as _
 
-# Register your models here.
+from vigolend.utils.tasks import enqueue_on_commit
+
+from . import funnel
+from .ages import AGE_BANDS, in_age_band
+from .exports import streaming_csv_response
+from .identity import duplicate_fingerprints, with_duplicates
+from .models import KycApplication, KycStatusTransition, ScreeningHit
+from .previews import IMAGE_FIELDS, preview_name
+from .review_queue import claim_applications, release_applications
+from .tasks import merge_kyc_applications
+from .transitions import InvalidTransition, transition
+
+CLAIM_BATCH_SIZE = 10
+# Permissions required to move applications to a status.
+STATUS_PERMISSIONS = {
+    'verified': 'kyc_aml.verify_kyc',
+    'rejected': 'kyc_aml.reject_kyc',
+}
+
+
+class AgeBandFilter(admin.SimpleListFilter):
+    title = _('age')
+    parameter_name = 'age_band'
+
+    def lookups(self, request, model_admin):
+        return [band[:2] for band in AGE_BANDS]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            try:
+                return in_age_band(queryset, self.value())
+            except ValueError as error:
+                raise IncorrectLookupParameters(error)
+        return queryset
+
+
+class DuplicateIdentityFilter(admin.SimpleListFilter):
+    title = _('duplicate identity')
+    parameter_name = 'duplicate_identity'
+
+    def lookups(self, request, model_admin):
+        return (('yes', _('Shared with another user')),)
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return with_duplicates(queryset)
+        return queryset
+
+
+class OpenScreeningHitFilter(admin.SimpleListFilter):
+    title = _('sanctions/PEP screening')
+    parameter_name = 'screening_hit'
+
+    def lookups(self, request, model_admin):
+        return (('open', _('Open hits')),)
+
+    def queryset(self, request, queryset):
+        if self.value() == 'open':
+            return queryset.filter(Exists(ScreeningHit.objects.filter(
+                application=OuterRef('pk'), status=ScreeningHit.OPEN)))
+        return queryset
+
+
+class ScreeningHitInline(admin.TabularInline):
+    model = ScreeningHit
+    fields = ('entry_name', 'entry_id', 'entry_list', 'entry_type', 'score', 'birth_date_match', 'status')
+    readonly_fields = ('entry_name', 'entry_id', 'entry_list', 'entry_type', 'score', 'birth_date_match')
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class StatusTransitionInline(admin.TabularInline):
+    model = KycStatusTransition
+    fields = ('created_date', 'from_status', 'to_status', 'actor', 'note', 'refused_code')
+    readonly_fields = fields
+    ordering = ('-created_date',)
+    extra = 0
+    can_delete = False
+    verbose_name_plural = _('Status history')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('actor')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(KycApplication)
+class KycApplicationAdmin(admin.ModelAdmin):
+    change_list_template = 'admin/kyc_aml/kycapplication/change_list.html'
+    list_display = ('id', 'user', 'kyc_status', 'review_priority', 'reviewer', 'created_date')
+    list_filter = ('kyc_status', AgeBandFilter, DuplicateIdentityFilter, OpenScreeningHitFilter)
+    list_select_related = ('user', 'reviewer')
+    raw_id_fields = ('user', 'reviewer')
+    readonly_fields = ('identity_matches', 'document_previews')
+    inlines = (ScreeningHitInline, StatusTransitionInline)
+    actions = ('export_as_csv', 'verify_applications', 'reject_applications', 'merge_into_users')
+
+    def get_readonly_fields(self, request, obj=None):
+        readonly = super().get_readonly_fields(request, obj)
+        if obj is None:
+            # New applications start in the default status; later changes go through the state machine.
+            readonly += ('kyc_status',)
+        return readonly
+
+    def save_model(self, request, obj, form, change):
+        to_status = obj.kyc_status
+        if change and 'kyc_status' in form.changed_data:
+            # Status changes go through the state machine, which logs them.
+            obj.kyc_status = form.initial['kyc_status']
+        super().save_model(request, obj, form, change)
+        if to_status != obj.kyc_status:
+            self._transition(request, [obj.pk], to_status, refused_code=obj.kyc_refused_code)
+
+    def _transition(self, request, pks, to_status, **kwargs):
+        """Move applications to ``to_status`` on behalf of the current user. Returns the number moved."""
+        permission = STATUS_PERMISSIONS.get(to_status)
+        if permission and not request.user.has_perm(permission):
+            self.message_user(request, _('You are not allowed to set the KYC status to %s.') % to_status,
+                              messages.ERROR)
+            return 0
+        try:
+            return len(transition(pks, to_status, actor=request.user, **kwargs))
+        except InvalidTransition as error:
+            self.message_user(request, str(error), messages.ERROR)
+            return 0
+
+    def identity_matches(self, obj):
+        """Applications of other users sharing an identification number, legal identity or IP address."""
+        if obj.pk is None:
+            return '-'
+        matches = duplicate_fingerprints(obj)
+        if not matches:
+            return _('No other user shares this identity.')
+        return format_html_join(format_html('<br>'), '{}: <a href="{}">{}</a> ({})', (
+            (match.get_kind_display(),
+             reverse('admin:kyc_aml_kycapplication_change', args=[match.application_id]),
+             match.application, match.user)
+            for match in matches
+        ))
+    identity_matches.short_description = _('Identity matches')
+
+    def document_previews(self, obj):
+        """
+        Lazily loaded previews of the identity documents. The originals are only
+        downloaded when a preview is clicked.
+        """
+        if not obj.previews_generated_date:
+            return _('Previews have not been generated yet.')
+        links = []
+        for field in IMAGE_FIELDS:
+            document = getattr(obj, field)
+            if not document:
+                continue
+            label = obj._meta.get_field(field).verbose_name
+            preview = preview_name(document.name)
+            if document.storage.exists(preview):
+                links.append(format_html(
+                    '<a href="{}" target="_blank"><img src="{}" loading="lazy" alt="{}" style="max-height: 240px"></a>',
+                    document.url, document.storage.url(preview), label))
+            else:
+                # Documents that are not images (e.g. PDF scans) have no preview.
+                links.append(format_html('<a href="{}" target="_blank">{}</a>', document.url, label))
+        return format_html_join(' ', '{}', ((link,) for link in links))
+    document_previews.short_description = _('Document previews')
+
+    def export_as_csv(self, request, queryset):
+        return streaming_csv_response(queryset)
+    export_as_csv.short_description = _('Export selected applications to CSV')
+
+    def verify_applications(self, request, queryset):
+        count = self._transition(request, queryset.values_list('pk', flat=True), 'verified')
+        if count:
+            self.message_user(request, _('%d applications verified.') % count, messages.SUCCESS)
+    verify_applications.short_description = _('Verify selected applications')
+    verify_applications.allowed_permissions = ('verify_kyc',)
+
+    def reject_applications(self, request, queryset):
+        count = self._transition(request, queryset.values_list('pk', flat=True), 'rejected')
+        if count:
+            self.message_user(request, _('%d applications rejected.') % count, messages.SUCCESS)
+    reject_applications.short_description = _('Reject selected applications')
+    reject_applications.allowed_permissions = ('reject_kyc',)
+
+    def merge_into_users(self, request, queryset):
+        pks = [str(pk) for pk in queryset.filter(kyc_status='verified').values_list('pk', flat=True)]
+        if not pks:
+            self.message_user(request, _('None of the selected applications is verified.'), messages.WARNING)
+            return
+        enqueue_on_commit(merge_kyc_applications, pks)
+        self.message_user(
+            request, _('Merging %d verified applications into user profiles.') % len(pks), messages.SUCCESS)
+    merge_into_users.short_description = _('Merge verified data into user profiles')
+    merge_into_users.allowed_permissions = ('merge_kyc',)
+
+    def has_verify_kyc_permission(self, request):
+        return request.user.has_perm(STATUS_PERMISSIONS['verified'])
+
+    def has_reject_kyc_permission(self, request):
+        return request.user.has_perm(STATUS_PERMISSIONS['rejected'])
+
+    def has_merge_kyc_permission(self, request):
+        return request.user.has_perm('kyc_aml.merge_kyc')
+
+    def get_urls(self):
+        urls = [
+            path('claim/', self.admin_site.admin_view(self.claim_view), name='kyc_aml_kycapplication_claim'),
+            path('release/', self.admin_site.admin_view(self.release_view), name='kyc_aml_kycapplication_release'),
+            path('dashboard/', self.admin_site.admin_view(self.dashboard_view),
+                 name='kyc_aml_kycapplication_dashboard'),
+        ]
+        return urls + super().get_urls()
+
+    def _my_queue_url(self, request):
+        changelist = reverse('admin:kyc_aml_kycapplication_changelist')
+        return '{}?kyc_status__exact=pending&reviewer__id__exact={}'.format(changelist, request.user.pk)
+
+    def claim_view(self, request):
+        """Claim the next applications of the review queue and list them."""
+        if request.method != 'POST' or not self.has_change_permission(request):
+            raise PermissionDenied
+        claimed = claim_applications(request.user, count=CLAIM_BATCH_SIZE)
+        if claimed:
+            self.message_user(request, _('%d applications claimed.') % len(claimed), messages.SUCCESS)
+        else:
+            self.message_user(request, _('The review queue is empty.'), messages.INFO)
+        return redirect(self._my_queue_url(request))
+
+    def dashboard_view(self, request):
+        """KYC funnel statistics, read from the ``kyc_funnel_daily`` aggregates only."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        context = {
+            **self.admin_site.each_context(request),
+            'title': _('KYC Dashboard'),
+            'opts': self.model._meta,
+            'statuses': funnel.status_totals(),
+            'countries': funnel.country_totals(),
+            'days': funnel.daily_totals(),
+            'funnel': funnel.FUNNEL,
+            'refreshed': funnel.last_refresh(),
+        }
+        return TemplateResponse(request, 'admin/kyc_aml/dashboard.html', context)
+
+    def release_view(self, request):
+        """Hand the pending applications claimed by the current user back to the queue."""
+        if request.method != 'POST' or not self.has_change_permission(request):
+            raise PermissionDenied
+        released = release_applications(request.user)
+        self.message_user(request, _('%d applications released.') % released, messages.SUCCESS)
+        return redirect('admin:kyc_aml_kycapplication_changelist')
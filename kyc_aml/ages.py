@@ -0,0 +1,68 @@
+"""
+Applicant ages, computed by the database.
+
+An age band is a range of birth dates, so filtering on it is a range scan of
+the ``kyc_birth_date_idx`` index rather than a computation per row. Ages are
+taken on the current date of ``TIME_ZONE``, in Python and in SQL alike.
+"""
+from django.db.models import F, Func, IntegerField, Q, Value
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+# (key, label, minimum age, maximum age), bounds included; ``None`` is unbounded.
+AGE_BANDS = (
+    ('minor', _('Minors (under 18)'), None, 17),
+    ('18-25', _('18 to 25'), 18, 25),
+    ('26-40', _('26 to 40'), 26, 40),
+    ('41-60', _('41 to 60'), 41, 60),
+    ('61-75', _('61 to 75'), 61, 75),
+    ('over-75', _('Over 75'), 76, None),
+)
+
+
+def years_before(day, years):
+    """``day`` ``years`` years earlier; 29 February becomes the 28th in common years."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def age_on(birth_date, day=None):
+    """Age in whole years on ``day`` (today by default) of someone born on ``birth_date``."""
+    day = day or timezone.localdate()
+    return day.year - birth_date.year - ((day.month, day.day) < (birth_date.month, birth_date.day))
+
+
+def aged_between(minimum=None, maximum=None, day=None):
+    """A filter on ``birth_date`` matching ages from ``minimum`` to ``maximum`` (included) on ``day``."""
+    day = day or timezone.localdate()
+    condition = Q()
+    if minimum is not None:
+        condition &= Q(birth_date__lte=years_before(day, minimum))
+    if maximum is not None:
+        condition &= Q(birth_date__gt=years_before(day, maximum + 1))
+    return condition
+
+
+def in_age_band(queryset, band, day=None):
+    """Restrict ``queryset`` to the applicants in the age band keyed ``band``."""
+    for key, label, minimum, maximum in AGE_BANDS:
+        if key == band:
+            return queryset.filter(aged_between(minimum, maximum, day))
+    raise ValueError('Unknown age band {!r}'.format(band))
+
+
+class Age(Func):
+    """Age in whole years on ``day`` (today by default) of the birth dates of ``expression``."""
+    template = "CAST(date_part('year', age(%(expressions)s)) AS integer)"
+    output_field = IntegerField()
+
+    def __init__(self, expression, day=None, **extra):
+        day = day or timezone.localdate()
+        super().__init__(Value(day), expression, **extra)
+
+
+def with_age(queryset, day=None):
+    """Annotate ``queryset`` with the ``age`` of the applicants, to sort or aggregate on."""
+    return queryset.annotate(age=Age(F('birth_date'), day))
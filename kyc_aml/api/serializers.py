@@ -0,0 +1,26 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+
+from kyc_aml.uploads import ALLOWED_CONTENT_TYPES, DOCUMENT_FIELDS
+
+
+class DocumentUploadSerializer(serializers.Serializer):
+    field_name = serializers.ChoiceField(choices=DOCUMENT_FIELDS)
+    content_type = serializers.ChoiceField(choices=sorted(ALLOWED_CONTENT_TYPES))
+
+
+class DocumentAttachSerializer(serializers.Serializer):
+    """Object keys returned by the upload endpoint, by document field; an empty key clears the field."""
+
+    application = serializers.UUIDField()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field_name in DOCUMENT_FIELDS:
+            fields[field_name] = serializers.CharField(required=False, allow_blank=True, max_length=255)
+        return fields
+
+    def validate(self, attrs):
+        if not set(attrs) & set(DOCUMENT_FIELDS):
+            raise serializers.ValidationError(_("No document was given."))
+        return attrs
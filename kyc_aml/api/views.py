@@ -0,0 +1,55 @@
+from django.core.exceptions import ValidationError
+from django.shortcuts import get_object_or_404
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.viewsets import GenericViewSet
+
+from kyc_aml.models import KycApplication
+from kyc_aml.uploads import DOCUMENT_FIELDS, attach_documents, create_presigned_upload
+
+from .serializers import DocumentAttachSerializer, DocumentUploadSerializer
+
+# Documents can only be replaced until the application is reviewed.
+EDITABLE_STATUSES = ("unverified", "pending")
+
+
+class DocumentUploadViewSet(GenericViewSet):
+    """
+    Issue presigned upload forms for KYC documents. Clients POST the document
+    to the returned URL, then ``attach`` the returned ``key`` to their
+    application.
+    """
+
+    serializer_class = DocumentUploadSerializer
+
+    def get_serializer_class(self):
+        if self.action == "attach":
+            return DocumentAttachSerializer
+        return super().get_serializer_class()
+
+    def create(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = create_presigned_upload(
+            request.user, request=request, **serializer.validated_data
+        )
+        return Response(status=status.HTTP_201_CREATED, data=upload)
+
+    @action(detail=False, methods=["post"])
+    def attach(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        keys = dict(serializer.validated_data)
+        application = get_object_or_404(
+            KycApplication,
+            pk=keys.pop("application"),
+            user=request.user,
+            kyc_status__in=EDITABLE_STATUSES,
+        )
+        try:
+            attach_documents(application, **keys)
+        except ValidationError as error:
+            raise serializers.ValidationError(serializers.as_serializer_error(error))
+        application.save(update_fields=[*keys, "previews_generated_date"])
+        return Response({field: getattr(application, field).name or "" for field in DOCUMENT_FIELDS})
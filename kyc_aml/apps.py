@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class KycAmlConfig(AppConfig):
     name = 'kyc_aml'
     verbose_name = "KYC Verifications"
+
+    def ready(self):
+        import kyc_aml.signals  # noqa F401
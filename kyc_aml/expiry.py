@@ -0,0 +1,44 @@
+"""
+Re-checking of verified applications against the expiry of their identity document.
+
+Verified applications whose document expires within ``KYC_ID_EXPIRY_NOTICE_DAYS``
+are moved back to ``unverified`` with the ``EXPIRED_DOCUMENT`` refusal code,
+which notifies the customer to submit a new document. The candidates are read
+from the partial ``kyc_expiry_sweep_idx`` index, which only holds verified
+applications: swept rows leave it, so each batch is a short range scan from the
+start of the index. Every batch is its own short transaction and skips rows
+locked by reviewers instead of waiting on them.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from .models import KycApplication
+from .transitions import transition
+
+BATCH_SIZE = 1000
+EXPIRED_NOTE = _("Your identity document has expired or is about to expire. "
+                 "Please submit a new application with a valid document.")
+
+
+def expiring_applications(days=None, today=None):
+    """Verified applications whose identity document expires within ``days`` days."""
+    if days is None:
+        days = settings.KYC_ID_EXPIRY_NOTICE_DAYS
+    cutoff = (today or datetime.date.today()) + datetime.timedelta(days=days)
+    return KycApplication.objects.filter(kyc_status='verified', identification_expiry__lte=cutoff)
+
+
+def sweep_expired_documents(days=None, today=None, batch_size=BATCH_SIZE):
+    """Unverify the applications whose document expires within ``days`` days. Returns their number."""
+    queryset = expiring_applications(days, today).order_by('identification_expiry', 'id')
+    swept = 0
+    while True:
+        with transaction.atomic():
+            pks = list(queryset.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return swept
+            transition(pks, 'unverified', note=str(EXPIRED_NOTE), refused_code='EXPIRED_DOCUMENT')
+        swept += len(pks)
@@ -0,0 +1,75 @@
+"""
+KYC funnel statistics for the admin dashboard.
+
+Counts per day, KYC status and KYC country live in the ``kyc_funnel_daily``
+materialized view (``KycFunnelStat``), refreshed every few minutes by
+Celery beat. ``REFRESH ... CONCURRENTLY`` recomputes it without blocking
+readers, and the dashboard only ever reads the aggregates, whose size does
+not depend on the number of applications.
+"""
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+
+from locations.cache import countries
+from locations.models import Country
+
+from .models import KycFunnelStat
+
+REFRESHED_KEY = 'kyc_aml:funnel:refreshed'
+# Statuses in funnel order.
+FUNNEL = ('pending', 'verified', 'rejected', 'cancelled')
+
+
+def refresh():
+    """Recompute the funnel statistics and return the refresh time."""
+    with connection.cursor() as cursor:
+        cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY {}'.format(
+            connection.ops.quote_name(KycFunnelStat._meta.db_table)))
+    refreshed = timezone.now()
+    cache.set(REFRESHED_KEY, refreshed, None)
+    return refreshed
+
+
+def last_refresh():
+    return cache.get(REFRESHED_KEY)
+
+
+def status_totals():
+    """Applications per KYC status, in funnel order, with the overall total first."""
+    totals = dict(KycFunnelStat.objects.values_list('kyc_status').annotate(total=Sum('applications')))
+    rows = [(status, totals.pop(status, 0)) for status in FUNNEL]
+    rows += sorted(totals.items())
+    return [('total', sum(total for _, total in rows))] + rows
+
+
+def country_totals(limit=20):
+    """The ``limit`` KYC countries with the most applications, as (country name, total) pairs."""
+    rows = (
+        KycFunnelStat.objects.values_list('kyc_country_id')
+        .annotate(total=Sum('applications')).order_by('-total')[:limit])
+    return [(_country_name(pk), total) for pk, total in rows]
+
+
+def _country_name(pk):
+    try:
+        return countries.get(pk=pk).name
+    except Country.DoesNotExist:
+        return '-'
+
+
+def daily_totals(days=30):
+    """Applications per day and status over the last ``days`` days, most recent first."""
+    since = timezone.now().date() - datetime.timedelta(days=days - 1)
+    rows = (
+        KycFunnelStat.objects.filter(day__gte=since).values_list('day', 'kyc_status')
+        .annotate(total=Sum('applications')))
+    table = {}
+    for day, status, total in rows:
+        table.setdefault(day, dict.fromkeys(FUNNEL, 0))[status] = total
+    return sorted(
+        ((day, sum(counts.values()), [counts.get(status, 0) for status in FUNNEL]) for day, counts in table.items()),
+        reverse=True)
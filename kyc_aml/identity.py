@@ -0,0 +1,114 @@
+"""
+Duplicate identity detection.
+
+Identification numbers, legal name plus birth date, and submission IP
+addresses are normalized and hashed into ``IdentityFingerprint`` rows when an
+application is saved. The raw values stay in the application only; the
+digests are keyed HMACs, so the index cannot be reversed on its own.
+Applications of other users sharing a digest are found through the
+``digest`` index, whatever the size of the table.
+"""
+import ipaddress
+import re
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils.crypto import salted_hmac
+
+from locations.utils import normalize_name
+
+from .models import IdentityFingerprint, KycApplication
+
+BATCH_SIZE = 2000
+KEY_SALT = 'kyc_aml.identity'
+# Application fields the fingerprints are computed from.
+IDENTITY_FIELDS = ('user', 'identification_number', 'kyc_submitted_ip_address',
+                   'legal_first_names', 'legal_last_names', 'birth_date')
+
+
+def normalize_identification_number(value):
+    """Upper-cased with separators (spaces, dashes, dots...) removed."""
+    return re.sub(r'[\W_]+', '', value or '').upper()
+
+
+def normalize_legal_name(first_names, last_names):
+    """Accent- and case-insensitive, independent of the order of the name parts."""
+    return ' '.join(sorted(normalize_name('{} {}'.format(first_names or '', last_names or '')).split()))
+
+
+def normalize_ip_address(value):
+    try:
+        return ipaddress.ip_address(value).compressed
+    except ValueError:
+        return ''
+
+
+def identity_values(application):
+    """The normalized identity attributes of ``application``, by fingerprint kind."""
+    values = {
+        IdentityFingerprint.ID_NUMBER: normalize_identification_number(application.identification_number),
+        IdentityFingerprint.IP_ADDRESS: normalize_ip_address(application.kyc_submitted_ip_address or ''),
+    }
+    name = normalize_legal_name(application.legal_first_names, application.legal_last_names)
+    if name and application.birth_date:
+        values[IdentityFingerprint.NAME_BIRTH_DATE] = '{}|{}'.format(name, application.birth_date.isoformat())
+    return {kind: value for kind, value in values.items() if value}
+
+
+def digest(kind, value):
+    return salted_hmac('{}.{}'.format(KEY_SALT, kind), value, algorithm='sha256').hexdigest()
+
+
+def fingerprints(application):
+    return [
+        IdentityFingerprint(application_id=application.pk, user_id=application.user_id, kind=kind,
+                            digest=digest(kind, value))
+        for kind, value in identity_values(application).items()
+    ]
+
+
+def index_applications(applications):
+    """Replace the fingerprints of ``applications``."""
+    applications = list(applications)
+    with transaction.atomic():
+        IdentityFingerprint.objects.filter(application__in=[a.pk for a in applications]).delete()
+        IdentityFingerprint.objects.bulk_create(
+            [fingerprint for application in applications for fingerprint in fingerprints(application)])
+
+
+def rebuild_index(batch_size=BATCH_SIZE):
+    """
+    Recompute the fingerprints of every application, e.g. after ``SECRET_KEY``
+    was rotated. Returns the number of applications indexed.
+    """
+    queryset = KycApplication.objects.order_by('pk').only('pk', *IDENTITY_FIELDS)
+    indexed = 0
+    last = None
+    while True:
+        batch = list((queryset if last is None else queryset.filter(pk__gt=last))[:batch_size])
+        if not batch:
+            return indexed
+        index_applications(batch)
+        indexed += len(batch)
+        last = batch[-1].pk
+
+
+def duplicate_fingerprints(application):
+    """Fingerprints of other users' applications that match ``application``."""
+    return (
+        IdentityFingerprint.objects
+        .filter(digest__in=IdentityFingerprint.objects.filter(application=application).values('digest'))
+        .exclude(user_id=application.user_id)
+        .select_related('application', 'user')
+        .order_by('kind', '-application__created_date'))
+
+
+def with_duplicates(queryset):
+    """Restrict ``queryset`` to applications matching an application of another user."""
+    other_users = IdentityFingerprint.objects.filter(
+        digest=OuterRef('digest'),
+    ).exclude(user_id=OuterRef('user_id'))
+    flagged = IdentityFingerprint.objects.filter(
+        application=OuterRef('pk'),
+    ).filter(Exists(other_users))
+    return queryset.filter(Exists(flagged))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from kyc_aml.ages import AGE_BANDS, in_age_band
+from kyc_aml.exports import CHUNK_SIZE, export_to_file
+from kyc_aml.models import KycApplication
+
+
+class Command(BaseCommand):
+    help = (
+        "Export KYC applications with their user, reviewer and countries to CSV. "
+        "Paths ending with .gz are gzip compressed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Destination file, e.g. kyc_applications.csv.gz")
+        parser.add_argument('--status', help="Only export applications with this KYC status.")
+        parser.add_argument('--age-band', choices=[band[0] for band in AGE_BANDS],
+                            help="Only export applicants in this age band.")
+        parser.add_argument('--since', help="Only export applications created on or after this date (YYYY-MM-DD).")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="Rows fetched per round trip.")
+
+    def handle(self, *args, **options):
+        queryset = KycApplication.objects.all()
+        if options['status']:
+            queryset = queryset.filter(kyc_status=options['status'])
+        if options['age_band']:
+            queryset = in_age_band(queryset, options['age_band'])
+        if options['since']:
+            queryset = queryset.filter(created_date__date__gte=options['since'])
+
+        started = time.monotonic()
+        count = export_to_file(options['path'], queryset, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            "Exported {} applications to {} in {:.1f}s".format(count, options['path'], time.monotonic() - started)))
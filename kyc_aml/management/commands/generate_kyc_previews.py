@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from kyc_aml.previews import generate_previews
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the downscaled, EXIF-free review previews of KYC identity documents "
+        "that do not have one yet, in a pool of worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, help="Worker processes (defaults to the number of CPUs).")
+        parser.add_argument('--batch-size', type=int, default=100, help="Applications processed per batch.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = generate_previews(processes=options['processes'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            "Generated previews for {} applications in {:.1f}s".format(count, time.monotonic() - started)))
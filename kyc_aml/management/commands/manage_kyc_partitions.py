@@ -0,0 +1,28 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from kyc_aml.partitions import ARCHIVE_SCHEMA, MONTHS_AHEAD, PARTITIONED_TABLES, list_partitions, maintain_partitions
+
+
+class Command(BaseCommand):
+    help = "Create upcoming monthly partitions of the partitioned KYC tables and archive old ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=MONTHS_AHEAD,
+                            help="Months after the current one to create partitions for.")
+        parser.add_argument('--retention-months', type=int, default=settings.KYC_PARTITION_RETENTION_MONTHS,
+                            help="Detach partitions older than this many months to the {} schema.".format(
+                                ARCHIVE_SCHEMA))
+        parser.add_argument('--list', action='store_true', help="List the partitions of each table.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        created, detached = maintain_partitions(options['months_ahead'], options['retention_months'])
+        if options['list']:
+            for table in PARTITIONED_TABLES:
+                for name, bounds in list_partitions(table):
+                    self.stdout.write("{}: {}".format(name, bounds))
+        self.stdout.write(self.style.SUCCESS("Created {} and archived {} partitions in {:.1f}s".format(
+            len(created), len(detached), time.monotonic() - started)))
@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from kyc_aml.merge import BATCH_SIZE, merge_applications
+
+
+class Command(BaseCommand):
+    help = "Merge the data of verified KYC applications into their users' profiles and addresses."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Applications merged per transaction.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = merge_applications(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            "Merged {} applications in {:.1f}s".format(count, time.monotonic() - started)))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from kyc_aml.identity import BATCH_SIZE, rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the identity fingerprints of all KYC applications. "
+        "Run after the initial migration and whenever SECRET_KEY is rotated."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Applications indexed per transaction.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            "Indexed {} applications in {:.1f}s".format(count, time.monotonic() - started)))
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from kyc_aml.screening import BATCH_SIZE, rescreen
+
+
+class Command(BaseCommand):
+    help = (
+        "Screen all KYC applicants not yet screened against the current sanctions/PEP list. "
+        "Run whenever the list file is updated."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--list', dest='path', help="List file (defaults to KYC_SCREENING_LIST_PATH).")
+        parser.add_argument('--processes', type=int, help="Worker processes (defaults to the number of CPUs).")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Applicants recorded per transaction.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = rescreen(options['path'], processes=options['processes'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            "Screened {} applicants in {:.1f}s".format(count, time.monotonic() - started)))
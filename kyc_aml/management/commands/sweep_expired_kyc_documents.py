@@ -0,0 +1,21 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from kyc_aml.expiry import BATCH_SIZE, sweep_expired_documents
+
+
+class Command(BaseCommand):
+    help = "Unverify verified KYC applications whose identity document expires within the notice period."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.KYC_ID_EXPIRY_NOTICE_DAYS,
+                            help="Sweep documents expiring within this many days.")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Applications swept per transaction.")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = sweep_expired_documents(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            "Unverified {} applications in {:.1f}s".format(count, time.monotonic() - started)))
@@ -0,0 +1,117 @@
+"""
+Merging of verified KYC data into user profiles (the ``merge_kyc`` permission).
+
+Verified applications are merged in batches, oldest review first, so a newer
+review of the same user wins. Per batch, the newest application of each user
+is copied onto ``User`` and onto existing current addresses with one
+``UPDATE ... FROM`` each; missing current addresses are created with
+``bulk_create`` and linked with ``bulk_update``. Nothing is saved row by row.
+"""
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from vigolend.users.models import User, UserAddress
+
+from .models import KycApplication
+
+BATCH_SIZE = 1000
+
+# Newest application per user among the batch.
+SOURCE = '''
+    SELECT DISTINCT ON (user_id) *
+    FROM kyc_applications
+    WHERE id = ANY(%s)
+    ORDER BY user_id, kyc_review_date DESC NULLS LAST, created_date DESC
+'''
+
+USER_UPDATE = '''
+    UPDATE {user} AS u SET
+        first_name = COALESCE(k.legal_first_names, u.first_name),
+        last_name = COALESCE(k.legal_last_names, u.last_name),
+        name = LEFT(CONCAT_WS(' ', COALESCE(k.legal_first_names, u.first_name),
+                              COALESCE(k.legal_last_names, u.last_name)), 255),
+        date_of_birth = COALESCE(k.birth_date, u.date_of_birth),
+        place_of_birth = COALESCE(LEFT(k.place_of_birth, 150), u.place_of_birth),
+        country_of_residence_id = k.country_residence_id,
+        modified_date = %s
+    FROM ({source}) AS k
+    WHERE u.id = k.user_id
+'''
+
+ADDRESS_UPDATE = '''
+    UPDATE {address} AS a SET
+        address_line_1 = LEFT(k.address_line_1, 50),
+        address_line_2 = LEFT(k.address_line_2, 50),
+        state = LEFT(k.state, 50),
+        city = LEFT(k.city, 50),
+        zip_post_code = LEFT(k.zip_code, 20),
+        country_id = k.country_residence_id
+    FROM ({source}) AS k, {user} AS u
+    WHERE u.id = k.user_id AND a.id = u.current_address_id
+'''
+
+
+def mergeable_applications(queryset=None):
+    """Verified applications whose data has not been merged yet, oldest review first."""
+    queryset = KycApplication.objects.all() if queryset is None else queryset
+    return queryset.filter(kyc_status='verified', merged_date__isnull=True).order_by(
+        F('kyc_review_date').asc(nulls_first=True), 'id')
+
+
+def _address(application):
+    def clip(value, field):
+        return value[:UserAddress._meta.get_field(field).max_length] if value else value
+
+    return UserAddress(
+        type='current',
+        user_id=application.user_id,
+        address_line_1=clip(application.address_line_1, 'address_line_1'),
+        address_line_2=clip(application.address_line_2, 'address_line_2'),
+        state=clip(application.state, 'state'),
+        city=clip(application.city, 'city'),
+        zip_post_code=clip(application.zip_code, 'zip_post_code'),
+        country_id=application.country_residence_id,
+    )
+
+
+def _merge_batch(pks):
+    now = timezone.now()
+    tables = {
+        'user': connection.ops.quote_name(User._meta.db_table),
+        'address': connection.ops.quote_name(UserAddress._meta.db_table),
+        'source': SOURCE,
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(USER_UPDATE.format(**tables), [now, pks])
+        cursor.execute(ADDRESS_UPDATE.format(**tables), [pks])
+
+    # Users without a current address get one created from their application.
+    newest = (
+        KycApplication.objects
+        .filter(pk__in=pks, user__current_address__isnull=True)
+        .order_by('user_id', F('kyc_review_date').desc(nulls_last=True), '-created_date')
+        .distinct('user_id')
+        .only('user', 'address_line_1', 'address_line_2', 'state', 'city', 'zip_code', 'country_residence'))
+    addresses = UserAddress.objects.bulk_create([_address(application) for application in newest])
+    User.objects.bulk_update(
+        [User(pk=address.user_id, current_address=address, modified_date=now) for address in addresses],
+        ['current_address', 'modified_date'])
+
+    KycApplication.objects.filter(pk__in=pks).update(merged_date=now)
+
+
+def merge_applications(queryset=None, batch_size=BATCH_SIZE):
+    """
+    Merge the verified, not yet merged applications of ``queryset`` (all by
+    default) into their users' profiles. Returns the number of applications merged.
+    """
+    queryset = mergeable_applications(queryset)
+    merged = 0
+    while True:
+        with transaction.atomic():
+            pks = list(queryset.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return merged
+            _merge_batch(pks)
+        merged += len(pks)
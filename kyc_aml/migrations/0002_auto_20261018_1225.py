@@ -0,0 +1,36 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:25
+
+from django.db import migrations
+import django.db.models.deletion
+import locations.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('kyc_aml', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='kycapplication',
+            name='citizenship',
+            field=locations.fields.CountryForeignKey(help_text='The citizenship of the user submitting KYC application. A proof of such citizenship is required by form of National ID or Passport.', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='locations.country', verbose_name='Citizenship'),
+        ),
+        migrations.AlterField(
+            model_name='kycapplication',
+            name='country_residence',
+            field=locations.fields.CountryForeignKey(blank=True, help_text='The country in which the person primarily resides. A proof of residence is required and requested upon change of residence.', on_delete=django.db.models.deletion.CASCADE, to='locations.country', verbose_name='Country of Residence'),
+        ),
+        migrations.AlterField(
+            model_name='kycapplication',
+            name='kyc_country',
+            field=locations.fields.CountryForeignKey(blank=True, help_text='Country for which KYC has been performed against user. Each country may have different set of fields for KYC. This flag drives the system to show or hide the necessary fields.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='kyc_country', to='locations.country', verbose_name='KYC Country'),
+        ),
+        migrations.AlterField(
+            model_name='kycapplication',
+            name='second_citizenship',
+            field=locations.fields.CountryForeignKey(blank=True, help_text="The user's second Nationality (if he/she has dual Nationality).", null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='locations.country', verbose_name='Second Citizenship'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+def normalize_pending_status(apps, schema_editor):
+    # Rows created with the former 'Pending' default would be invisible to the review queue.
+    KycApplication = apps.get_model('kyc_aml', 'KycApplication')
+    KycApplication.objects.filter(kyc_status='Pending').update(kyc_status='pending')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc_aml', '0002_auto_20261018_1225'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kycapplication',
+            name='review_claimed_date',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Timestamp at which the reviewer claimed the application from the review queue.', null=True, verbose_name='Review Claimed Date'),
+        ),
+        migrations.AddField(
+            model_name='kycapplication',
+            name='review_priority',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Pending applications with a higher priority are handed to reviewers first.', verbose_name='Review Priority'),
+        ),
+        migrations.AlterField(
+            model_name='kycapplication',
+            name='kyc_status',
+            field=models.CharField(choices=[('verified', 'verified'), ('unverified', 'Unverified'), ('pending', 'Pending'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled')], default='pending', help_text='The KYC status of the user. The default is `Unverified`.', max_length=28, verbose_name='KYC Status'),
+        ),
+        migrations.RunPython(normalize_pending_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='kycapplication',
+            index=models.Index(condition=models.Q(('kyc_status', 'pending'), ('reviewer__isnull', True)), fields=['-review_priority', 'created_date', 'id'], name='kyc_review_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc_aml', '0004_document_upload_to'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kycapplication',
+            name='previews_generated_date',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Timestamp at which the review previews of the identity documents were generated.', null=True, verbose_name='Previews Generated Date'),
+        ),
+    ]
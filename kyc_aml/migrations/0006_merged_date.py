@@ -0,0 +1,22 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc_aml', '0005_previews_generated_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kycapplication',
+            name='merged_date',
+            field=models.DateTimeField(blank=True, editable=False, help_text="Timestamp at which the verified KYC data was merged into the user's profile.", null=True, verbose_name='Merged Date'),
+        ),
+        migrations.AddIndex(
+            model_name='kycapplication',
+            index=models.Index(condition=models.Q(('kyc_status', 'verified'), ('merged_date__isnull', True)), fields=['kyc_review_date', 'id'], name='kyc_merge_queue_idx'),
+        ),
+    ]
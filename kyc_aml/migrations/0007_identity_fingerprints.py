@@ -0,0 +1,35 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('kyc_aml', '0006_merged_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdentityFingerprint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('id_number', 'Identification number'), ('name_birth_date', 'Legal name and date of birth'), ('ip_address', 'Submission IP address')], help_text='The identity attribute that was hashed.', max_length=15, verbose_name='Kind')),
+                ('digest', models.CharField(db_index=True, help_text='Keyed hash of the normalized attribute value.', max_length=64, verbose_name='Digest')),
+                ('application', models.ForeignKey(db_index=False, help_text='The application the fingerprint was computed from.', on_delete=django.db.models.deletion.CASCADE, related_name='fingerprints', to='kyc_aml.kycapplication', verbose_name='KYC Application')),
+                ('user', models.ForeignKey(help_text='The owner of the application, copied to tell apart matches of other users.', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='KYC User')),
+            ],
+            options={
+                'verbose_name': 'Identity Fingerprint',
+                'verbose_name_plural': 'Identity Fingerprints',
+                'db_table': 'kyc_identity_fingerprints',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='identityfingerprint',
+            constraint=models.UniqueConstraint(fields=('application', 'kind'), name='kyc_fingerprint_unique_kind'),
+        ),
+    ]
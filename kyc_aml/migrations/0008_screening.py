@@ -0,0 +1,50 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc_aml', '0007_identity_fingerprints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kycapplication',
+            name='screened_date',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Timestamp at which the applicant was last screened against the sanctions/PEP list.', null=True, verbose_name='Screened Date'),
+        ),
+        migrations.AddField(
+            model_name='kycapplication',
+            name='screening_list_version',
+            field=models.CharField(blank=True, editable=False, help_text='Checksum of the sanctions/PEP list file the applicant was last screened against.', max_length=64, verbose_name='Screening List Version'),
+        ),
+        migrations.CreateModel(
+            name='ScreeningHit',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_id', models.CharField(help_text='Identifier of the matched entry in the sanctions/PEP list.', max_length=100, verbose_name='List Entry ID')),
+                ('entry_name', models.CharField(help_text='Name or alias of the list entry that matched.', max_length=255, verbose_name='List Entry Name')),
+                ('entry_list', models.CharField(blank=True, help_text='The sanctions programme or PEP list the entry belongs to.', max_length=100, verbose_name='List')),
+                ('entry_type', models.CharField(blank=True, help_text='Type of the list entry, e.g. sanction or pep.', max_length=50, verbose_name='Entry Type')),
+                ('score', models.FloatField(help_text='Similarity of the names, from 0 to 1.', verbose_name='Score')),
+                ('birth_date_match', models.BooleanField(default=False, help_text='Whether the list entry has the birth date of the applicant.', verbose_name='Birth Date Match')),
+                ('list_version', models.CharField(help_text='Checksum of the list file the hit was found in.', max_length=64, verbose_name='List Version')),
+                ('status', models.CharField(choices=[('open', 'Open'), ('confirmed', 'Confirmed'), ('dismissed', 'Dismissed (false positive)')], default='open', help_text='Reviewed hits are kept when the applicant is screened again.', max_length=9, verbose_name='Status')),
+                ('created_date', models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Timestamp when the hit was recorded.', verbose_name='Created Date')),
+                ('application', models.ForeignKey(db_index=False, help_text='The screened application.', on_delete=django.db.models.deletion.CASCADE, related_name='screening_hits', to='kyc_aml.kycapplication', verbose_name='KYC Application')),
+            ],
+            options={
+                'verbose_name': 'Screening Hit',
+                'verbose_name_plural': 'Screening Hits',
+                'db_table': 'kyc_screening_hits',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='screeninghit',
+            constraint=models.UniqueConstraint(fields=('application', 'entry_id'), name='kyc_screening_hit_unique_entry'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:45
+
+from django.db import migrations, models
+
+CREATE_VIEW = """
+CREATE MATERIALIZED VIEW kyc_funnel_daily AS
+SELECT row_number() OVER (ORDER BY day, kyc_status, kyc_country_id) AS id, *
+FROM (
+    SELECT (created_date AT TIME ZONE 'UTC')::date AS day, kyc_status, kyc_country_id, COUNT(*) AS applications
+    FROM kyc_applications
+    GROUP BY 1, 2, 3
+) AS counts;
+-- Required by REFRESH MATERIALIZED VIEW CONCURRENTLY.
+CREATE UNIQUE INDEX kyc_funnel_daily_key ON kyc_funnel_daily (day, kyc_status, kyc_country_id);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc_aml', '0008_screening'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KycFunnelStat',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('day', models.DateField(verbose_name='Day')),
+                ('kyc_status', models.CharField(choices=[('verified', 'verified'), ('unverified', 'Unverified'), ('pending', 'Pending'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled')], max_length=28, verbose_name='KYC Status')),
+                ('applications', models.BigIntegerField(verbose_name='Applications')),
+            ],
+            options={
+                'verbose_name': 'KYC Funnel Statistic',
+                'verbose_name_plural': 'KYC Funnel Statistics',
+                'db_table': 'kyc_funnel_daily',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(CREATE_VIEW, 'DROP MATERIALIZED VIEW kyc_funnel_daily'),
+    ]
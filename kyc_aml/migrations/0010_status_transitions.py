@@ -0,0 +1,98 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:47
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+from kyc_aml.partitions import create_partitions
+
+CREATE_TABLE = """
+CREATE TABLE kyc_status_transitions (
+    id bigserial NOT NULL,
+    created_date timestamp with time zone NOT NULL,
+    application_id uuid NOT NULL,
+    user_id uuid NOT NULL,
+    from_status varchar(28) NOT NULL,
+    to_status varchar(28) NOT NULL,
+    actor_id uuid NULL,
+    note text NULL,
+    refused_code varchar(34) NULL,
+    -- The primary key of a partitioned table must include the partition key.
+    PRIMARY KEY (id, created_date)
+) PARTITION BY RANGE (created_date);
+CREATE TABLE kyc_status_transitions_default PARTITION OF kyc_status_transitions DEFAULT;
+CREATE INDEX kyc_transition_app_idx ON kyc_status_transitions (application_id, created_date);
+CREATE INDEX kyc_transition_user_idx ON kyc_status_transitions (user_id, created_date);
+CREATE INDEX kyc_transition_status_idx ON kyc_status_transitions (to_status, created_date);
+
+CREATE FUNCTION kyc_status_transitions_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'kyc_status_transitions is append-only';
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER kyc_status_transitions_append_only
+    BEFORE UPDATE OR DELETE ON kyc_status_transitions
+    FOR EACH STATEMENT EXECUTE PROCEDURE kyc_status_transitions_append_only();
+"""
+
+DROP_TABLE = """
+DROP TABLE kyc_status_transitions;
+DROP FUNCTION kyc_status_transitions_append_only();
+"""
+
+
+def create_monthly_partitions(apps, schema_editor):
+    create_partitions('kyc_status_transitions', using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('kyc_aml', '0009_funnel_statistics'),
+    ]
+
+    state_operations = [
+        migrations.CreateModel(
+            name='KycStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_date', models.DateTimeField(default=django.utils.timezone.now, editable=False, help_text='Timestamp of the transition, and partition key of the table.', verbose_name='Transition Date')),
+                ('from_status', models.CharField(choices=[('verified', 'verified'), ('unverified', 'Unverified'), ('pending', 'Pending'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled')], help_text='Status of the application before the transition.', max_length=28, verbose_name='From Status')),
+                ('to_status', models.CharField(choices=[('verified', 'verified'), ('unverified', 'Unverified'), ('pending', 'Pending'), ('rejected', 'Rejected'), ('cancelled', 'Cancelled')], help_text='Status of the application after the transition.', max_length=28, verbose_name='To Status')),
+                ('note', models.TextField(blank=True, help_text='The reason given for the transition.', null=True, verbose_name='Note')),
+                ('refused_code', models.CharField(blank=True, choices=[('EXPIRED_DOCUMENT', 'Document Expired'), ('DOCUMENT_DOES_NOT_MATCH_USER_DATA', 'Document does not match user data')], help_text='The type of reason for a refusal.', max_length=34, null=True, verbose_name='Refused Code')),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, db_index=False, help_text='The staff member who made the transition; empty for automated transitions.', null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Actor')),
+                ('application', models.ForeignKey(db_constraint=False, db_index=False, help_text='The application whose status changed.', on_delete=django.db.models.deletion.DO_NOTHING, related_name='status_transitions', to='kyc_aml.kycapplication', verbose_name='KYC Application')),
+                ('user', models.ForeignKey(db_constraint=False, db_index=False, help_text='The owner of the application.', on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='KYC User')),
+            ],
+            options={
+                'verbose_name': 'KYC Status Transition',
+                'verbose_name_plural': 'KYC Status Transitions',
+                'db_table': 'kyc_status_transitions',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='kycstatustransition',
+            index=models.Index(fields=['application', 'created_date'], name='kyc_transition_app_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kycstatustransition',
+            index=models.Index(fields=['user', 'created_date'], name='kyc_transition_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kycstatustransition',
+            index=models.Index(fields=['to_status', 'created_date'], name='kyc_transition_status_idx'),
+        ),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(CREATE_TABLE, DROP_TABLE),
+                migrations.RunPython(create_monthly_partitions, migrations.RunPython.noop),
+            ],
+            state_operations=state_operations,
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc_aml', '0010_status_transitions'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kycapplication',
+            index=models.Index(condition=models.Q(('identification_expiry__isnull', False), ('kyc_status', 'verified')), fields=['identification_expiry', 'id'], name='kyc_expiry_sweep_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from kyc_aml.partitions import partition_table
+
+# Materialized views selecting from kyc_applications, recreated on the partitioned table.
+DEPENDENT_VIEWS = ('kyc_funnel_daily',)
+
+
+def partition_applications(apps, schema_editor):
+    connection = schema_editor.connection
+    views = []
+    with connection.cursor() as cursor:
+        for view in DEPENDENT_VIEWS:
+            cursor.execute('SELECT pg_get_viewdef(%s::regclass)', [view])
+            definition = cursor.fetchone()[0]
+            cursor.execute('SELECT indexdef FROM pg_indexes WHERE tablename = %s', [view])
+            views.append((view, definition, [row[0] for row in cursor.fetchall()]))
+            cursor.execute('DROP MATERIALIZED VIEW {}'.format(connection.ops.quote_name(view)))
+
+    partition_table('kyc_applications', 'created_date', using=connection.alias)
+
+    with connection.cursor() as cursor:
+        for view, definition, indexes in views:
+            cursor.execute('CREATE MATERIALIZED VIEW {} AS {}'.format(
+                connection.ops.quote_name(view), definition.rstrip().rstrip(';')))
+            for index in indexes:
+                cursor.execute(index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc_aml', '0011_expiry_sweep_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='identityfingerprint',
+            name='application',
+            field=models.ForeignKey(db_constraint=False, db_index=False, help_text='The application the fingerprint was computed from.', on_delete=django.db.models.deletion.CASCADE, related_name='fingerprints', to='kyc_aml.kycapplication', verbose_name='KYC Application'),
+        ),
+        migrations.AlterField(
+            model_name='screeninghit',
+            name='application',
+            field=models.ForeignKey(db_constraint=False, db_index=False, help_text='The screened application.', on_delete=django.db.models.deletion.CASCADE, related_name='screening_hits', to='kyc_aml.kycapplication', verbose_name='KYC Application'),
+        ),
+        migrations.RunPython(partition_applications),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kyc_aml', '0012_partition_applications'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kycapplication',
+            index=models.Index(fields=['birth_date'], name='kyc_birth_date_idx'),
+        ),
+    ]
@@ -1,4 +1,3 @@
-from datetime import datetime
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
@@ -8,7 +7,11 @@ from vigolend.users.models import User
 
 from helpers.common.basemodel import BaseModel
 from helpers.common.choices import ModelChoices
+from locations.fields import CountryForeignKey
 from locations.models import Country
+from locations.snapshot import validate_address
+
+from .ages import age_on
 
 
 class KycApplication(BaseModel):
@@ -86,32 +89,38 @@ class KycApplication(BaseModel):
         help_text=_("""Document that serves as a Proof of address. Chosen credential must not be expired. Document should be good condition and clearly visible. File is at least 1 MB in size and has at least 300 dpi resolution."""))
 
     proof_of_address_document = models.FileField(
-        storage="uploads/kyc/",
+        upload_to="uploads/kyc/",
         verbose_name=_('Proof of Address'),
         help_text=_("""The document must contain your name, the address and should not be older than 90 days. Chosen credential must not be expired. Document should be good condition and clearly visible. File is at least 1 MB in size and has at least 300 dpi resolution."""))
 
     photo_id = models.FileField(
-        storage="uploads/kyc/",
+        upload_to="uploads/kyc/",
         verbose_name=_('Photo ID(front)'),
         help_text=_("""The front side of The user's Photo Identitification. Chosen credential must not be expired. Document should be good condition and clearly visible. File is at least 1 MB in size and has at least 300 dpi resolution."""))
 
     photo_id_back = models.FileField(
-        storage="uploads/kyc/",
+        upload_to="uploads/kyc/",
         verbose_name=_('Photo ID(back)'),
         blank=True, null=True,
         help_text=_("""The back side of The user's Photo Identitification. Chosen credential must not be expired. Document should be good condition and clearly visible. File is at least 1 MB in size and has at least 300 dpi resolution."""))
 
     selfie_with_id = models.FileField(
-        storage="uploads/kyc/",
+        upload_to="uploads/kyc/",
         verbose_name=_('Selfie with ID'),
         help_text=_(
             """Upload a photo with yourself and your Passport or both sides of the ID Card. The face and the document must be clearly visible."""),
         blank=True, null=True)
 
+    previews_generated_date = models.DateTimeField(
+        blank=True, null=True,
+        editable=False,
+        verbose_name=_('Previews Generated Date'),
+        help_text=_("Timestamp at which the review previews of the identity documents were generated."))
+
     kyc_status = models.CharField(
         max_length=28,
         choices=ModelChoices.KYC_STATUS,
-        default='Pending',
+        default='pending',
         verbose_name=_('KYC Status'),
         help_text=_("The KYC status of the user. The default is `Unverified`."))
 
@@ -193,14 +202,14 @@ class KycApplication(BaseModel):
     # endregion
 
     # region Navigation Fields
-    citizenship = models.ForeignKey(
+    citizenship = CountryForeignKey(
         Country,
         verbose_name=_('Citizenship'),
         on_delete=models.CASCADE,
         related_name='+',
         help_text=_("""The citizenship of the user submitting KYC application. A proof of such citizenship is required by form of National ID or Passport."""))
 
-    second_citizenship = models.ForeignKey(
+    second_citizenship = CountryForeignKey(
         Country,
         verbose_name=_('Second Citizenship'),
         on_delete=models.CASCADE,
@@ -208,14 +217,14 @@ class KycApplication(BaseModel):
         blank=True, null=True,
         related_name='+')
 
-    country_residence = models.ForeignKey(
+    country_residence = CountryForeignKey(
         Country,
         blank=True,
         verbose_name=_('Country of Residence'),
         on_delete=models.CASCADE,
         help_text=_("""The country in which the person primarily resides. A proof of residence is required and requested upon change of residence."""))
 
-    kyc_country = models.ForeignKey(
+    kyc_country = CountryForeignKey(
         Country,
         on_delete=models.PROTECT,
         blank=True, null=True,
@@ -243,6 +252,36 @@ class KycApplication(BaseModel):
         verbose_name=_('KYC Checked Date'),
         help_text=_("""Date on which KYC check was performed."""))
 
+    review_priority = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('Review Priority'),
+        help_text=_("Pending applications with a higher priority are handed to reviewers first."))
+
+    review_claimed_date = models.DateTimeField(
+        blank=True, null=True,
+        editable=False,
+        verbose_name=_('Review Claimed Date'),
+        help_text=_("Timestamp at which the reviewer claimed the application from the review queue."))
+
+    merged_date = models.DateTimeField(
+        blank=True, null=True,
+        editable=False,
+        verbose_name=_('Merged Date'),
+        help_text=_("Timestamp at which the verified KYC data was merged into the user's profile."))
+
+    screened_date = models.DateTimeField(
+        blank=True, null=True,
+        editable=False,
+        verbose_name=_('Screened Date'),
+        help_text=_("Timestamp at which the applicant was last screened against the sanctions/PEP list."))
+
+    screening_list_version = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        verbose_name=_('Screening List Version'),
+        help_text=_("Checksum of the sanctions/PEP list file the applicant was last screened against."))
+
     reviewer_ip_address = models.GenericIPAddressField(
         blank=True, null=True,
         verbose_name=_('Staff Submitted IP'),
@@ -262,7 +301,27 @@ class KycApplication(BaseModel):
     class Meta:
         verbose_name = _('KYC Application')
         verbose_name_plural = _('KYC Applications')
+        # Range partitioned by month on created_date, see kyc_aml.partitions.
         db_table = 'kyc_applications'
+        indexes = [
+            # Unclaimed part of the review queue, in the order it is handed out.
+            models.Index(
+                fields=['-review_priority', 'created_date', 'id'],
+                name='kyc_review_queue_idx',
+                condition=models.Q(kyc_status='pending', reviewer__isnull=True)),
+            # Verified applications still to be merged into user profiles.
+            models.Index(
+                fields=['kyc_review_date', 'id'],
+                name='kyc_merge_queue_idx',
+                condition=models.Q(kyc_status='verified', merged_date__isnull=True)),
+            # Age band filters are ranges of birth dates.
+            models.Index(fields=['birth_date'], name='kyc_birth_date_idx'),
+            # Verified applications by expiry of their identity document.
+            models.Index(
+                fields=['identification_expiry', 'id'],
+                name='kyc_expiry_sweep_idx',
+                condition=models.Q(kyc_status='verified', identification_expiry__isnull=False)),
+        ]
         permissions = [
             ("verify_kyc", _("Verify KYC Application")),
             ("reject_kyc", _("Reject KYC Application")),
@@ -272,17 +331,22 @@ class KycApplication(BaseModel):
 
     # region Methods
     def __str__(self):
-        return _("KYC #: ") + self.reference
+        return _("KYC #: ") + str(self.pk)
 
     @property
     def age(self):
-        return int((datetime.now().date() - self.birth_date).days / 365.25)
+        return age_on(self.birth_date) if self.birth_date else None
 
     def get_user(self):
         return str(self.user.pk)
 
     get_object_user = property(get_user)
 
+    def clean(self):
+        super().clean()
+        # Checked against the memory-mapped locations snapshot, not the database.
+        validate_address(self.country_residence, self.state, self.city)
+
     # def clean_fields(self, exclude=None):
     #     super().clean_fields(exclude=exclude)
     #     if self.identification_issue_date == self.identification_expiry:
@@ -309,3 +373,266 @@ class KycApplication(BaseModel):
     #         )
 
     # endregion
+
+
+class IdentityFingerprint(models.Model):
+    """
+    Keyed hash of one normalized identity attribute of a KYC application.
+
+    Applications of different users sharing a digest reuse the same identity
+    document, legal name and birth date, or IP address. Rows are maintained
+    when applications are saved (see ``kyc_aml.identity``), so collisions are
+    found with index lookups on ``digest``.
+    """
+    ID_NUMBER = 'id_number'
+    NAME_BIRTH_DATE = 'name_birth_date'
+    IP_ADDRESS = 'ip_address'
+    KINDS = (
+        (ID_NUMBER, _('Identification number')),
+        (NAME_BIRTH_DATE, _('Legal name and date of birth')),
+        (IP_ADDRESS, _('Submission IP address')),
+    )
+
+    # region Fields
+    application = models.ForeignKey(
+        KycApplication,
+        on_delete=models.CASCADE,
+        # kyc_applications is partitioned, its ids cannot be referenced by a constraint.
+        db_constraint=False,
+        related_name='fingerprints',
+        # Covered by the (application, kind) unique constraint.
+        db_index=False,
+        verbose_name=_('KYC Application'),
+        help_text=_('The application the fingerprint was computed from.'))
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('KYC User'),
+        help_text=_('The owner of the application, copied to tell apart matches of other users.'))
+
+    kind = models.CharField(
+        max_length=15,
+        choices=KINDS,
+        verbose_name=_('Kind'),
+        help_text=_('The identity attribute that was hashed.'))
+
+    digest = models.CharField(
+        max_length=64,
+        db_index=True,
+        verbose_name=_('Digest'),
+        help_text=_('Keyed hash of the normalized attribute value.'))
+    # endregion
+
+    # region Metadata
+    class Meta:
+        verbose_name = _('Identity Fingerprint')
+        verbose_name_plural = _('Identity Fingerprints')
+        db_table = 'kyc_identity_fingerprints'
+        constraints = [
+            models.UniqueConstraint(fields=['application', 'kind'], name='kyc_fingerprint_unique_kind'),
+        ]
+    # endregion
+
+    def __str__(self):
+        return '{}: {}'.format(self.get_kind_display(), self.digest[:12])
+
+
+class ScreeningHit(models.Model):
+    """A fuzzy match of a KYC applicant against an entry of the sanctions/PEP list."""
+    OPEN = 'open'
+    CONFIRMED = 'confirmed'
+    DISMISSED = 'dismissed'
+    STATUSES = (
+        (OPEN, _('Open')),
+        (CONFIRMED, _('Confirmed')),
+        (DISMISSED, _('Dismissed (false positive)')),
+    )
+
+    # region Fields
+    application = models.ForeignKey(
+        KycApplication,
+        on_delete=models.CASCADE,
+        # kyc_applications is partitioned, its ids cannot be referenced by a constraint.
+        db_constraint=False,
+        related_name='screening_hits',
+        # Covered by the (application, entry_id) unique constraint.
+        db_index=False,
+        verbose_name=_('KYC Application'),
+        help_text=_('The screened application.'))
+
+    entry_id = models.CharField(
+        max_length=100,
+        verbose_name=_('List Entry ID'),
+        help_text=_('Identifier of the matched entry in the sanctions/PEP list.'))
+
+    entry_name = models.CharField(
+        max_length=255,
+        verbose_name=_('List Entry Name'),
+        help_text=_('Name or alias of the list entry that matched.'))
+
+    entry_list = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_('List'),
+        help_text=_('The sanctions programme or PEP list the entry belongs to.'))
+
+    entry_type = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name=_('Entry Type'),
+        help_text=_('Type of the list entry, e.g. sanction or pep.'))
+
+    score = models.FloatField(
+        verbose_name=_('Score'),
+        help_text=_('Similarity of the names, from 0 to 1.'))
+
+    birth_date_match = models.BooleanField(
+        default=False,
+        verbose_name=_('Birth Date Match'),
+        help_text=_('Whether the list entry has the birth date of the applicant.'))
+
+    list_version = models.CharField(
+        max_length=64,
+        verbose_name=_('List Version'),
+        help_text=_('Checksum of the list file the hit was found in.'))
+
+    status = models.CharField(
+        max_length=9,
+        choices=STATUSES,
+        default=OPEN,
+        verbose_name=_('Status'),
+        help_text=_('Reviewed hits are kept when the applicant is screened again.'))
+
+    created_date = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name=_('Created Date'),
+        help_text=_('Timestamp when the hit was recorded.'))
+    # endregion
+
+    # region Metadata
+    class Meta:
+        verbose_name = _('Screening Hit')
+        verbose_name_plural = _('Screening Hits')
+        db_table = 'kyc_screening_hits'
+        constraints = [
+            models.UniqueConstraint(fields=['application', 'entry_id'], name='kyc_screening_hit_unique_entry'),
+        ]
+    # endregion
+
+    def __str__(self):
+        return '{} ({:.0%})'.format(self.entry_name, self.score)
+
+
+class KycFunnelStat(models.Model):
+    """
+    Number of applications created per day (UTC), KYC status and KYC country.
+
+    Read-only view of the ``kyc_funnel_daily`` materialized view, refreshed
+    periodically by ``kyc_aml.funnel.refresh``; the admin dashboard reads
+    these aggregates instead of scanning ``kyc_applications``.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    day = models.DateField(verbose_name=_('Day'))
+    kyc_status = models.CharField(max_length=28, choices=ModelChoices.KYC_STATUS, verbose_name=_('KYC Status'))
+    kyc_country = models.ForeignKey(
+        Country, on_delete=models.DO_NOTHING, db_constraint=False, blank=True, null=True, related_name='+',
+        verbose_name=_('KYC Country'))
+    applications = models.BigIntegerField(verbose_name=_('Applications'))
+
+    class Meta:
+        managed = False
+        db_table = 'kyc_funnel_daily'
+        verbose_name = _('KYC Funnel Statistic')
+        verbose_name_plural = _('KYC Funnel Statistics')
+
+
+class KycStatusTransition(models.Model):
+    """
+    Append-only audit log of KYC status transitions.
+
+    Rows are written by ``kyc_aml.transitions`` in the same statement as the
+    status change itself. The table is range partitioned by month on
+    ``created_date`` (see ``kyc_aml.partitions``) and rejects updates and
+    deletes; old months are detached as whole partitions. References to
+    applications and users carry no database constraint, so the history
+    outlives the rows it describes.
+    """
+    # region Fields
+    id = models.BigAutoField(primary_key=True)
+
+    created_date = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name=_('Transition Date'),
+        help_text=_('Timestamp of the transition, and partition key of the table.'))
+
+    application = models.ForeignKey(
+        KycApplication,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='status_transitions',
+        db_index=False,
+        verbose_name=_('KYC Application'),
+        help_text=_('The application whose status changed.'))
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        db_index=False,
+        verbose_name=_('KYC User'),
+        help_text=_('The owner of the application.'))
+
+    from_status = models.CharField(
+        max_length=28,
+        choices=ModelChoices.KYC_STATUS,
+        verbose_name=_('From Status'),
+        help_text=_('Status of the application before the transition.'))
+
+    to_status = models.CharField(
+        max_length=28,
+        choices=ModelChoices.KYC_STATUS,
+        verbose_name=_('To Status'),
+        help_text=_('Status of the application after the transition.'))
+
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        blank=True, null=True,
+        related_name='+',
+        db_index=False,
+        verbose_name=_('Actor'),
+        help_text=_('The staff member who made the transition; empty for automated transitions.'))
+
+    note = models.TextField(
+        blank=True, null=True,
+        verbose_name=_('Note'),
+        help_text=_('The reason given for the transition.'))
+
+    refused_code = models.CharField(
+        max_length=34,
+        choices=ModelChoices.KYC_REFUSE_REASON_CODE,
+        blank=True, null=True,
+        verbose_name=_('Refused Code'),
+        help_text=_('The type of reason for a refusal.'))
+    # endregion
+
+    # region Metadata
+    class Meta:
+        verbose_name = _('KYC Status Transition')
+        verbose_name_plural = _('KYC Status Transitions')
+        db_table = 'kyc_status_transitions'
+        indexes = [
+            models.Index(fields=['application', 'created_date'], name='kyc_transition_app_idx'),
+            models.Index(fields=['user', 'created_date'], name='kyc_transition_user_idx'),
+            models.Index(fields=['to_status', 'created_date'], name='kyc_transition_status_idx'),
+        ]
+    # endregion
+
+    def __str__(self):
+        return '{} -> {}'.format(self.from_status, self.to_status)
@@ -0,0 +1,213 @@
+"""
+Monthly range partitions of PostgreSQL tables partitioned on a timestamp.
+
+Partitions are named ``<table>_yYYYYmMM`` and cover one calendar month in
+UTC. Each partitioned table also has a ``<table>_default`` partition, so
+inserts never fail; partitions are created ahead of time so that it stays
+empty (a non-empty default partition blocks creating the overlapping month).
+
+Old partitions are detached into the ``ARCHIVE_SCHEMA`` schema, where they
+are plain tables that can be dumped and dropped. Rows of other tables
+belonging to the archived rows (``DEPENDENT_TABLES``) are moved to tables of
+the same name in that schema, so nothing points at the archived rows. The
+status transitions log is kept whole: it is append-only and partitioned on
+its own ``created_date``.
+
+Queries filtering on the partition key skip partitions outside their range,
+and detached months are not scanned at all. Lookups by primary key alone
+(``filter(pk=...)``, admin change views, ``transition``) have no partition
+key to prune on and probe an index of every attached partition.
+"""
+import datetime
+import re
+
+from django.db import connections, transaction
+
+PARTITIONED_TABLES = ('kyc_applications', 'kyc_status_transitions')
+MONTHS_AHEAD = 3
+ARCHIVE_SCHEMA = 'kyc_archive'
+# Tables referencing the rows of a partitioned table, by table: [(table, referencing column)].
+DEPENDENT_TABLES = {
+    'kyc_applications': [('kyc_identity_fingerprints', 'application_id'), ('kyc_screening_hits', 'application_id')],
+}
+
+
+def month_start(value):
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return '{}_y{:04d}m{:02d}'.format(table, month.year, month.month)
+
+
+def partition_month(table, name):
+    """The month of the partition ``name`` of ``table``, or ``None`` for the default partition."""
+    match = re.fullmatch(r'{}_y(\d{{4}})m(\d{{2}})'.format(re.escape(table)), name)
+    return datetime.date(int(match[1]), int(match[2]), 1) if match else None
+
+
+def create_partition(table, month, using='default'):
+    """Create the partition of ``table`` for ``month``, if missing. Returns whether it was created."""
+    connection = connections[using]
+    name = partition_name(table, month)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s) IS NULL', [name])
+        if not cursor.fetchone()[0]:
+            return False
+        cursor.execute(
+            "CREATE TABLE {} PARTITION OF {} FOR VALUES FROM ('{} 00:00+00') TO ('{} 00:00+00')".format(
+                connection.ops.quote_name(name), connection.ops.quote_name(table),
+                month.isoformat(), add_months(month, 1).isoformat()))
+    return True
+
+
+def create_partitions(table, months_ahead=MONTHS_AHEAD, today=None, using='default'):
+    """
+    Create the missing partitions of ``table`` from the current month up to
+    ``months_ahead`` months ahead. Returns the names of the created partitions.
+    """
+    current = month_start(today or datetime.date.today())
+    months = [add_months(current, offset) for offset in range(months_ahead + 1)]
+    return [partition_name(table, month) for month in months if create_partition(table, month, using=using)]
+
+
+def list_partitions(table, using='default'):
+    """Names and bound expressions of the partitions of ``table``, by name."""
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            '''
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+            ''', [table])
+        return cursor.fetchall()
+
+
+def maintain_partitions(months_ahead=MONTHS_AHEAD, retention_months=None, today=None, using='default'):
+    """
+    Create the upcoming partitions of every partitioned KYC table and, if
+    ``retention_months`` is given, detach the partitions of older months.
+    Returns the names of the created and of the detached partitions.
+    """
+    today = today or datetime.date.today()
+    created, detached = [], []
+    for table in PARTITIONED_TABLES:
+        created += create_partitions(table, months_ahead=months_ahead, today=today, using=using)
+        if retention_months is not None:
+            detached += detach_partitions(table, add_months(month_start(today), -retention_months), using=using)
+    return created, detached
+
+
+def detach_partitions(table, before, using='default'):
+    """
+    Detach the partitions of ``table`` for months before ``before`` and move
+    them, with the rows of ``DEPENDENT_TABLES`` referencing them, to
+    ``ARCHIVE_SCHEMA``. Returns the names of the detached partitions.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    detached = []
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for name, _ in list_partitions(table, using=using):
+            month = partition_month(table, name)
+            if month is None or month >= month_start(before):
+                continue
+            cursor.execute('CREATE SCHEMA IF NOT EXISTS {}'.format(quote(ARCHIVE_SCHEMA)))
+            cursor.execute('ALTER TABLE {} DETACH PARTITION {}'.format(quote(table), quote(name)))
+            cursor.execute('ALTER TABLE {} SET SCHEMA {}'.format(quote(name), quote(ARCHIVE_SCHEMA)))
+            archived = '{}.{}'.format(quote(ARCHIVE_SCHEMA), quote(name))
+            for dependent, column in DEPENDENT_TABLES.get(table, ()):
+                archive = '{}.{}'.format(quote(ARCHIVE_SCHEMA), quote(dependent))
+                cursor.execute('CREATE TABLE IF NOT EXISTS {} (LIKE {})'.format(archive, quote(dependent)))
+                cursor.execute(
+                    'WITH moved AS (DELETE FROM {} WHERE {} IN (SELECT id FROM {}) RETURNING *) '
+                    'INSERT INTO {} SELECT * FROM moved'.format(quote(dependent), quote(column), archived, archive))
+            detached.append(name)
+    return detached
+
+
+def partition_table(table, column='created_date', today=None, using='default'):
+    """
+    Turn the regular table ``table`` into a table range partitioned by month
+    on ``column``, without copying its rows.
+
+    The existing table becomes the partition of the current month, extended
+    back to hold every older row; its indexes are attached to the matching
+    indexes of the new table instead of being rebuilt. Only the primary key
+    is rebuilt, as it has to include ``column`` on a partitioned table, so
+    the ids are only unique per partition from then on. Foreign keys
+    referencing the table and views selecting from it must be dropped first.
+    Returns the name of the partition holding the existing rows.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    current = month_start(today or datetime.date.today())
+    legacy = partition_name(table, current)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT conrelid::regclass::text FROM pg_constraint WHERE confrelid = %s::regclass', [table])
+        referencing = [row[0] for row in cursor.fetchall()]
+        if referencing:
+            raise ValueError('{} is referenced by foreign keys of {}'.format(table, ', '.join(referencing)))
+        cursor.execute(
+            """
+            SELECT a.attname FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE i.indrelid = %s::regclass AND i.indisprimary
+            """, [table])
+        primary_key = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_indexdef(c.oid), i.indisunique FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = %s::regclass AND NOT i.indisprimary
+            ORDER BY c.relname
+            """, [table])
+        indexes = cursor.fetchall()
+        if any(unique for _, _, unique in indexes):
+            raise ValueError('Unique indexes of {} must include {}'.format(table, column))
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+            """, [table])
+        foreign_keys = cursor.fetchall()
+
+        # Index names are unique per schema: the partition's indexes make room
+        # for the new table's, and get attached to them below.
+        cursor.execute('ALTER TABLE {} RENAME TO {}'.format(quote(table), quote(legacy)))
+        primary_key = ', '.join(quote(name) for name in primary_key + [column])
+        cursor.execute('ALTER TABLE {} DROP CONSTRAINT {}, ADD CONSTRAINT {} PRIMARY KEY ({})'.format(
+            quote(legacy), quote('{}_pkey'.format(table)), quote('{}_pkey'.format(legacy)), primary_key))
+        for position, (name, _, _) in enumerate(indexes):
+            cursor.execute('ALTER INDEX {} RENAME TO {}'.format(quote(name), quote('{}_{}'.format(legacy, position))))
+
+        cursor.execute(
+            'CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE ({})'.format(
+                quote(table), quote(legacy), quote(column)))
+        cursor.execute('ALTER TABLE {} ADD PRIMARY KEY ({})'.format(quote(table), primary_key))
+        for _, definition, _ in indexes:
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute('ALTER TABLE {} ADD CONSTRAINT {} {}'.format(quote(table), quote(name), definition))
+
+        # With a matching check constraint, attaching does not scan the rows.
+        upper = add_months(current, 1)
+        check = quote('{}_bound'.format(legacy))
+        cursor.execute("ALTER TABLE {} ADD CONSTRAINT {} CHECK ({} IS NOT NULL AND {} < '{} 00:00+00')".format(
+            quote(legacy), check, quote(column), quote(column), upper.isoformat()))
+        cursor.execute("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (MINVALUE) TO ('{} 00:00+00')".format(
+            quote(table), quote(legacy), upper.isoformat()))
+        cursor.execute('ALTER TABLE {} DROP CONSTRAINT {}'.format(quote(legacy), check))
+        cursor.execute('CREATE TABLE {} PARTITION OF {} DEFAULT'.format(
+            quote('{}_default'.format(table)), quote(table)))
+    create_partitions(table, today=current, using=using)
+    return legacy
@@ -0,0 +1,95 @@
+"""
+Review previews of KYC identity documents.
+
+Reviewers see downscaled, EXIF-free WebP (or JPEG) renditions of the photo
+ID and selfie scans instead of the multi-megabyte originals. Previews are
+stored next to their original under ``previews/`` and rendered in a pool of
+worker processes, outside of the request/response cycle.
+"""
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .models import KycApplication
+from .utils import forget_connections
+
+IMAGE_FIELDS = ('photo_id', 'photo_id_back', 'selfie_with_id')
+PREVIEW_SIZE = (1024, 1024)
+PREVIEW_QUALITY = 80
+PREVIEW_FORMAT, PREVIEW_EXTENSION = ('WEBP', '.webp') if features.check('webp') else ('JPEG', '.jpg')
+
+
+def preview_name(name):
+    """Storage name of the preview of the document stored as ``name``."""
+    directory, filename = os.path.split(name)
+    return '{}/previews/{}{}'.format(directory, os.path.splitext(filename)[0], PREVIEW_EXTENSION)
+
+
+def render_preview(content):
+    """
+    Return the preview of an image as bytes. The image is rotated upright
+    according to its EXIF orientation; the metadata itself is not carried over.
+    """
+    with Image.open(io.BytesIO(content)) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(PREVIEW_SIZE)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        output = io.BytesIO()
+        image.save(output, PREVIEW_FORMAT, quality=PREVIEW_QUALITY)
+    return output.getvalue()
+
+
+def _generate_preview(name):
+    """Render and store the preview of one document. Runs in a worker process."""
+    storage = KycApplication._meta.get_field(IMAGE_FIELDS[0]).storage
+    try:
+        with storage.open(name, 'rb') as original:
+            content = original.read()
+    except FileNotFoundError:
+        return name, None
+    try:
+        preview = render_preview(content)
+    except (UnidentifiedImageError, OSError):
+        # Not an image (e.g. a PDF scan): reviewers open the original instead.
+        return name, None
+    target = preview_name(name)
+    if storage.exists(target):
+        storage.delete(target)
+    storage.save(target, ContentFile(preview))
+    return name, target
+
+
+def _generate_batches(queryset, batch_size, map_):
+    processed = 0
+    while True:
+        batch = list(queryset.order_by('pk')[:batch_size])
+        if not batch:
+            return processed
+        names = [
+            getattr(application, field).name
+            for application in batch for field in IMAGE_FIELDS if getattr(application, field)
+        ]
+        list(map_(_generate_preview, names))
+        KycApplication.objects.filter(pk__in=[a.pk for a in batch]).update(
+            previews_generated_date=timezone.now())
+        processed += len(batch)
+
+
+def generate_previews(queryset=None, processes=None, batch_size=100):
+    """
+    Generate the missing previews of ``queryset`` (all applications by
+    default) in a pool of ``processes`` workers, or in this process if
+    ``processes`` is 0. Returns the number of applications processed.
+    """
+    if queryset is None:
+        queryset = KycApplication.objects.all()
+    queryset = queryset.filter(previews_generated_date__isnull=True).only('pk', *IMAGE_FIELDS)
+    if processes == 0:
+        return _generate_batches(queryset, batch_size, map)
+    with ProcessPoolExecutor(max_workers=processes, initializer=forget_connections) as pool:
+        return _generate_batches(queryset, batch_size, pool.map)
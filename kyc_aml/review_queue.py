@@ -0,0 +1,60 @@
+"""
+Review queue for pending KYC applications.
+
+Unclaimed pending applications are handed out by priority, then age. Claims
+lock the candidate rows with ``SELECT ... FOR UPDATE SKIP LOCKED``, so any
+number of reviewers can pull work concurrently: rows being claimed by someone
+else are skipped instead of waited on, and no application is handed out twice.
+The ``kyc_review_queue_idx`` partial index only covers the unclaimed queue.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import KycApplication
+
+QUEUE_ORDERING = ('-review_priority', 'created_date', 'id')
+# Claims older than this are handed back to the queue.
+CLAIM_TIMEOUT = timedelta(hours=4)
+
+
+def unclaimed_applications():
+    return KycApplication.objects.filter(kyc_status='pending', reviewer__isnull=True)
+
+
+def claimed_applications(reviewer):
+    """Pending applications currently claimed by ``reviewer``, in queue order."""
+    return KycApplication.objects.filter(kyc_status='pending', reviewer=reviewer).order_by(*QUEUE_ORDERING)
+
+
+@transaction.atomic
+def claim_applications(reviewer, count=1):
+    """
+    Atomically assign the next ``count`` unclaimed applications to ``reviewer``
+    and return them in queue order.
+    """
+    pks = list(
+        unclaimed_applications()
+        .order_by(*QUEUE_ORDERING)
+        .select_for_update(skip_locked=True)
+        .values_list('pk', flat=True)[:count])
+    if pks:
+        KycApplication.objects.filter(pk__in=pks).update(
+            reviewer=reviewer, review_claimed_date=timezone.now())
+    return list(KycApplication.objects.filter(pk__in=pks).order_by(*QUEUE_ORDERING))
+
+
+def release_applications(reviewer, pks=None):
+    """Hand the pending applications claimed by ``reviewer`` back to the queue."""
+    queryset = KycApplication.objects.filter(kyc_status='pending', reviewer=reviewer)
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+    return queryset.update(reviewer=None, review_claimed_date=None)
+
+
+def release_stale_claims(timeout=CLAIM_TIMEOUT):
+    """Hand back pending applications whose claim is older than ``timeout``."""
+    return KycApplication.objects.filter(
+        kyc_status='pending', review_claimed_date__lt=timezone.now() - timeout,
+    ).update(reviewer=None, review_claimed_date=None)
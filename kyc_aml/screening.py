@@ -0,0 +1,263 @@
+"""
+Sanctions and PEP screening of KYC applicants.
+
+The list is a local CSV file (``KYC_SCREENING_LIST_PATH``) with the columns
+``id``, ``name``, ``aliases`` (separated by ``;``), ``birth_date``
+(``YYYY-MM-DD`` or ``YYYY``), ``list`` and ``type``. It is compiled once per
+process into a ``ScreeningIndex``:
+
+* an inverted index from name trigrams to list names. Only names sharing
+  one of the applicant's rarest trigrams can reach the threshold, so only
+  those are scored (Dice similarity of the trigram sets);
+* a phonetic (Soundex) key per name, catching transliteration variants
+  that share few trigrams.
+
+Names are compared in their ``normalize_legal_name`` form, i.e. accent-,
+case- and word order-insensitive. A birth date known on both sides must
+agree (on the year, if the list only has the year).
+
+``rescreen`` screens every applicant not yet screened against the current
+list version in a pool of worker processes, which share the index built by
+the parent through ``fork``.
+"""
+import csv
+import hashlib
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .identity import normalize_legal_name
+from .models import KycApplication, ScreeningHit
+from .utils import forget_connections
+
+THRESHOLD = 0.8
+# Score of names with the same phonetic key but few common trigrams.
+PHONETIC_SCORE = 0.85
+BATCH_SIZE = 1000
+# Application fields screening depends on.
+SCREENED_FIELDS = ('legal_first_names', 'legal_last_names', 'birth_date')
+
+Entry = namedtuple('Entry', 'id names birth_date list type')
+Match = namedtuple('Match', 'entry name score birth_date_match')
+
+SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'), **dict.fromkeys('cgjkqsxz', '2'), **dict.fromkeys('dt', '3'),
+    'l': '4', **dict.fromkeys('mn', '5'), 'r': '6',
+}
+
+
+def soundex(word):
+    """American Soundex code of an (already normalized) word."""
+    letters = [char for char in word if char.isalpha()]
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for char in letters[1:]:
+        digit = SOUNDEX_CODES.get(char, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def trigrams(name):
+    padded = '  {} '.format(name)
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def phonetic_key(name):
+    return ' '.join(sorted(soundex(word) for word in name.split()))
+
+
+def list_version(path):
+    """Checksum of the list file, identifying the list the applicants were screened against."""
+    checksum = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(1 << 20), b''):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+class ScreeningIndex:
+    """In-memory fuzzy name index over the entries of a screening list."""
+
+    def __init__(self, entries, version=''):
+        self.version = version
+        self.entries = []
+        self._names = []  # (entry position, listed name, trigrams)
+        self._trigrams = {}
+        self._phonetic = {}
+        for entry in entries:
+            self.add(entry)
+
+    @classmethod
+    def from_csv(cls, path):
+        entries = []
+        with open(path, newline='', encoding='utf-8') as source:
+            for row in csv.DictReader(source):
+                row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+                names = [row.get('name', '')] + row.get('aliases', '').split(';')
+                entries.append(Entry(
+                    row.get('id') or str(len(entries)), [name.strip() for name in names if name.strip()],
+                    row.get('birth_date', ''), row.get('list', ''), row.get('type', '')))
+        return cls(entries, version=list_version(path))
+
+    def add(self, entry):
+        position = len(self.entries)
+        self.entries.append(entry)
+        for name in entry.names:
+            normalized = normalize_legal_name(name, '')
+            grams = trigrams(normalized)
+            if not grams:
+                continue
+            name_id = len(self._names)
+            self._names.append((position, name, frozenset(grams)))
+            for gram in grams:
+                self._trigrams.setdefault(gram, []).append(name_id)
+            self._phonetic.setdefault(phonetic_key(normalized), []).append(name_id)
+
+    def search(self, first_names, last_names, birth_date=None, threshold=THRESHOLD):
+        """Best match per list entry, above ``threshold``, best first."""
+        normalized = normalize_legal_name(first_names, last_names)
+        grams = trigrams(normalized) if normalized else set()
+        if not grams:
+            return []
+        # Prefix filtering: a name reaching the threshold shares at least
+        # ``overlap`` trigrams with the query, so it holds one of the
+        # ``len(grams) - overlap + 1`` rarest of them. Only names from those
+        # (short) posting lists are scored.
+        overlap = math.ceil(threshold * len(grams) / (2 - threshold) - 1e-9)
+        rarest = sorted(grams, key=lambda gram: len(self._trigrams.get(gram, ())))[:len(grams) - overlap + 1]
+        candidates = {name_id for gram in rarest for name_id in self._trigrams.get(gram, ())}
+        scores = {}
+        for name_id in candidates:
+            listed = self._names[name_id][2]
+            scores[name_id] = 2 * len(grams & listed) / (len(grams) + len(listed))
+        for name_id in self._phonetic.get(phonetic_key(normalized), ()):
+            scores[name_id] = max(scores.get(name_id, 0), PHONETIC_SCORE)
+
+        best = {}
+        for name_id, score in scores.items():
+            if score < threshold:
+                continue
+            position, name, _ = self._names[name_id]
+            entry = self.entries[position]
+            birth_date_match = _birth_date_match(entry.birth_date, birth_date)
+            if birth_date_match is False:
+                continue
+            if position not in best or score > best[position].score:
+                best[position] = Match(entry, name, score, bool(birth_date_match))
+        return sorted(best.values(), key=lambda match: -match.score)
+
+
+def _birth_date_match(listed, birth_date):
+    """True or False if both birth dates are known, None otherwise."""
+    if not listed or not birth_date:
+        return None
+    return birth_date.isoformat().startswith(listed)
+
+
+_index = None
+
+
+def get_index():
+    """
+    The process-wide index of ``KYC_SCREENING_LIST_PATH``, rebuilt when the
+    file changes. ``None`` if there is no list.
+    """
+    global _index
+    path = settings.KYC_SCREENING_LIST_PATH
+    try:
+        modified = os.stat(path).st_mtime
+    except OSError:
+        return None
+    if _index is None or _index[0] != (path, modified):
+        _index = ((path, modified), ScreeningIndex.from_csv(path))
+    return _index[1]
+
+
+# region Screening
+def _record(results, version):
+    """Store the matches of screened applications, given as ``[(pk, matches)]``."""
+    now = timezone.now()
+    pks = [pk for pk, _ in results]
+    with transaction.atomic():
+        # Open hits that no longer match are dropped; reviewed hits are kept.
+        matched = {(pk, match.entry.id) for pk, matches in results for match in matches}
+        stale = [
+            hit.pk for hit in ScreeningHit.objects.filter(application__in=pks, status=ScreeningHit.OPEN)
+            .only('pk', 'application', 'entry_id')
+            if (hit.application_id, hit.entry_id) not in matched
+        ]
+        ScreeningHit.objects.filter(pk__in=stale).delete()
+        ScreeningHit.objects.bulk_create([
+            ScreeningHit(
+                application_id=pk, entry_id=match.entry.id[:100], entry_name=match.name[:255],
+                entry_list=match.entry.list[:100], entry_type=match.entry.type[:50], score=match.score,
+                birth_date_match=match.birth_date_match, list_version=version)
+            for pk, matches in results for match in matches
+        ], ignore_conflicts=True)
+        KycApplication.objects.filter(pk__in=pks).update(screened_date=now, screening_list_version=version)
+
+
+def _screen_rows(rows):
+    """Screen ``[(pk, first names, last names, birth date)]``. Runs in a worker process."""
+    return [(pk, _index[1].search(first, last, birth_date)) for pk, first, last, birth_date in rows]
+
+
+def screen_applications(applications, index=None):
+    """Screen ``applications`` in this process and record the hits. Returns the number of hits."""
+    index = index or get_index()
+    if index is None:
+        return 0
+    results = [
+        (a.pk, index.search(a.legal_first_names, a.legal_last_names, a.birth_date)) for a in applications
+    ]
+    _record(results, index.version)
+    return sum(len(matches) for _, matches in results)
+
+
+def rescreen(path=None, processes=None, batch_size=BATCH_SIZE):
+    """
+    Screen every application not yet screened against the current version of
+    the list, in a pool of ``processes`` workers (in this process if 0).
+    Returns the number of applications screened.
+    """
+    global _index
+    path = path or settings.KYC_SCREENING_LIST_PATH
+    # Built before the pool is created, so forked workers inherit it.
+    _index = ((path, os.stat(path).st_mtime), ScreeningIndex.from_csv(path))
+    version = _index[1].version
+
+    queryset = KycApplication.objects.exclude(screening_list_version=version).order_by('pk').values_list(
+        'pk', *SCREENED_FIELDS)
+    chunk_size = max(1, batch_size // (processes or os.cpu_count() or 1))
+
+    def run(map_):
+        screened = 0
+        last = None
+        while True:
+            # Keyset pagination: each batch starts where the previous one ended
+            # instead of walking past every application screened so far.
+            rows = list((queryset if last is None else queryset.filter(pk__gt=last))[:batch_size])
+            if not rows:
+                return screened
+            chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+            _record([result for chunk in map_(_screen_rows, chunks) for result in chunk], version)
+            screened += len(rows)
+            last = rows[-1][0]
+
+    if processes == 0:
+        return run(map)
+    with ProcessPoolExecutor(max_workers=processes, initializer=forget_connections) as pool:
+        return run(pool.map)
+# endregion
@@ -0,0 +1,29 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from vigolend.utils.tasks import PRIORITY_LOW, enqueue_on_commit
+
+from .identity import IDENTITY_FIELDS, index_applications
+from .models import KycApplication
+from .previews import IMAGE_FIELDS
+from .screening import SCREENED_FIELDS
+from .tasks import generate_document_previews, notify_kyc_status_change, screen_kyc_application
+from .transitions import status_changed
+
+
+@receiver(post_save, sender=KycApplication)
+def application_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is None or not update_fields.isdisjoint(IDENTITY_FIELDS):
+        index_applications([instance])
+    if update_fields is None or not update_fields.isdisjoint(SCREENED_FIELDS):
+        enqueue_on_commit(screen_kyc_application, str(instance.pk))
+    if instance.previews_generated_date is None and any(getattr(instance, field) for field in IMAGE_FIELDS):
+        enqueue_on_commit(generate_document_previews, str(instance.pk), priority=PRIORITY_LOW)
+
+
+@receiver(status_changed, sender=KycApplication)
+def application_status_changed(sender, pks, to_status, **kwargs):
+    for pk in pks:
+        enqueue_on_commit(notify_kyc_status_change, str(pk), to_status)
@@ -0,0 +1,78 @@
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.template.loader import render_to_string
+
+from config import celery_app
+
+from . import funnel, partitions
+from .expiry import sweep_expired_documents
+from .merge import merge_applications
+from .models import KycApplication
+from .previews import generate_previews
+from .review_queue import release_stale_claims
+from .screening import screen_applications
+
+
+@celery_app.task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_jitter=True,
+    max_retries=6,
+)
+def notify_kyc_status_change(application_id, kyc_status):
+    """Tell the applicant their KYC application moved to ``kyc_status``."""
+    application = KycApplication.objects.select_related('user').filter(pk=application_id).first()
+    if application is None or application.kyc_status != kyc_status:
+        # Deleted, or changed again since: the newer change sends its own notice.
+        return
+    context = {'application': application, 'user': application.user}
+    send_mail(
+        render_to_string('kyc_aml/email/status_changed_subject.txt', context).strip(),
+        render_to_string('kyc_aml/email/status_changed_message.txt', context),
+        settings.DEFAULT_FROM_EMAIL,
+        [application.user.email],
+    )
+
+
+@celery_app.task(soft_time_limit=4 * 60)
+def generate_document_previews(application_id):
+    """Generate the review previews of one application, in the worker process."""
+    generate_previews(KycApplication.objects.filter(pk=application_id), processes=0)
+
+
+@celery_app.task()
+def screen_kyc_application(application_id):
+    """Screen one applicant against the sanctions/PEP list."""
+    screen_applications(KycApplication.objects.filter(pk=application_id))
+
+
+@celery_app.task(time_limit=30 * 60, soft_time_limit=25 * 60)
+def merge_kyc_applications(application_ids=None):
+    """Merge verified applications (the given ones, or all pending a merge) into user profiles."""
+    queryset = None if application_ids is None else KycApplication.objects.filter(pk__in=application_ids)
+    return merge_applications(queryset)
+
+
+@celery_app.task()
+def release_stale_review_claims():
+    return release_stale_claims()
+
+
+# Re-aggregates the whole application table, which can outlast the default time limits.
+@celery_app.task(expires=5 * 60, time_limit=30 * 60, soft_time_limit=25 * 60)
+def refresh_kyc_funnel():
+    funnel.refresh()
+
+
+@celery_app.task(time_limit=30 * 60, soft_time_limit=25 * 60)
+def sweep_expired_kyc_documents():
+    """Unverify applications whose identity document expired or is about to."""
+    return sweep_expired_documents()
+
+
+@celery_app.task()
+def maintain_kyc_partitions():
+    """Create upcoming monthly partitions of the KYC tables, and archive those past retention."""
+    return partitions.maintain_partitions(retention_months=settings.KYC_PARTITION_RETENTION_MONTHS)
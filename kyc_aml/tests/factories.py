@@ -0,0 +1,36 @@
+from factory import Faker, Sequence, SubFactory
+from factory.django import DjangoModelFactory
+
+from kyc_aml.models import KycApplication
+from locations.models import Country
+from vigolend.users.tests.factories import UserFactory
+
+
+class CountryFactory(DjangoModelFactory):
+
+    name = Faker("country")
+    iso2 = Sequence(lambda n: "{}{}".format(chr(65 + n // 26 % 26), chr(65 + n % 26)))
+
+    class Meta:
+        model = Country
+
+
+class KycApplicationFactory(DjangoModelFactory):
+
+    legal_first_names = Faker("first_name")
+    legal_last_names = Faker("last_name")
+    birth_date = Faker("date_of_birth", minimum_age=18, maximum_age=90)
+    email = Faker("email")
+    address_line_1 = Faker("street_address")
+    state = Faker("state")
+    zip_code = Faker("postcode")
+    city = Faker("city")
+    proof_of_address_document = "uploads/kyc/proof_of_address.pdf"
+    photo_id = "uploads/kyc/photo_id.jpg"
+    kyc_status = "pending"
+    citizenship = SubFactory(CountryFactory)
+    country_residence = SubFactory(CountryFactory)
+    user = SubFactory(UserFactory)
+
+    class Meta:
+        model = KycApplication
@@ -0,0 +1,57 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+
+from kyc_aml.ages import age_on, aged_between, in_age_band, with_age, years_before
+from kyc_aml.models import KycApplication
+from kyc_aml.tests.factories import KycApplicationFactory
+
+TODAY = datetime.date(2026, 10, 18)
+
+
+def test_age_on():
+    assert age_on(datetime.date(2008, 10, 18), TODAY) == 18
+    assert age_on(datetime.date(2008, 10, 19), TODAY) == 17
+    assert age_on(datetime.date(2008, 2, 29), datetime.date(2026, 2, 28)) == 17
+    assert age_on(datetime.date(2008, 2, 29), datetime.date(2026, 3, 1)) == 18
+    assert years_before(datetime.date(2028, 2, 29), 18) == datetime.date(2010, 2, 28)
+
+
+@pytest.mark.django_db
+def test_age_bands_match_python_ages():
+    birth_dates = [
+        datetime.date(2008, 10, 19), datetime.date(2008, 10, 18), datetime.date(2000, 10, 19),
+        datetime.date(2000, 10, 18), datetime.date(1950, 10, 19), datetime.date(1950, 10, 18), None,
+    ]
+    for birth_date in birth_dates:
+        KycApplicationFactory(birth_date=birth_date)
+    queryset = KycApplication.objects.all()
+
+    ages = dict(with_age(queryset, TODAY).values_list("birth_date", "age"))
+    assert ages == {birth_date: birth_date and age_on(birth_date, TODAY) for birth_date in birth_dates}
+
+    def band(name):
+        return sorted(in_age_band(queryset, name, TODAY).values_list("birth_date", flat=True))
+
+    assert band("minor") == [datetime.date(2008, 10, 19)]
+    assert band("18-25") == [datetime.date(2000, 10, 19), datetime.date(2008, 10, 18)]
+    assert band("26-40") == [datetime.date(2000, 10, 18)]
+    assert band("61-75") == [datetime.date(1950, 10, 19)]
+    assert band("over-75") == [datetime.date(1950, 10, 18)]
+    assert queryset.filter(aged_between(18, 18, TODAY)).get().birth_date == datetime.date(2008, 10, 18)
+    with pytest.raises(ValueError):
+        in_age_band(queryset, "ancient")
+
+
+@pytest.mark.django_db
+def test_admin_age_band_filter(admin_client):
+    KycApplicationFactory(birth_date=years_before(datetime.date.today(), 10))
+    response = admin_client.get(reverse("admin:kyc_aml_kycapplication_changelist"), {"age_band": "minor"})
+    assert response.status_code == 200
+    assert response.context["cl"].result_count == 1
+
+    # An unknown band is reported like any other bad lookup, not as an error.
+    response = admin_client.get(reverse("admin:kyc_aml_kycapplication_changelist"), {"age_band": "bogus"})
+    assert response.status_code == 302
+    assert "e=1" in response["Location"]
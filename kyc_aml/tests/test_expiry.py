@@ -0,0 +1,44 @@
+import datetime
+
+import pytest
+from django.core import mail
+
+from kyc_aml.expiry import expiring_applications, sweep_expired_documents
+from kyc_aml.tests.factories import KycApplicationFactory
+from kyc_aml.transitions import history
+
+TODAY = datetime.date(2026, 10, 18)
+
+
+@pytest.mark.django_db
+def test_sweep_unverifies_expiring_documents_in_batches():
+    expired = KycApplicationFactory.create_batch(
+        3, kyc_status="verified", identification_expiry=TODAY - datetime.timedelta(days=1))
+    expiring = KycApplicationFactory(kyc_status="verified", identification_expiry=TODAY + datetime.timedelta(days=5))
+    valid = KycApplicationFactory(kyc_status="verified", identification_expiry=TODAY + datetime.timedelta(days=60))
+    pending = KycApplicationFactory(identification_expiry=TODAY - datetime.timedelta(days=1))
+
+    assert set(expiring_applications(days=14, today=TODAY)) == {*expired, expiring}
+    assert sweep_expired_documents(days=14, today=TODAY, batch_size=2) == 4
+    assert sweep_expired_documents(days=14, today=TODAY) == 0
+
+    for application in [*expired, expiring]:
+        application.refresh_from_db()
+        assert (application.kyc_status, application.kyc_refused_code) == ("unverified", "EXPIRED_DOCUMENT")
+        (logged,) = history(application)
+        assert (logged.from_status, logged.actor) == ("verified", None)
+        application.user.refresh_from_db()
+        assert not application.user.kyc_complete
+    for application, status in ((valid, "verified"), (pending, "pending")):
+        application.refresh_from_db()
+        assert application.kyc_status == status
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sweep_notifies_customers():
+    application = KycApplicationFactory(kyc_status="verified", identification_expiry=TODAY)
+
+    sweep_expired_documents(days=0, today=TODAY)
+
+    assert [message.to for message in mail.outbox] == [[application.user.email]]
+    assert "valid document" in mail.outbox[0].body
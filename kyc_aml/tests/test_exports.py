@@ -0,0 +1,56 @@
+import csv
+import gzip
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from kyc_aml.exports import COLUMNS
+from kyc_aml.models import KycApplication
+from kyc_aml.tests.factories import KycApplicationFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_export_command_gzip(tmp_path):
+    applications = KycApplicationFactory.create_batch(3)
+    KycApplicationFactory(kyc_status="verified")
+    path = tmp_path / "kyc.csv.gz"
+
+    call_command("export_kyc_applications", str(path), status="pending", chunk_size=2)
+
+    with gzip.open(path, "rt", newline="") as source:
+        rows = list(csv.reader(source))
+    assert rows[0] == [header for header, _ in COLUMNS]
+    assert [row[0] for row in rows[1:]] == [str(a.pk) for a in applications]
+    assert rows[1][16] == applications[0].country_residence.iso2
+
+
+def test_admin_export_action(admin_client):
+    application = KycApplicationFactory()
+
+    response = admin_client.post(
+        reverse("admin:kyc_aml_kycapplication_changelist"),
+        {"action": "export_as_csv", "_selected_action": [application.pk]},
+    )
+    assert response.status_code == 200
+    rows = list(csv.reader(b"".join(response.streaming_content).decode().splitlines()))
+    assert len(rows) == 2
+    assert rows[1][5] == application.user.email
+    assert KycApplication.objects.count() == 1
+
+
+def test_export_neutralizes_formulas(tmp_path):
+    application = KycApplicationFactory(
+        legal_first_names="=HYPERLINK(\"http://example.com\")", legal_last_names="-Smith", city="@SUM(A1)")
+    path = tmp_path / "kyc.csv"
+
+    call_command("export_kyc_applications", str(path))
+
+    with open(path, newline="") as source:
+        [header, row] = list(csv.reader(source))
+    values = dict(zip(header, row))
+    assert values["legal_first_names"] == "'=HYPERLINK(\"http://example.com\")"
+    assert values["legal_last_names"] == "'-Smith"
+    assert values["city"] == "'@SUM(A1)"
+    assert values["id"] == str(application.pk)
@@ -0,0 +1,37 @@
+import pytest
+
+from kyc_aml import funnel
+from kyc_aml.tests.factories import CountryFactory, KycApplicationFactory
+from locations.cache import countries
+
+pytestmark = pytest.mark.django_db
+
+
+def test_refresh_and_totals():
+    country = CountryFactory(name="Poland")
+    # The registry is invalidated on commit, which never happens in a test.
+    countries.invalidate()
+    KycApplicationFactory.create_batch(2, kyc_status="verified", kyc_country=country)
+    KycApplicationFactory(kyc_status="pending", kyc_country=country)
+    KycApplicationFactory(kyc_status="rejected")
+
+    # Aggregates only change on refresh.
+    assert funnel.status_totals()[0] == ("total", 0)
+    assert funnel.refresh() == funnel.last_refresh()
+
+    assert funnel.status_totals() == [
+        ("total", 4), ("pending", 1), ("verified", 2), ("rejected", 1), ("cancelled", 0)]
+    assert funnel.country_totals() == [("Poland", 3), ("-", 1)]
+    [(day, total, counts)] = funnel.daily_totals()
+    assert (total, counts) == (4, [1, 2, 1, 0])
+
+
+def test_dashboard_reads_aggregates(admin_client, django_assert_max_num_queries):
+    KycApplicationFactory()
+    funnel.refresh()
+
+    # Session, user and permissions, plus one aggregate query per table.
+    with django_assert_max_num_queries(10):
+        response = admin_client.get("/admin/kyc_aml/kycapplication/dashboard/")
+    assert response.status_code == 200
+    assert b"All applications" in response.content
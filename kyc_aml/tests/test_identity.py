@@ -0,0 +1,48 @@
+import datetime
+
+import pytest
+
+from kyc_aml.identity import duplicate_fingerprints, rebuild_index, with_duplicates
+from kyc_aml.models import IdentityFingerprint, KycApplication
+from kyc_aml.tests.factories import KycApplicationFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_fingerprints_are_maintained_on_save():
+    application = KycApplicationFactory(identification_number="AB 123-456", kyc_submitted_ip_address="10.0.0.1")
+    kinds = set(application.fingerprints.values_list("kind", flat=True))
+    assert kinds == {IdentityFingerprint.ID_NUMBER, IdentityFingerprint.IP_ADDRESS, IdentityFingerprint.NAME_BIRTH_DATE}
+
+    application.kyc_submitted_ip_address = None
+    application.save()
+    assert not application.fingerprints.filter(kind=IdentityFingerprint.IP_ADDRESS).exists()
+
+
+def test_duplicates_across_users():
+    original = KycApplicationFactory(
+        identification_number="AB123456", legal_first_names="Zoë", legal_last_names="Martin",
+        birth_date=datetime.date(1990, 1, 2))
+    reused_document = KycApplicationFactory(identification_number="ab-123 456")
+    same_person = KycApplicationFactory(
+        legal_first_names="MARTIN", legal_last_names="Zoe", birth_date=datetime.date(1990, 1, 2))
+    # A second application of the same user is not a duplicate.
+    resubmission = KycApplicationFactory(user=original.user, identification_number="AB123456")
+    unrelated = KycApplicationFactory(identification_number="XY999")
+
+    matches = {(m.kind, m.application_id) for m in duplicate_fingerprints(original)}
+    assert matches == {
+        (IdentityFingerprint.ID_NUMBER, reused_document.pk),
+        (IdentityFingerprint.NAME_BIRTH_DATE, same_person.pk),
+    }
+    flagged = set(with_duplicates(KycApplication.objects.all()).values_list("pk", flat=True))
+    assert flagged == {original.pk, reused_document.pk, same_person.pk, resubmission.pk}
+    assert unrelated.pk not in flagged
+
+
+def test_rebuild_index():
+    KycApplicationFactory.create_batch(3)
+    IdentityFingerprint.objects.all().delete()
+
+    assert rebuild_index(batch_size=2) == 3
+    assert IdentityFingerprint.objects.filter(kind=IdentityFingerprint.NAME_BIRTH_DATE).count() == 3
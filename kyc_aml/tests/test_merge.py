@@ -0,0 +1,57 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from kyc_aml.merge import merge_applications
+from kyc_aml.tests.factories import CountryFactory, KycApplicationFactory
+from vigolend.users.models import UserAddress
+
+pytestmark = pytest.mark.django_db
+
+
+def test_merge_creates_profile_data_and_address():
+    application = KycApplicationFactory(
+        kyc_status="verified", legal_first_names="Ada", legal_last_names="Lovelace",
+        birth_date=datetime.date(1990, 12, 10), place_of_birth="London", city="L" * 80)
+    user = application.user
+    modified = user.modified_date
+
+    assert merge_applications() == 1
+
+    user.refresh_from_db()
+    assert (user.first_name, user.last_name, user.name) == ("Ada", "Lovelace", "Ada Lovelace")
+    assert user.date_of_birth == datetime.date(1990, 12, 10)
+    assert user.place_of_birth == "London"
+    assert user.country_of_residence_id == application.country_residence_id
+    assert user.modified_date > modified
+    address = user.current_address
+    assert (address.user, address.type, address.zip_post_code) == (user, "current", application.zip_code)
+    assert address.city == "L" * 50
+    application.refresh_from_db()
+    assert application.merged_date is not None
+    assert merge_applications() == 0
+
+
+def test_merge_updates_existing_address_from_newest_review():
+    older = KycApplicationFactory(
+        kyc_status="verified", legal_last_names="Old", kyc_review_date=timezone.now() - datetime.timedelta(days=1))
+    user = older.user
+    country = CountryFactory()
+    user.current_address = UserAddress.objects.create(
+        user=user, address_line_1="Somewhere", state="S", city="C", zip_post_code="1", country=country)
+    user.save()
+    newer = KycApplicationFactory(
+        user=user, kyc_status="verified", legal_last_names="New", kyc_review_date=timezone.now())
+    pending = KycApplicationFactory(kyc_status="pending")
+
+    # One application per batch: the newest review is merged last and wins.
+    assert merge_applications(batch_size=1) == 2
+
+    user.refresh_from_db()
+    assert user.last_name == "New"
+    assert UserAddress.objects.filter(user=user).count() == 1
+    assert user.current_address.address_line_1 == newer.address_line_1[:50]
+    assert user.current_address.country_id == newer.country_residence_id
+    pending.refresh_from_db()
+    assert pending.merged_date is None
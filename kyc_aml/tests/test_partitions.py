@@ -0,0 +1,102 @@
+import datetime
+
+import pytest
+from django.db import connection
+
+from kyc_aml.identity import with_duplicates
+from kyc_aml.models import IdentityFingerprint, KycApplication, ScreeningHit
+from kyc_aml.partitions import (
+    ARCHIVE_SCHEMA, add_months, detach_partitions, list_partitions, maintain_partitions, month_start,
+    partition_month, partition_name, partition_table,
+)
+from kyc_aml.tests.factories import KycApplicationFactory
+
+pytestmark = pytest.mark.django_db
+
+TODAY = datetime.date(2026, 10, 18)
+
+
+def _count(table):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM {}".format(connection.ops.quote_name(table)))
+        return cursor.fetchone()[0]
+
+
+def test_applications_are_partitioned():
+    current = month_start(datetime.date.today())
+    application = KycApplicationFactory()
+
+    assert _count(partition_name("kyc_applications", current)) == 1
+    assert partition_month("kyc_applications", partition_name("kyc_applications", current)) == current
+    assert partition_month("kyc_applications", "kyc_applications_default") is None
+    assert KycApplication.objects.get(pk=application.pk) == application
+
+
+def test_partition_table_keeps_rows_and_indexes():
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE TABLE kyc_scratch (id integer PRIMARY KEY, created_date timestamptz NOT NULL)")
+        cursor.execute("CREATE INDEX kyc_scratch_created_idx ON kyc_scratch (created_date)")
+        cursor.execute("INSERT INTO kyc_scratch VALUES (1, '2020-01-05'), (2, '2026-10-02')")
+
+    assert partition_table("kyc_scratch", today=TODAY) == "kyc_scratch_y2026m10"
+
+    assert [name for name, _ in list_partitions("kyc_scratch")] == [
+        "kyc_scratch_default", "kyc_scratch_y2026m10", "kyc_scratch_y2026m11", "kyc_scratch_y2026m12",
+        "kyc_scratch_y2027m01"]
+    assert _count("kyc_scratch") == 2
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO kyc_scratch VALUES (3, '2026-11-02')")
+        cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = 'kyc_scratch_y2026m10' ORDER BY 1")
+        assert [row[0] for row in cursor.fetchall()] == ["kyc_scratch_y2026m10_0", "kyc_scratch_y2026m10_pkey"]
+    assert _count("kyc_scratch_y2026m11") == 1
+
+    assert detach_partitions("kyc_scratch", datetime.date(2026, 11, 1)) == ["kyc_scratch_y2026m10"]
+    assert _count("kyc_scratch") == 1
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM {}.kyc_scratch_y2026m10".format(ARCHIVE_SCHEMA))
+        assert cursor.fetchone()[0] == 2
+
+
+def test_partition_table_refuses_referenced_tables():
+    with pytest.raises(ValueError):
+        partition_table("users_user")
+
+
+def test_maintain_partitions():
+    current = month_start(datetime.date.today())
+    later = add_months(current, 5)
+
+    created, detached = maintain_partitions(months_ahead=5)
+    assert partition_name("kyc_applications", later) in created
+    assert partition_name("kyc_status_transitions", later) in created
+    assert detached == []
+
+    created, detached = maintain_partitions(retention_months=0, today=add_months(current, 1))
+    assert created == []
+    assert set(detached) == {partition_name("kyc_applications", current),
+                             partition_name("kyc_status_transitions", current)}
+
+
+def test_detached_applications_take_their_dependent_rows():
+    current = month_start(datetime.date.today())
+    archived = KycApplicationFactory(identification_number="AB123")
+    duplicate = KycApplicationFactory(identification_number="AB123")
+    ScreeningHit.objects.create(application=archived, entry_id="1", entry_name="X", score=1)
+    assert with_duplicates(KycApplication.objects.filter(pk=duplicate.pk)).exists()
+    fingerprints = IdentityFingerprint.objects.filter(application=archived).count()
+
+    # Move the duplicate out of the month being archived.
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE kyc_applications SET created_date = %s WHERE id = %s",
+                       [add_months(current, 1) + datetime.timedelta(days=1), duplicate.pk])
+    maintain_partitions(months_ahead=1)
+    detach_partitions("kyc_applications", add_months(current, 1))
+
+    assert not IdentityFingerprint.objects.filter(application_id=archived.pk).exists()
+    assert not ScreeningHit.objects.filter(application_id=archived.pk).exists()
+    assert not with_duplicates(KycApplication.objects.filter(pk=duplicate.pk)).exists()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM {}.kyc_identity_fingerprints".format(ARCHIVE_SCHEMA))
+        assert cursor.fetchone()[0] == fingerprints > 0
+        cursor.execute("SELECT count(*) FROM {}.kyc_screening_hits".format(ARCHIVE_SCHEMA))
+        assert cursor.fetchone()[0] == 1
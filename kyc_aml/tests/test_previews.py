@@ -0,0 +1,48 @@
+import io
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from kyc_aml.previews import PREVIEW_SIZE, generate_previews, preview_name, render_preview
+from kyc_aml.tests.factories import KycApplicationFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def _jpeg(size=(3000, 2000), orientation=None):
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    if orientation:
+        exif[0x0112] = orientation
+    output = io.BytesIO()
+    Image.new("RGB", size, "red").save(output, "JPEG", exif=exif.tobytes())
+    return output.getvalue()
+
+
+def test_render_preview_downscales_and_strips_exif():
+    with Image.open(io.BytesIO(render_preview(_jpeg()))) as preview:
+        assert max(preview.size) == max(PREVIEW_SIZE)
+        assert not preview.getexif()
+
+
+def test_render_preview_applies_exif_orientation():
+    # Orientation 6: the camera was rotated, the upright image is portrait.
+    with Image.open(io.BytesIO(render_preview(_jpeg(orientation=6)))) as preview:
+        assert preview.size[0] < preview.size[1]
+
+
+def test_generate_previews():
+    photo_id = default_storage.save("uploads/kyc/u/photo_id/front.jpg", ContentFile(_jpeg()))
+    selfie = default_storage.save("uploads/kyc/u/selfie_with_id/selfie.pdf", ContentFile(b"%PDF-1.4"))
+    application = KycApplicationFactory(photo_id=photo_id, selfie_with_id=selfie)
+
+    assert generate_previews(processes=1) == 1
+
+    application.refresh_from_db()
+    assert application.previews_generated_date is not None
+    assert default_storage.exists(preview_name(photo_id))
+    assert not default_storage.exists(preview_name(selfie))
+    # Applications with previews are not processed again.
+    assert generate_previews(processes=1) == 0
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+
+from kyc_aml.review_queue import (
+    claim_applications,
+    claimed_applications,
+    release_applications,
+)
+from kyc_aml.tests.factories import KycApplicationFactory
+from vigolend.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_claim_in_priority_order():
+    reviewer, other = UserFactory(), UserFactory()
+    oldest = KycApplicationFactory()
+    newest = KycApplicationFactory()
+    urgent = KycApplicationFactory(review_priority=5)
+    KycApplicationFactory(kyc_status="verified")
+
+    assert claim_applications(reviewer, count=2) == [urgent, oldest]
+    assert claim_applications(other, count=2) == [newest]
+    assert claim_applications(other) == []
+    assert list(claimed_applications(reviewer)) == [urgent, oldest]
+
+    assert release_applications(reviewer, pks=[oldest.pk]) == 1
+    assert claim_applications(other) == [oldest]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_claims_skip_rows_locked_by_concurrent_claims():
+    first, second = KycApplicationFactory(), KycApplicationFactory()
+    locked, done = threading.Event(), threading.Event()
+    claimed_by_other = []
+
+    def concurrent_claim():
+        try:
+            with transaction.atomic():
+                claimed_by_other.extend(claim_applications(UserFactory()))
+                locked.set()
+                done.wait(5)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=concurrent_claim)
+    thread.start()
+    locked.wait(5)
+    try:
+        assert claim_applications(UserFactory()) == [second]
+    finally:
+        done.set()
+        thread.join()
+    assert claimed_by_other == [first]
+
+
+def test_admin_claim_view(admin_client, admin_user):
+    application = KycApplicationFactory()
+
+    response = admin_client.post(reverse("admin:kyc_aml_kycapplication_claim"))
+    assert response.status_code == 302
+    application.refresh_from_db()
+    assert application.reviewer == admin_user
+
+    response = admin_client.get(response.url)
+    assert response.status_code == 200
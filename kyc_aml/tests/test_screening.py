@@ -0,0 +1,58 @@
+import datetime
+
+import pytest
+
+from kyc_aml.models import ScreeningHit
+from kyc_aml.screening import Entry, ScreeningIndex, rescreen, screen_applications, soundex
+from kyc_aml.tests.factories import KycApplicationFactory
+
+pytestmark = pytest.mark.django_db
+
+LIST = """id,name,aliases,birth_date,list,type
+S-1,Ivan Petrovich Sidorov,Ivan Sidorov;Iwan Sidorow,1961-03-04,EU,sanction
+P-1,Maria Gonzalez,,1975,National PEPs,pep
+"""
+
+
+def test_soundex():
+    assert [soundex(word) for word in ("robert", "rupert", "ashcraft", "tymczak", "pfister")] == [
+        "R163", "R163", "A261", "T522", "P236"]
+
+
+def test_search_is_fuzzy_and_checks_birth_date():
+    index = ScreeningIndex([
+        Entry("S-1", ["Ivan Petrovich Sidorov", "Ivan Sidorov"], "1961-03-04", "EU", "sanction"),
+        Entry("P-1", ["Maria Gonzalez"], "1975", "National PEPs", "pep"),
+    ])
+
+    [match] = index.search("Ivan", "SIDOROW", datetime.date(1961, 3, 4))
+    assert (match.entry.id, match.name, match.birth_date_match) == ("S-1", "Ivan Sidorov", True)
+    # Word order, case and accents do not matter; a listed birth year must agree.
+    assert index.search("González", "María", datetime.date(1975, 6, 1))[0].entry.id == "P-1"
+    assert index.search("María", "González", datetime.date(1980, 6, 1)) == []
+    assert index.search("Maria", "Gonzales")[0].score >= 0.8
+    assert index.search("John", "Smith") == []
+
+
+def test_rescreen_records_hits(tmp_path):
+    path = tmp_path / "list.csv"
+    path.write_text(LIST)
+    hit = KycApplicationFactory(legal_first_names="Ivan", legal_last_names="Sidorov", birth_date=None)
+    clean = KycApplicationFactory(legal_first_names="Jane", legal_last_names="Doe")
+
+    assert rescreen(str(path), processes=1) == 2
+    assert [h.entry_id for h in hit.screening_hits.all()] == ["S-1"]
+    assert not clean.screening_hits.exists()
+    # Nothing left to screen against the same list.
+    assert rescreen(str(path), processes=0) == 0
+
+    # A reviewed hit survives the next list version, open hits are refreshed.
+    hit.screening_hits.update(status=ScreeningHit.DISMISSED)
+    path.write_text(LIST.replace("Sidorov", "Sidorenko"))
+    assert rescreen(str(path), processes=0) == 2
+    assert hit.screening_hits.get().status == ScreeningHit.DISMISSED
+
+
+def test_screen_applications_without_list(settings, tmp_path):
+    settings.KYC_SCREENING_LIST_PATH = str(tmp_path / "missing.csv")
+    assert screen_applications([KycApplicationFactory()]) == 0
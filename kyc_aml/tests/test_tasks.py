@@ -0,0 +1,29 @@
+import pytest
+from django.core import mail
+
+from kyc_aml.tests.factories import KycApplicationFactory
+from kyc_aml.transitions import transition
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def test_status_change_notifies_applicant():
+    application = KycApplicationFactory()
+    assert not mail.outbox
+
+    transition([application.pk], "verified")
+
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [application.user.email]
+    assert "verified" in mail.outbox[0].body
+
+    # Saving without a status change sends nothing.
+    application.save()
+    assert len(mail.outbox) == 1
+
+
+def test_new_documents_get_previews():
+    application = KycApplicationFactory(photo_id="uploads/kyc/missing.jpg")
+
+    application.refresh_from_db()
+    assert application.previews_generated_date is not None
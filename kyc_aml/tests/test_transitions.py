@@ -0,0 +1,129 @@
+import datetime
+
+import pytest
+from django.db import DatabaseError, connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+
+from kyc_aml.models import KycApplication, KycStatusTransition
+from kyc_aml.partitions import add_months, create_partitions, list_partitions, month_start, partition_name
+from kyc_aml.tests.factories import KycApplicationFactory
+from kyc_aml.transitions import InvalidTransition, history, status_at, transition
+from vigolend.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_transition_updates_application_user_and_log():
+    reviewer = UserFactory()
+    application = KycApplicationFactory()
+
+    assert transition([application.pk], "verified", actor=reviewer, note="Documents match") == [application.pk]
+
+    application.refresh_from_db()
+    assert application.kyc_status == "verified"
+    assert application.reviewer == reviewer
+    assert application.kyc_review_date == application.status_update_date
+    assert application.kyc_status_note == "Documents match"
+    user = application.user
+    user.refresh_from_db()
+    assert (user.kyc_status, user.kyc_complete) == ("verified", True)
+    assert user.kyc_complete_date == application.status_update_date
+    (logged,) = history(application)
+    assert (logged.from_status, logged.to_status, logged.actor_id, logged.user_id) == (
+        "pending", "verified", reviewer.pk, user.pk)
+
+    transition([application.pk], "unverified", refused_code="EXPIRED_DOCUMENT")
+    user.refresh_from_db()
+    assert (user.kyc_status, user.kyc_complete, user.kyc_complete_date) == ("unverified", False, None)
+    assert [t.to_status for t in history(application)] == ["verified", "unverified"]
+
+
+def test_duplicate_rejection_keeps_user_verified():
+    verified = KycApplicationFactory()
+    transition([verified.pk], "verified")
+    duplicate = KycApplicationFactory(user=verified.user)
+
+    transition([duplicate.pk], "rejected")
+
+    user = verified.user
+    user.refresh_from_db()
+    assert (user.kyc_status, user.kyc_complete) == ("verified", True)
+    assert history(duplicate)[0].to_status == "rejected"
+
+
+def test_invalid_transition_changes_nothing():
+    pending = KycApplicationFactory()
+    rejected = KycApplicationFactory(kyc_status="rejected")
+
+    with pytest.raises(InvalidTransition) as error:
+        transition([pending.pk, rejected.pk], "verified")
+
+    assert error.value.rejected == [(rejected.pk, "rejected")]
+    assert set(KycApplication.objects.values_list("kyc_status", flat=True)) == {"pending", "rejected"}
+    assert not KycStatusTransition.objects.exists()
+    with pytest.raises(ValueError):
+        transition([pending.pk], "action_required")
+
+
+def test_status_at():
+    application = KycApplicationFactory()
+    before = timezone.now()
+    transition([application.pk], "rejected")
+    between = timezone.now()
+    transition([application.pk], "pending")
+
+    assert status_at(application, application.created_date - datetime.timedelta(seconds=1)) is None
+    assert status_at(application, before) == "pending"
+    assert status_at(application, between) == "rejected"
+    assert status_at(application, timezone.now()) == "pending"
+
+
+def test_admin_verify_action(admin_client, admin_user):
+    pending = KycApplicationFactory()
+    cancelled = KycApplicationFactory(kyc_status="cancelled")
+
+    admin_client.post(reverse("admin:kyc_aml_kycapplication_changelist"), {
+        "action": "verify_applications", "_selected_action": [pending.pk]})
+    pending.refresh_from_db()
+    assert (pending.kyc_status, pending.reviewer) == ("verified", admin_user)
+
+    admin_client.post(reverse("admin:kyc_aml_kycapplication_changelist"), {
+        "action": "verify_applications", "_selected_action": [cancelled.pk]})
+    cancelled.refresh_from_db()
+    assert cancelled.kyc_status == "cancelled"
+
+    response = admin_client.get(reverse("admin:kyc_aml_kycapplication_change", args=[pending.pk]))
+    assert response.status_code == 200
+    assert "Status history" in response.content.decode()
+
+    # The status of a new application cannot be set directly.
+    response = admin_client.get(reverse("admin:kyc_aml_kycapplication_add"))
+    assert response.status_code == 200
+    assert 'name="kyc_status"' not in response.content.decode()
+
+
+def test_log_is_append_only():
+    transition([KycApplicationFactory().pk], "cancelled")
+
+    with pytest.raises(DatabaseError), transaction.atomic():
+        KycStatusTransition.objects.update(note="rewritten")
+    with pytest.raises(DatabaseError), transaction.atomic():
+        KycStatusTransition.objects.all().delete()
+    assert KycStatusTransition.objects.count() == 1
+
+
+def test_monthly_partitions():
+    table = KycStatusTransition._meta.db_table
+    current = month_start(datetime.date.today())
+    names = {name for name, _ in list_partitions(table)}
+    assert {"{}_default".format(table), partition_name(table, current),
+            partition_name(table, add_months(current, 3))} <= names
+
+    assert create_partitions(table, months_ahead=4) == [partition_name(table, add_months(current, 4))]
+    assert create_partitions(table, months_ahead=4) == []
+
+    transition([KycApplicationFactory().pk], "cancelled")
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM {}".format(connection.ops.quote_name(partition_name(table, current))))
+        assert cursor.fetchone()[0] == 1
@@ -0,0 +1,100 @@
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from kyc_aml.tests.factories import KycApplicationFactory
+from kyc_aml.uploads import attach_documents
+from vigolend.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def upload(client, field_name, content_type, content):
+    response = client.post(
+        "/api/kyc-uploads/", {"field_name": field_name, "content_type": content_type}
+    )
+    assert response.status_code == 201
+    form = response.json()
+    assert form["method"] == "POST"
+    response = client.post(
+        form["url"],
+        {**form["fields"], "file": SimpleUploadedFile("document", content)},
+    )
+    return form["key"], response
+
+
+def test_presigned_upload_roundtrip(client):
+    application = KycApplicationFactory(kyc_status="pending")
+    client.force_login(application.user)
+
+    key, response = upload(client, "photo_id", "image/jpeg", b"\xff\xd8jpeg bytes")
+    assert response.status_code == 204
+    assert key.startswith(f"uploads/kyc/{application.user.pk}/photo_id/")
+
+    response = client.post(
+        "/api/kyc-uploads/attach/",
+        {"application": application.pk, "photo_id": key},
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    assert response.json()["photo_id"] == key
+    application.refresh_from_db()
+    assert application.photo_id.name == key
+    assert application.photo_id.read() == b"\xff\xd8jpeg bytes"
+
+
+def test_local_upload_rejects_tampered_token(client):
+    response = client.post(
+        "/api/kyc-uploads/local/forged:token/",
+        {"Content-Type": "image/jpeg", "file": SimpleUploadedFile("document", b"data")},
+    )
+    assert response.status_code == 403
+
+
+def test_local_upload_enforces_the_size_limit(client, monkeypatch):
+    monkeypatch.setattr("kyc_aml.views.MAX_UPLOAD_SIZE", 4)
+    client.force_login(UserFactory())
+
+    _, response = upload(client, "photo_id", "image/png", b"too large")
+    assert response.status_code == 400
+    _, response = upload(client, "photo_id", "image/png", b"")
+    assert response.status_code == 400
+
+
+def test_attach_only_to_own_editable_applications(client):
+    application = KycApplicationFactory(kyc_status="pending")
+    client.force_login(application.user)
+    key, _ = upload(client, "selfie_with_id", "image/png", b"png")
+
+    verified = KycApplicationFactory(user=application.user, kyc_status="verified")
+    foreign = KycApplicationFactory(kyc_status="pending")
+    for other in (verified, foreign):
+        response = client.post(
+            "/api/kyc-uploads/attach/",
+            {"application": other.pk, "selfie_with_id": key},
+            content_type="application/json",
+        )
+        assert response.status_code == 404
+
+    response = client.post(
+        "/api/kyc-uploads/attach/",
+        {"application": application.pk, "selfie_with_id": "../../../../etc/passwd"},
+        content_type="application/json",
+    )
+    assert response.status_code == 400
+    assert "selfie_with_id" in response.json()
+
+
+def test_attach_rejects_foreign_or_missing_keys(client):
+    application = KycApplicationFactory()
+    other = UserFactory()
+    client.force_login(other)
+    key, _ = upload(client, "selfie_with_id", "image/png", b"png")
+
+    with pytest.raises(ValidationError):
+        attach_documents(application, selfie_with_id=key)
+    with pytest.raises(ValidationError):
+        attach_documents(
+            application,
+            selfie_with_id=f"uploads/kyc/{application.user.pk}/selfie_with_id/missing.png",
+        )
@@ -0,0 +1,145 @@
+"""
+KYC status state machine.
+
+Status changes go through ``transition``, never through ``save()``. It
+validates the change against ``TRANSITIONS`` and runs it as one SQL
+statement: the applications are locked and updated, one
+``KycStatusTransition`` row per application is appended to the audit log,
+and the denormalized ``User.kyc_status``/``kyc_complete`` are updated,
+unless the user has another verified application (e.g. a duplicate being
+rejected must not undo the user's verification). If any of the applications
+cannot make the transition, nothing is changed.
+
+The audit log is indexed by application, user and target status, each with
+``created_date``, so compliance questions ("what was the status on ...",
+"who was verified last month") are answered by index range scans over the
+relevant monthly partitions instead of being reconstructed.
+"""
+from django.db import connection, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from vigolend.users.models import User
+
+from .models import KycApplication, KycStatusTransition
+
+# Allowed transitions, by current status.
+TRANSITIONS = {
+    'unverified': ('pending',),
+    'pending': ('verified', 'rejected', 'cancelled', 'unverified'),
+    'verified': ('unverified', 'pending'),
+    'rejected': ('pending',),
+    'cancelled': ('pending',),
+}
+# Statuses set by a reviewer's decision.
+REVIEWED = ('verified', 'rejected')
+
+# Sent after the transaction of a transition commits, with the ``pks`` of the
+# applications that moved to ``to_status``.
+status_changed = Signal()
+
+TRANSITION = '''
+    WITH requested AS (
+        SELECT id, kyc_status AS from_status
+        FROM {application}
+        WHERE id = ANY(%(pks)s)
+        FOR UPDATE
+    ), changed AS (
+        UPDATE {application} AS k SET {assignments}
+        FROM requested AS r
+        WHERE k.id = r.id AND r.from_status = ANY(%(from_statuses)s)
+        RETURNING k.id, k.user_id, r.from_status
+    ), logged AS (
+        INSERT INTO {transition} (
+            created_date, application_id, user_id, from_status, to_status, actor_id, note, refused_code)
+        SELECT %(now)s, id, user_id, from_status, %(to_status)s, %(actor)s, %(note)s, %(refused_code)s
+        FROM changed
+    ), users AS (
+        UPDATE {user} AS u SET
+            kyc_status = %(to_status)s,
+            kyc_complete = %(complete)s,
+            kyc_complete_date = CASE WHEN %(complete)s THEN %(now)s END,
+            modified_date = %(now)s
+        FROM changed AS c
+        WHERE u.id = c.user_id AND (%(complete)s OR NOT EXISTS (
+            SELECT 1 FROM {application} AS other
+            WHERE other.user_id = u.id AND other.kyc_status = 'verified' AND other.id <> ALL(%(pks)s)))
+    )
+    SELECT r.id, r.from_status, EXISTS (SELECT 1 FROM changed AS c WHERE c.id = r.id)
+    FROM requested AS r
+'''
+
+
+class InvalidTransition(Exception):
+    """Some of the applications cannot move to the requested status."""
+
+    def __init__(self, to_status, rejected):
+        self.to_status = to_status
+        self.rejected = rejected  # [(pk, current status)]
+        super().__init__('Cannot move {} to {!r}: {}'.format(
+            'applications' if len(rejected) > 1 else 'application', to_status,
+            ', '.join('{} is {!r}'.format(pk, status) for pk, status in rejected)))
+
+
+def allowed_sources(to_status):
+    """The statuses from which applications may move to ``to_status``."""
+    return [status for status, targets in TRANSITIONS.items() if to_status in targets]
+
+
+def transition(pks, to_status, actor=None, note=None, refused_code=None):
+    """
+    Move the applications ``pks`` to ``to_status``, on behalf of ``actor``
+    (``None`` for automated changes). Raises ``InvalidTransition``, changing
+    nothing, if any of them cannot make the transition. Returns the pks of the
+    applications that changed; deleted applications are skipped.
+    """
+    pks = list(pks)
+    if to_status not in TRANSITIONS:
+        raise ValueError('Unknown KYC status {!r}'.format(to_status))
+    if not pks:
+        return []
+    now = timezone.now()
+    assignments = ['kyc_status = %(to_status)s', 'status_update_date = %(now)s',
+                   'kyc_status_note = %(note)s', 'kyc_refused_code = %(refused_code)s']
+    if to_status in REVIEWED:
+        assignments += ['kyc_review_date = %(now)s', 'reviewer_id = COALESCE(%(actor)s, k.reviewer_id)']
+    sql = TRANSITION.format(
+        application=connection.ops.quote_name(KycApplication._meta.db_table),
+        transition=connection.ops.quote_name(KycStatusTransition._meta.db_table),
+        user=connection.ops.quote_name(User._meta.db_table),
+        assignments=', '.join(assignments),
+    )
+    params = {
+        'pks': pks, 'from_statuses': allowed_sources(to_status), 'to_status': to_status, 'now': now,
+        'actor': actor.pk if actor is not None else None, 'note': note, 'refused_code': refused_code,
+        'complete': to_status == 'verified',
+    }
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        rejected = [(pk, status) for pk, status, moved in rows if not moved]
+        if rejected:
+            # Rolls the whole statement back.
+            raise InvalidTransition(to_status, rejected)
+        changed = [pk for pk, _, _ in rows]
+        transaction.on_commit(lambda: status_changed.send(sender=KycApplication, pks=changed, to_status=to_status))
+    return changed
+
+
+# region Compliance history
+def history(application):
+    """The status transitions of ``application``, oldest first."""
+    return KycStatusTransition.objects.filter(application=application).order_by('created_date', 'id')
+
+
+def status_at(application, when):
+    """The status ``application`` had at ``when``, or ``None`` if it did not exist yet."""
+    if application.created_date > when:
+        return None
+    last = history(application).filter(created_date__lte=when).last()
+    if last is not None:
+        return last.to_status
+    following = history(application).filter(created_date__gt=when).first()
+    return following.from_status if following is not None else application.kyc_status
+# endregion
@@ -0,0 +1,103 @@
+"""
+Direct-to-storage uploads of KYC documents.
+
+Clients ask for a presigned form per document, ``POST`` the bytes straight to
+the storage backend and submit only the returned object keys, so document
+bytes never pass through a Django worker. Storages that cannot presign
+(local development, tests) get a signed URL to ``local_upload_view``, which
+stands in for the object store.
+"""
+import os
+import uuid
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils.translation import gettext_lazy as _
+
+from .models import KycApplication
+from .previews import IMAGE_FIELDS
+
+DOCUMENT_FIELDS = ('proof_of_address_document', 'photo_id', 'photo_id_back', 'selfie_with_id')
+ALLOWED_CONTENT_TYPES = {
+    'application/pdf': '.pdf',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/heic': '.heic',
+}
+UPLOAD_EXPIRY = 15 * 60
+MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+SIGNING_SALT = 'kyc_aml.uploads'
+
+
+def document_storage(field_name):
+    return KycApplication._meta.get_field(field_name).storage
+
+
+def user_prefix(user):
+    return 'uploads/kyc/{}/'.format(user.pk)
+
+
+def create_presigned_upload(user, field_name, content_type, request=None):
+    """
+    Reserve an object key for a document of ``user`` and return how to upload it.
+
+    The returned dictionary holds the ``key`` to submit with the application
+    and the ``url`` and form ``fields`` of the upload: a ``multipart/form-data``
+    ``POST`` of the fields followed by the document as ``file``. The form only
+    accepts the given content type and at most ``MAX_UPLOAD_SIZE`` bytes.
+    """
+    if field_name not in DOCUMENT_FIELDS:
+        raise ValidationError(_('Unknown document field %(field)s.'), params={'field': field_name})
+    if content_type not in ALLOWED_CONTENT_TYPES:
+        raise ValidationError(_('Unsupported document type %(type)s.'), params={'type': content_type})
+
+    key = '{}{}/{}{}'.format(user_prefix(user), field_name, uuid.uuid4().hex, ALLOWED_CONTENT_TYPES[content_type])
+    storage = document_storage(field_name)
+    presign = getattr(storage, 'presigned_post', None)
+    if presign is not None:
+        upload = presign(key, content_type, UPLOAD_EXPIRY, MAX_UPLOAD_SIZE)
+    else:
+        token = signing.dumps({'key': key, 'content_type': content_type}, salt=SIGNING_SALT)
+        url = reverse('api:kyc-local-upload', kwargs={'token': token})
+        if request is not None:
+            url = request.build_absolute_uri(url)
+        upload = {'url': url, 'fields': {'Content-Type': content_type}}
+    return {
+        'key': key,
+        'url': upload['url'],
+        'method': 'POST',
+        'fields': upload['fields'],
+        'expires_in': UPLOAD_EXPIRY,
+    }
+
+
+def read_upload_token(token):
+    """Return the key and content type of a local upload token, or raise ``signing.BadSignature``."""
+    payload = signing.loads(token, salt=SIGNING_SALT, max_age=UPLOAD_EXPIRY)
+    return payload['key'], payload['content_type']
+
+
+def attach_documents(application, **keys):
+    """
+    Point the document fields of ``application`` at already uploaded objects.
+
+    Only keys reserved for the application's user and present in storage are
+    accepted. The application is not saved.
+    """
+    prefix = user_prefix(application.user)
+    for field_name, key in keys.items():
+        if field_name not in DOCUMENT_FIELDS:
+            raise ValidationError(_('Unknown document field %(field)s.'), params={'field': field_name})
+        if not key:
+            setattr(application, field_name, None)
+            continue
+        key = os.path.normpath(key)
+        if not key.startswith(prefix + field_name + '/') or not document_storage(field_name).exists(key):
+            raise ValidationError({field_name: _('The document has not been uploaded.')})
+        # Assigning the name only records the key; nothing is read or copied.
+        setattr(application, field_name, key)
+        if field_name in IMAGE_FIELDS:
+            application.previews_generated_date = None
+    return application
@@ -0,0 +1,12 @@
+from django.db import connections
+
+
+def forget_connections():
+    """
+    Initializer of forked worker processes.
+
+    The inherited database connections belong to the parent process: forget
+    them without closing, so that a worker never talks over the parent's socket.
+    """
+    for connection in connections.all():
+        connection.connection = None
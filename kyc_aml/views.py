@@ -1,3 +1,34 @@
-from django.shortcuts import render
+from django.core import signing
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
 
-# Create your views here.
+from .uploads import MAX_UPLOAD_SIZE, document_storage, read_upload_token
+
+
+@csrf_exempt
+@require_http_methods(['POST'])
+def local_upload_view(request, token):
+    """
+    Stand-in for a presigned object store ``POST`` when the configured storage
+    cannot presign uploads (local development and tests). The signed token is
+    the only credential, as with a presigned form, and the same conditions on
+    the content type and size are enforced.
+    """
+    try:
+        key, content_type = read_upload_token(token)
+    except signing.BadSignature:
+        return HttpResponseForbidden()
+    if request.POST.get('Content-Type') != content_type:
+        return HttpResponseBadRequest('Content-Type does not match the presigned upload.')
+    document = request.FILES.get('file')
+    if document is None or not document.size:
+        return HttpResponseBadRequest('No document was uploaded.')
+    if document.size > MAX_UPLOAD_SIZE:
+        return HttpResponseBadRequest('Document is too large.')
+
+    storage = document_storage(key.split('/')[3])
+    if storage.exists(key):
+        storage.delete(key)
+    storage.save(key, document)
+    return HttpResponse(status=204)
@@ -10,11 +10,21 @@ class CountryAdmin(admin.ModelAdmin):
 
 @admin.register(State)
 class StateAdmin(admin.ModelAdmin):
-    list_display = ('name', 'iso2', 'country_code', 'created_date', 'modified_date')
-    list_display_links = ('name', 'iso2', 'country_code', 'created_date', 'modified_date')
+    list_display = ('name', 'iso2', 'country', 'created_date', 'modified_date')
+    list_display_links = ('name', 'iso2', 'country', 'created_date', 'modified_date')
+    list_filter = ('country',)
+    list_select_related = ('country',)
+    # Served by the (country, name) index.
+    ordering = ('country', 'name')
 
 
 @admin.register(City)
 class CityAdmin(admin.ModelAdmin):
-    list_display = ('name', 'country_code', 'state_code', 'created_date', 'modified_date')
-    list_display_links = ('name', 'country_code', 'state_code', 'created_date', 'modified_date')
+    list_display = ('name', 'country', 'state', 'created_date', 'modified_date')
+    list_display_links = ('name', 'country', 'state', 'created_date', 'modified_date')
+    list_filter = ('country',)
+    list_select_related = ('country', 'state')
+    raw_id_fields = ('country', 'state')
+    # Served by the (country, name) index; avoid counting the whole table on every page.
+    ordering = ('country', 'name')
+    show_full_result_count = False
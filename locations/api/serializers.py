@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from locations.models import City, State
+
+
+class StateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = State
+        fields = ["id", "name", "iso2", "country_code"]
+
+
+class CitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = City
+        fields = ["id", "name", "state", "state_code", "country_code"]
@@ -0,0 +1,65 @@
+from rest_framework.mixins import ListModelMixin
+from rest_framework.viewsets import GenericViewSet
+
+from locations.cache import countries
+from locations.models import City, Country, State
+from locations.utils import normalize_name
+from vigolend.utils.pagination import KeysetPagination
+
+from .serializers import CitySerializer, StateSerializer
+
+
+class TypeaheadPagination(KeysetPagination):
+    """Keyset pagination over the ``(search_name, id)`` search indexes."""
+
+    ordering = ("search_name", "id")
+    page_size = 20
+    max_page_size = 100
+
+
+class TypeaheadViewSet(ListModelMixin, GenericViewSet):
+    """
+    Case- and accent-insensitive prefix search on ``?q=``, optionally scoped by
+    ``?country=`` (ISO2 code).
+    """
+
+    pagination_class = TypeaheadPagination
+
+    def get_queryset(self, *args, **kwargs):
+        prefix = normalize_name(self.request.query_params.get("q"))
+        if not prefix:
+            return self.queryset.none()
+        queryset = self.queryset.filter(search_name__startswith=prefix)
+
+        country_code = self.request.query_params.get("country")
+        if country_code:
+            try:
+                country = countries.get(iso2=country_code)
+            except Country.DoesNotExist:
+                return self.queryset.none()
+            queryset = queryset.filter(country_id=country.pk)
+        return queryset
+
+
+class StateViewSet(TypeaheadViewSet):
+    serializer_class = StateSerializer
+    queryset = State.objects.all()
+
+
+class CityViewSet(TypeaheadViewSet):
+    """City prefix search, additionally scoped by ``?state=`` (state code)."""
+
+    serializer_class = CitySerializer
+    queryset = City.objects.all()
+
+    def get_queryset(self, *args, **kwargs):
+        queryset = super().get_queryset(*args, **kwargs)
+        state_code = self.request.query_params.get("state")
+        if state_code:
+            # A state code is only unique within its country.
+            states = State.objects.filter(iso2=state_code)
+            country_code = self.request.query_params.get("country")
+            if country_code:
+                states = states.filter(country__iso2=country_code.upper())
+            queryset = queryset.filter(state_id__in=states.values("pk"))
+        return queryset
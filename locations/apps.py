@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LocationsConfig(AppConfig):
     name = 'locations'
     verbose_name = 'Geolocations'
+
+    def ready(self):
+        import locations.signals  # noqa F401
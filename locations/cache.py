@@ -0,0 +1,115 @@
+"""
+Process-local, invalidation-aware registry of ``Country`` rows.
+
+Countries are read on nearly every request path but almost never change, so
+they are served from two layers:
+
+* an in-process dictionary keyed by primary key and ``iso2``;
+* the shared ``default`` cache (Redis in production), holding the full list
+  under a versioned key.
+
+Saving or deleting a country bumps the version key (see ``signals.py``);
+every process notices the new version on its next check and reloads the
+list once from the shared cache, falling back to the database.
+"""
+import copy
+import threading
+import time
+
+from django.core.cache import caches
+
+from .models import Country
+
+VERSION_KEY = 'locations:countries:version'
+DATA_KEY = 'locations:countries:{version}'
+# Versioned snapshots are immutable, stale ones simply expire.
+CACHE_TIMEOUT = 60 * 60 * 24
+# Seconds between two checks of the shared version key in a process.
+CHECK_INTERVAL = 5
+
+
+class CountryRegistry:
+    """Serve ``Country`` instances without per-request queries."""
+
+    def __init__(self, cache_alias='default', check_interval=CHECK_INTERVAL):
+        self.cache_alias = cache_alias
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._version = None
+        self._checked_at = 0.0
+        self._ordered = []
+        self._by_pk = {}
+        self._by_iso2 = {}
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    # region Lookups
+    def all(self):
+        """Return copies of all countries ordered by name."""
+        self._refresh()
+        return [copy.copy(country) for country in self._ordered]
+
+    def signup_countries(self):
+        """Return copies of the countries accepting registrations, ordered by name."""
+        return [country for country in self.all() if country.accept_signup]
+
+    def get(self, pk=None, iso2=None):
+        """
+        Return a copy of the country with the given primary key or ISO2 code.
+
+        Raises ``Country.DoesNotExist`` if the country is unknown.
+        """
+        self._refresh()
+        if pk is not None:
+            country = self._by_pk.get(int(pk))
+        else:
+            country = self._by_iso2.get((iso2 or '').upper())
+        if country is None:
+            raise Country.DoesNotExist('Country matching pk=%r iso2=%r does not exist.' % (pk, iso2))
+        return copy.copy(country)
+    # endregion
+
+    # region Invalidation
+    def invalidate(self):
+        """Publish a new version so every process reloads its countries."""
+        try:
+            self.cache.incr(VERSION_KEY)
+        except ValueError:
+            self.cache.set(VERSION_KEY, 1, None)
+        self.clear()
+
+    def clear(self):
+        """Drop the in-process layer of this process only."""
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+    # endregion
+
+    # region Loading
+    def _refresh(self):
+        if self._version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+
+        version = self.cache.get(VERSION_KEY)
+        if version is None:
+            self.cache.add(VERSION_KEY, 1, None)
+            version = self.cache.get(VERSION_KEY, 1)
+
+        if version != self._version:
+            key = DATA_KEY.format(version=version)
+            countries = self.cache.get(key)
+            if countries is None:
+                countries = list(Country.objects.order_by('name'))
+                self.cache.set(key, countries, CACHE_TIMEOUT)
+            with self._lock:
+                self._ordered = countries
+                self._by_pk = {country.pk: country for country in countries}
+                self._by_iso2 = {country.iso2.upper(): country for country in countries if country.iso2}
+                self._version = version
+        self._checked_at = time.monotonic()
+    # endregion
+
+
+countries = CountryRegistry()
@@ -0,0 +1,58 @@
+"""
+Consistency checks between the denormalized code columns of ``State`` and
+``City`` and the foreign keys they mirror.
+
+The foreign keys are authoritative. Tables are scanned in primary key ranges
+of ``batch_size`` rows, each range checked and repaired with one set-based
+statement in its own short transaction, so no long-running locks are held.
+"""
+from django.db import connections, transaction
+
+from .models import City, State
+
+DEFAULT_BATCH_SIZE = 10000
+
+# (model, joined tables, join condition, [(code column, authoritative value)])
+CHECKS = (
+    (State, 'countries AS co', 't.country_id = co.id',
+     [('country_code', "COALESCE(co.iso2, '')")]),
+    (City, 'countries AS co, state_regions AS st', 't.country_id = co.id AND t.state_id = st.id',
+     [('country_code', "COALESCE(co.iso2, '')"), ('state_code', 'st.iso2')]),
+)
+
+
+def check_locations(repair=False, batch_size=DEFAULT_BATCH_SIZE, using='default'):
+    """
+    Scan states and cities for code columns that disagree with their foreign
+    keys, repairing them if ``repair`` is set.
+
+    Returns the number of drifted rows per model.
+    """
+    connection = connections[using]
+    report = {}
+    for model, tables, join, columns in CHECKS:
+        report[model] = 0
+        table = connection.ops.quote_name(model._meta.db_table)
+        drift = ' OR '.join('t.{} IS DISTINCT FROM {}'.format(column, value) for column, value in columns)
+        if repair:
+            statement = 'UPDATE {table} AS t SET {assignments} FROM {tables} WHERE {join} AND ({drift}) AND {range}'
+        else:
+            statement = 'SELECT COUNT(*) FROM {table} AS t, {tables} WHERE {join} AND ({drift}) AND {range}'
+        statement = statement.format(
+            table=table, tables=tables, join=join, drift=drift, range='t.id > %s AND t.id <= %s',
+            assignments=', '.join('{} = {}'.format(column, value) for column, value in columns))
+
+        bounds = model.objects.using(using).order_by('pk').values_list('pk', flat=True)
+        last = 0
+        while True:
+            # The upper bound of the next range is found through the primary key index.
+            upper = list(bounds.filter(pk__gt=last)[batch_size - 1:batch_size])
+            upper = upper[0] if upper else bounds.last()
+            if upper is None or upper <= last:
+                break
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.execute(statement, [last, upper])
+                drifted = cursor.rowcount if repair else cursor.fetchone()[0]
+            report[model] += drifted
+            last = upper
+    return report
@@ -0,0 +1,22 @@
+from django.db import models
+from django.db.models.fields.related_descriptors import ForwardManyToOneDescriptor
+
+from .cache import countries
+
+
+class CountryDescriptor(ForwardManyToOneDescriptor):
+    """Resolve the related country from the registry instead of the database."""
+
+    def get_object(self, instance):
+        try:
+            return countries.get(pk=getattr(instance, self.field.attname))
+        except self.field.related_model.DoesNotExist:
+            return super().get_object(instance)
+
+
+class CountryForeignKey(models.ForeignKey):
+    """
+    A foreign key to ``locations.Country`` whose related object is served by the
+    process-local country registry. Accessing it does not issue a query.
+    """
+    forward_related_accessor_class = CountryDescriptor
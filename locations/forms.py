@@ -0,0 +1,52 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+
+from .cache import countries
+from .models import Country
+
+
+class CountryChoiceIterator(ModelChoiceIterator):
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for country in self.field.get_countries():
+            yield self.choice(country)
+
+    def __len__(self):
+        return len(self.field.get_countries()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.get_countries())
+
+
+class CountryChoiceField(forms.ModelChoiceField):
+    """
+    A country ``ModelChoiceField`` whose choices and cleaning are served by the
+    country registry, so rendering and validating the form issue no queries.
+    """
+    iterator = CountryChoiceIterator
+
+    def __init__(self, signup_only=False, **kwargs):
+        self.signup_only = signup_only
+        super().__init__(queryset=Country.objects.none(), **kwargs)
+
+    def get_countries(self):
+        return countries.signup_countries() if self.signup_only else countries.all()
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, Country):
+            value = value.pk
+        try:
+            country = countries.get(pk=value)
+        except (ValueError, TypeError, Country.DoesNotExist):
+            country = None
+        if country is None or (self.signup_only and not country.accept_signup):
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return country
@@ -0,0 +1,232 @@
+"""
+Bulk loading of the locations gazetteer (countries, states and cities).
+
+Rows are streamed from the source file in chunks, copied into a temporary
+staging table with PostgreSQL ``COPY`` and merged into the target table with
+two set-based statements (``UPDATE ... FROM`` and ``INSERT ... SELECT``).
+Foreign keys are resolved from ``country_code``/``state_code`` through
+in-memory maps built once per level, so no per-row lookups are issued.
+"""
+import csv
+import io
+import json
+import time
+from itertools import islice
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .cache import countries as country_registry
+from .models import City, Country, State
+from .utils import normalize_name
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def read_rows(path):
+    """
+    Yield the rows of a gazetteer source file as dictionaries.
+
+    CSV files and newline-delimited JSON files are streamed. A file holding a
+    single JSON array is supported too, but is parsed as a whole.
+    """
+    with open(path, newline='', encoding='utf-8') as source:
+        if not str(path).endswith(('.json', '.jsonl', '.ndjson')):
+            yield from csv.DictReader(source)
+            return
+
+        first = source.read(1)
+        while first.isspace():
+            first = source.read(1)
+        if first == '[':
+            yield from json.loads(first + source.read())
+            return
+
+        source.seek(0)
+        for line in source:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _clean(value):
+    """Normalize an empty source value to ``None``."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class LoadResult:
+    """Outcome of loading one level of the gazetteer."""
+
+    def __init__(self, model, rows=0, skipped=0, seconds=0.0):
+        self.model = model
+        self.rows = rows
+        self.skipped = skipped
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else float(self.rows)
+
+    def __str__(self):
+        return '{}: {} rows ({} skipped) in {:.2f}s, {:.0f} rows/s'.format(
+            self.model._meta.verbose_name_plural, self.rows, self.skipped,
+            self.seconds, self.rows_per_second)
+
+
+class GazetteerLoader:
+    """
+    Upsert gazetteer rows into the ``countries``, ``state_regions`` and
+    ``city_locations`` tables.
+
+    Records are matched on their natural keys: ``iso2`` for countries,
+    ``(country_code, iso2)`` for states and ``(country_code, state_code, name)``
+    for cities. Existing records are updated in place, only when a value has
+    changed, and unknown ones are inserted. Optional columns missing or empty
+    in the source keep their current value.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, using='default'):
+        self.batch_size = batch_size
+        self.using = using
+
+    # region Levels
+    def load_countries(self, rows):
+        columns = ('name', 'iso2', 'phone_code', 'currency', 'native')
+        optional = ('phone_code', 'currency', 'native')
+
+        def convert(row):
+            record = tuple(_clean(row.get(column)) for column in columns)
+            return record if record[0] and record[1] else None
+
+        result = self._load(Country, columns, ('iso2',), rows, convert, optional=optional)
+        # COPY bypasses the model signals that keep the registry current.
+        transaction.on_commit(country_registry.invalidate, using=self.using)
+        return result
+
+    def load_states(self, rows):
+        countries = self._country_map()
+        columns = ('name', 'search_name', 'country_code', 'iso2', 'country_id')
+
+        def convert(row):
+            country_code = _clean(row.get('country_code'))
+            country_id = countries.get(country_code)
+            name = _clean(row.get('name'))
+            if not name or country_id is None:
+                return None
+            iso2 = _clean(row.get('iso2') or row.get('state_code'))
+            return name, normalize_name(name), country_code, iso2, country_id
+
+        return self._load(State, columns, ('country_code', 'iso2'), rows, convert)
+
+    def load_cities(self, rows):
+        countries = self._country_map()
+        states = self._state_map()
+        columns = ('name', 'search_name', 'country_code', 'state_code', 'country_id', 'state_id')
+
+        def convert(row):
+            country_code = _clean(row.get('country_code'))
+            state_code = _clean(row.get('state_code'))
+            country_id = countries.get(country_code)
+            state_id = states.get((country_code, state_code))
+            name = _clean(row.get('name'))
+            if not name or country_id is None or state_id is None:
+                return None
+            return name, normalize_name(name), country_code, state_code, country_id, state_id
+
+        return self._load(
+            City, columns, ('country_code', 'state_code', 'name'), rows, convert)
+    # endregion
+
+    # region Foreign key maps
+    def _country_map(self):
+        queryset = Country.objects.using(self.using).exclude(iso2=None)
+        return dict(queryset.values_list('iso2', 'pk'))
+
+    def _state_map(self):
+        queryset = State.objects.using(self.using).values_list('country_code', 'iso2', 'pk')
+        return {(country_code, iso2): pk for country_code, iso2, pk in queryset}
+    # endregion
+
+    # region Merging
+    def _load(self, model, columns, key, rows, convert, optional=()):
+        result = LoadResult(model)
+        started = time.monotonic()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                break
+            records = []
+            for row in chunk:
+                record = convert(row)
+                if record is None:
+                    result.skipped += 1
+                else:
+                    records.append(record)
+            if records:
+                self._merge(model, columns, key, records, optional)
+            result.rows += len(records)
+        result.seconds = time.monotonic() - started
+        return result
+
+    def _merge(self, model, columns, key, records, optional=()):
+        connection = connections[self.using]
+        qn = connection.ops.quote_name
+        table = qn(model._meta.db_table)
+        staging = qn('staging_{}'.format(model._meta.db_table))
+        column_list = ', '.join(qn(column) for column in columns)
+        now = timezone.now()
+
+        buffer = io.StringIO()
+        csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC).writerows(records)
+        buffer.seek(0)
+
+        # COALESCE keeps the join hashable while treating NULL codes as equal.
+        matches = ' AND '.join(
+            "COALESCE(t.{0}, '') = COALESCE(s.{0}, '')".format(qn(column)) for column in key)
+        # A NULL optional value (absent from the source) keeps the current one.
+        values = {
+            column: 'COALESCE(s.{0}, t.{0})' if column in optional else 's.{0}' for column in columns}
+        changed = ' OR '.join(
+            't.{0} IS DISTINCT FROM {1}'.format(qn(column), values[column].format(qn(column)))
+            for column in columns)
+        assignments = ', '.join(
+            '{0} = {1}'.format(qn(column), values[column].format(qn(column))) for column in columns)
+        distinct = ', '.join("COALESCE(s.{}, '')".format(qn(column)) for column in key)
+        fields = {field.column: field for field in model._meta.concrete_fields}
+        nullable = [column for column in columns if column in optional or fields[column].null]
+
+        # Values for the remaining non-nullable columns of newly inserted rows.
+        defaults = [(field.column, field.get_default()) for field in model._meta.concrete_fields
+                    if field.has_default() and not field.primary_key and field.column not in columns]
+        insert_columns = ', '.join(
+            [column_list] + [qn(column) for column, _ in defaults])
+        insert_values = ', '.join(
+            ['s.{}'.format(qn(column)) for column in columns] + ['%s'] * len(defaults))
+
+        with transaction.atomic(using=self.using), connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMPORARY TABLE {} AS '
+                'SELECT {} FROM {} WITH NO DATA'.format(staging, column_list, table))
+            # The csv module quotes None as "", which COPY reads as '' unless told otherwise.
+            force_null = ', FORCE_NULL ({})'.format(', '.join(qn(c) for c in nullable)) if nullable else ''
+            cursor.copy_expert(
+                'COPY {} ({}) FROM STDIN WITH (FORMAT csv{})'.format(staging, column_list, force_null), buffer)
+            cursor.execute(
+                'UPDATE {table} AS t SET {assignments}, modified_date = %s '
+                'FROM {staging} AS s WHERE {matches} AND ({changed})'.format(
+                    table=table, assignments=assignments, staging=staging,
+                    matches=matches, changed=changed),
+                [now])
+            cursor.execute(
+                'INSERT INTO {table} ({columns}) '
+                'SELECT DISTINCT ON ({distinct}) {values} FROM {staging} AS s '
+                'WHERE NOT EXISTS (SELECT 1 FROM {table} AS t WHERE {matches})'.format(
+                    table=table, columns=insert_columns, distinct=distinct,
+                    values=insert_values, staging=staging, matches=matches),
+                [value for _, value in defaults])
+            cursor.execute('DROP TABLE {}'.format(staging))
+    # endregion
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from locations.consistency import DEFAULT_BATCH_SIZE, check_locations
+
+
+class Command(BaseCommand):
+    help = (
+        "Scan states and cities in primary key batches for country/state code columns "
+        "that drifted from their foreign keys, and optionally repair them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true', help="Rewrite drifted code columns.")
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help="Number of rows checked per statement and transaction.")
+
+    def handle(self, *args, **options):
+        report = check_locations(repair=options['repair'], batch_size=options['batch_size'])
+        verb = "repaired" if options['repair'] else "drifted"
+        for model, count in report.items():
+            style = self.style.WARNING if count and not options['repair'] else self.style.SUCCESS
+            self.stdout.write(style("{}: {} rows {}".format(model._meta.verbose_name_plural, count, verb)))
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from locations.snapshot import export_snapshot
+
+
+class Command(BaseCommand):
+    help = "Compile the locations hierarchy into the memory-mappable lookup snapshot."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default=settings.LOCATIONS_SNAPSHOT_PATH,
+            help="Destination file, defaults to LOCATIONS_SNAPSHOT_PATH.")
+
+    def handle(self, *args, **options):
+        countries, states, cities = export_snapshot(options['path'])
+        self.stdout.write(self.style.SUCCESS(
+            "Wrote {}: {} countries, {} states, {} cities".format(options['path'], countries, states, cities)))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from locations.loaders import DEFAULT_BATCH_SIZE, GazetteerLoader, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load countries, states and cities from CSV or JSON sources. "
+        "Existing records are matched on their codes and updated in place."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--countries', help="Path to the countries source file.")
+        parser.add_argument('--states', help="Path to the states/regions source file.")
+        parser.add_argument('--cities', help="Path to the cities source file.")
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help="Number of rows copied and merged per statement batch.")
+        parser.add_argument('--database', default='default', help="Database alias to load into.")
+
+    def handle(self, *args, **options):
+        levels = [
+            (options['countries'], 'load_countries'),
+            (options['states'], 'load_states'),
+            (options['cities'], 'load_cities'),
+        ]
+        if not any(path for path, _ in levels):
+            raise CommandError("Provide at least one of --countries, --states or --cities.")
+
+        loader = GazetteerLoader(batch_size=options['batch_size'], using=options['database'])
+        # Levels are loaded parent first so that the foreign key maps are complete.
+        for path, method in levels:
+            if path:
+                result = getattr(loader, method)(read_rows(path))
+                self.stdout.write(self.style.SUCCESS(str(result)))
@@ -0,0 +1,68 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:25
+
+from django.db import migrations, models
+
+from locations.utils import normalize_name
+
+BATCH_SIZE = 5000
+
+
+def populate_search_names(apps, schema_editor):
+    for model_name in ('State', 'City'):
+        model = apps.get_model('locations', model_name)
+        batch = []
+        for obj in model.objects.only('id', 'name').iterator(chunk_size=BATCH_SIZE):
+            obj.search_name = normalize_name(obj.name)
+            batch.append(obj)
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, ['search_name'])
+                batch = []
+        model.objects.bulk_update(batch, ['search_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='city',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, help_text='Lower-cased, accent-free name used for prefix search.', max_length=255, verbose_name='Search Name'),
+        ),
+        migrations.AddField(
+            model_name='state',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, help_text='Lower-cased, accent-free name used for prefix search.', max_length=255, verbose_name='Search Name'),
+        ),
+        # Byte-wise collation lets plain btree indexes serve prefix LIKE as well as ORDER BY.
+        migrations.RunSQL(
+            sql=[
+                'ALTER TABLE state_regions ALTER COLUMN search_name TYPE varchar(255) COLLATE "C"',
+                'ALTER TABLE city_locations ALTER COLUMN search_name TYPE varchar(255) COLLATE "C"',
+            ],
+            reverse_sql=[
+                'ALTER TABLE state_regions ALTER COLUMN search_name TYPE varchar(255) COLLATE "default"',
+                'ALTER TABLE city_locations ALTER COLUMN search_name TYPE varchar(255) COLLATE "default"',
+            ],
+        ),
+        migrations.RunPython(populate_search_names, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='city',
+            index=models.Index(fields=['search_name', 'id'], name='city_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='city',
+            index=models.Index(fields=['country', 'search_name', 'id'], name='city_country_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='city',
+            index=models.Index(fields=['state', 'search_name', 'id'], name='city_state_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='state',
+            index=models.Index(fields=['country', 'search_name', 'id'], name='state_country_search_idx'),
+        ),
+    ]
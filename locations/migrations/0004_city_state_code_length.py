@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0003_name_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='city',
+            name='state_code',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='State Code'),
+        ),
+    ]
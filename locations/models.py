@@ -3,6 +3,8 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .utils import normalize_name
+
 
 class Country(models.Model):
     """Represents a country"""
@@ -79,6 +81,12 @@ class State(models.Model):
         verbose_name=_('State Name'),
         help_text=_('The name of the State or Region.'))
 
+    search_name = models.CharField(
+        max_length=255,
+        blank=True, editable=False,
+        verbose_name=_('Search Name'),
+        help_text=_('Lower-cased, accent-free name used for prefix search.'))
+
     country_code = models.CharField(
         max_length=2,
         blank=True,
@@ -119,11 +127,22 @@ class State(models.Model):
         verbose_name = _("State / Region")
         verbose_name_plural = _("States & Regions")
         db_table = 'state_regions'
+        indexes = [
+            # search_name uses the "C" collation, so these serve prefix LIKE and keyset ordering.
+            models.Index(fields=['country', 'search_name', 'id'], name='state_country_search_idx'),
+            models.Index(fields=['country', 'name'], name='state_country_name_idx'),
+        ]
     # endregion
 
     # region Methods
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        self.search_name = normalize_name(self.name)
+        # The country foreign key is authoritative, the code column mirrors it.
+        self.country_code = self.country.iso2 or ''
+        super().save(*args, **kwargs)
     # endregion
 
 
@@ -135,13 +154,20 @@ class City(models.Model):
         verbose_name=_('City Name'),
         help_text=_(' The name of the city location.'))
 
+    search_name = models.CharField(
+        max_length=255,
+        blank=True, editable=False,
+        verbose_name=_('Search Name'),
+        help_text=_('Lower-cased, accent-free name used for prefix search.'))
+
     country_code = models.CharField(
         max_length=5,
         blank=True,
         verbose_name=_('Country Code'))
 
+    # As long as ``State.iso2``, which it mirrors.
     state_code = models.CharField(
-        max_length=5,
+        max_length=255,
         blank=True, null=True,
         verbose_name=_('State Code'))
 
@@ -178,9 +204,24 @@ class City(models.Model):
         verbose_name = _("City Location")
         verbose_name_plural = _("City Locations")
         db_table = 'city_locations'
+        indexes = [
+            # search_name uses the "C" collation, so these serve prefix LIKE and keyset ordering.
+            models.Index(fields=['search_name', 'id'], name='city_search_idx'),
+            models.Index(fields=['country', 'search_name', 'id'], name='city_country_search_idx'),
+            models.Index(fields=['state', 'search_name', 'id'], name='city_state_search_idx'),
+            models.Index(fields=['country', 'name'], name='city_country_name_idx'),
+            models.Index(fields=['state', 'name'], name='city_state_name_idx'),
+        ]
     # endregion
 
     # region Methods
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        self.search_name = normalize_name(self.name)
+        # The foreign keys are authoritative, the code columns mirror them.
+        self.country_code = self.country.iso2 or ''
+        self.state_code = self.state.iso2
+        super().save(*args, **kwargs)
     # endregion
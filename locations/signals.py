@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import countries
+from .models import Country
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+def invalidate_countries(sender, **kwargs):
+    # Publish the new version only once the change is visible to other processes.
+    transaction.on_commit(countries.invalidate)
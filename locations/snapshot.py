@@ -0,0 +1,269 @@
+"""
+Compiled, memory-mappable snapshot of the locations hierarchy.
+
+The snapshot lets country/state/city combinations be validated without
+touching the database (``validate_address``). ``export_snapshot`` builds it from the ORM and
+``GeoSnapshot`` reads it through ``mmap``, so every worker process shares the
+same pages through the OS page cache and nothing is copied on load.
+
+File layout (little endian)::
+
+    header     magic, country/state/city counts, strings offset
+    countries  sorted by ISO2 code: code, name, first state, state count
+    states     grouped by country, sorted by search name: code, name, first city, city count
+    cities     grouped by state, sorted by search name: name
+    strings    UTF-8 blob addressed by (offset, length) pairs
+
+Names are stored in their ``search_name`` form (see ``utils.normalize_name``),
+so lookups are case- and accent-insensitive.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from itertools import groupby
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from .models import City, Country, State
+from .utils import normalize_name
+
+MAGIC = b'VGLOC001'
+HEADER = struct.Struct('<8sIIIQ')
+COUNTRY = struct.Struct('<2sIHII')
+STATE = struct.Struct('<IHIHII')
+CITY = struct.Struct('<IH')
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing or malformed."""
+
+
+# region Export
+class _Strings:
+    def __init__(self):
+        self.blob = bytearray()
+        self.offsets = {}
+
+    def add(self, value):
+        data = (value or '').encode('utf-8')
+        if data not in self.offsets:
+            self.offsets[data] = len(self.blob)
+            self.blob += data
+        return self.offsets[data], len(data)
+
+
+def export_snapshot(path=None, using='default'):
+    """
+    Build the snapshot from the database and atomically replace ``path``.
+    ``get_snapshot`` maps the new file on its next call in every process.
+    """
+    path = path or settings.LOCATIONS_SNAPSHOT_PATH
+    strings = _Strings()
+
+    countries = list(
+        Country.objects.using(using).exclude(iso2=None).order_by('iso2').values_list('pk', 'iso2', 'name'))
+    states = State.objects.using(using).order_by('country_id', 'search_name', 'pk').values_list(
+        'pk', 'country_id', 'iso2', 'search_name')
+    cities = City.objects.using(using).order_by('state_id', 'search_name', 'pk').values_list(
+        'state_id', 'search_name')
+
+    # Cities are streamed once and grouped by state.
+    city_records = bytearray()
+    city_ranges = {}
+    count = 0
+    for state_id, names in groupby(cities.iterator(chunk_size=10000), key=lambda row: row[0]):
+        first = count
+        for _state_id, name in names:
+            city_records += CITY.pack(*strings.add(name))
+            count += 1
+        city_ranges[state_id] = (first, count - first)
+
+    state_records = bytearray()
+    state_ranges = {}
+    index = 0
+    for country_id, rows in groupby(states.iterator(), key=lambda row: row[1]):
+        first = index
+        for pk, _country_id, code, name in rows:
+            state_records += STATE.pack(
+                *strings.add((code or '').upper()), *strings.add(name), *city_ranges.get(pk, (0, 0)))
+            index += 1
+        state_ranges[country_id] = (first, index - first)
+
+    country_records = bytearray()
+    for pk, iso2, name in countries:
+        country_records += COUNTRY.pack(
+            iso2.upper().encode('ascii'), *strings.add(normalize_name(name)), *state_ranges.get(pk, (0, 0)))
+
+    strings_offset = HEADER.size + len(country_records) + len(state_records) + len(city_records)
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as target:
+        target.write(HEADER.pack(MAGIC, len(countries), index, count, strings_offset))
+        target.write(country_records)
+        target.write(state_records)
+        target.write(city_records)
+        target.write(strings.blob)
+    os.chmod(target.name, 0o644)
+    os.replace(target.name, path)
+    return len(countries), index, count
+# endregion
+
+
+# region Lookup
+class GeoSnapshot:
+    """Read-only view over a memory-mapped snapshot file."""
+
+    def __init__(self, path):
+        try:
+            with open(path, 'rb') as source:
+                self._buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as error:
+            raise SnapshotError('Cannot map locations snapshot {}: {}'.format(path, error))
+        if len(self._buffer) < HEADER.size:
+            raise SnapshotError('Locations snapshot {} is truncated.'.format(path))
+        magic, self.country_count, self.state_count, self.city_count, self._strings = HEADER.unpack_from(
+            self._buffer)
+        if magic != MAGIC:
+            raise SnapshotError('{} is not a locations snapshot.'.format(path))
+        self._countries = HEADER.size
+        self._states = self._countries + self.country_count * COUNTRY.size
+        self._cities = self._states + self.state_count * STATE.size
+
+    def _string(self, offset, length):
+        start = self._strings + offset
+        return self._buffer[start:start + length].decode('utf-8')
+
+    def _country(self, iso2):
+        target = (iso2 or '').strip().upper().encode('ascii', 'replace')
+        lo, hi = 0, self.country_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = COUNTRY.unpack_from(self._buffer, self._countries + mid * COUNTRY.size)
+            if record[0] < target:
+                lo = mid + 1
+            elif record[0] > target:
+                hi = mid
+            else:
+                return record
+        return None
+
+    def _state(self, country, state):
+        _, _, _, first, count = country
+        # States are sorted by name; a code match needs a scan of the (small) country range.
+        code = (state or '').strip().upper()
+        name = normalize_name(state)
+        lo, hi = first, first + count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = STATE.unpack_from(self._buffer, self._states + mid * STATE.size)
+            value = self._string(record[2], record[3])
+            if value < name:
+                lo = mid + 1
+            elif value > name:
+                hi = mid
+            else:
+                return record
+        for position in range(first, first + count):
+            record = STATE.unpack_from(self._buffer, self._states + position * STATE.size)
+            if code and self._string(record[0], record[1]) == code:
+                return record
+        return None
+
+    def has_country(self, iso2):
+        return self._country(iso2) is not None
+
+    def has_state(self, iso2, state):
+        """Whether ``state`` (a code or a name) belongs to the country ``iso2``."""
+        country = self._country(iso2)
+        return country is not None and self._state(country, state) is not None
+
+    def has_city(self, iso2, state, city):
+        """Whether ``city`` lies in ``state`` (a code or a name) of the country ``iso2``."""
+        country = self._country(iso2)
+        state = country and self._state(country, state)
+        if not state:
+            return False
+        name = normalize_name(city)
+        lo, hi = state[4], state[4] + state[5]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = self._string(*CITY.unpack_from(self._buffer, self._cities + mid * CITY.size))
+            if value < name:
+                lo = mid + 1
+            elif value > name:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def is_valid(self, iso2, state=None, city=None):
+        """Validate a country, country/state or country/state/city combination."""
+        if city is not None:
+            return self.has_city(iso2, state, city)
+        if state is not None:
+            return self.has_state(iso2, state)
+        return self.has_country(iso2)
+
+    def close(self):
+        self._buffer.close()
+
+
+_snapshot = None
+
+
+def get_snapshot():
+    """
+    The process-wide snapshot of ``LOCATIONS_SNAPSHOT_PATH``, mapped again
+    when the file is replaced. ``None`` if there is no snapshot.
+    """
+    global _snapshot
+    path = settings.LOCATIONS_SNAPSHOT_PATH
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    # A replaced file is a new inode; the previous mapping stays valid for readers still holding it.
+    if _snapshot is None or _snapshot[0] != (path, stat.st_ino, stat.st_mtime):
+        _snapshot = ((path, stat.st_ino, stat.st_mtime), GeoSnapshot(path))
+    return _snapshot[1]
+# endregion
+
+
+# region Validation
+def is_valid_location(iso2, state=None, city=None):
+    """
+    Whether the country ``iso2``, its ``state`` (a code or a name) and the
+    ``city`` in it exist. Checked against the snapshot, or the database if
+    none was exported.
+    """
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        return snapshot.is_valid(iso2, state, city)
+    country = Country.objects.filter(iso2__iexact=(iso2 or '').strip())
+    if state is None:
+        return country.exists()
+    states = State.objects.filter(country__in=country).filter(
+        Q(iso2__iexact=state.strip()) | Q(search_name=normalize_name(state)))
+    if city is None:
+        return states.exists()
+    return City.objects.filter(state__in=states, search_name=normalize_name(city)).exists()
+
+
+def validate_address(country, state, city, state_field='state', city_field='city'):
+    """
+    Raise a ``ValidationError`` on ``state_field`` or ``city_field`` if
+    ``state`` is not in ``country`` or ``city`` is not in ``state``. Countries
+    without an ISO2 code cannot be checked and are accepted.
+    """
+    if country is None or not country.iso2 or not state:
+        return
+    if not is_valid_location(country.iso2, state):
+        raise ValidationError({state_field: _('%(state)s is not a state of %(country)s.') % {
+            'state': state, 'country': country.name}})
+    if city and not is_valid_location(country.iso2, state, city):
+        raise ValidationError({city_field: _('%(city)s is not a city of %(state)s.') % {
+            'city': city, 'state': state}})
+# endregion
@@ -1,3 +1,252 @@
-from django.test import TestCase
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
 
-# Create your tests here.
+from .cache import countries
+from .consistency import check_locations
+from .forms import CountryChoiceField
+from .loaders import GazetteerLoader, read_rows
+from .models import City, Country, State
+from .snapshot import GeoSnapshot, export_snapshot, get_snapshot, validate_address
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def gazetteer(tmp_path):
+    countries = tmp_path / 'countries.csv'
+    countries.write_text(
+        'name,iso2,phone_code,currency,native\n'
+        'Poland,PL,48,PLN,Polska\n'
+        'Germany,DE,49,EUR,Deutschland\n'
+    )
+    states = tmp_path / 'states.jsonl'
+    states.write_text(
+        '{"name": "Masovia", "country_code": "PL", "state_code": "14"}\n'
+        '{"name": "Bavaria", "country_code": "DE", "state_code": "BY"}\n'
+        '{"name": "Atlantis", "country_code": "XX", "state_code": "AT"}\n'
+    )
+    cities = tmp_path / 'cities.csv'
+    cities.write_text(
+        'name,country_code,state_code\n'
+        'Warsaw,PL,14\n'
+        'Radom,PL,14\n'
+        'Munich,DE,BY\n'
+    )
+    return countries, states, cities
+
+
+def test_read_rows_json_array(tmp_path):
+    source = tmp_path / 'countries.json'
+    source.write_text(' [{"name": "Poland", "iso2": "PL"}]')
+    assert list(read_rows(str(source))) == [{'name': 'Poland', 'iso2': 'PL'}]
+
+
+def test_load_locations(gazetteer):
+    countries, states, cities = gazetteer
+    call_command(
+        'load_locations', countries=str(countries), states=str(states), cities=str(cities),
+        batch_size=2)
+
+    poland = Country.objects.get(iso2='PL')
+    assert poland.native == 'Polska'
+    assert poland.accept_signup is True
+    assert State.objects.count() == 2
+    assert set(City.objects.filter(state__iso2='14').values_list('name', flat=True)) == {
+        'Warsaw', 'Radom'}
+    assert City.objects.get(name='Munich').country == Country.objects.get(iso2='DE')
+
+
+def test_load_locations_updates_in_place(gazetteer, tmp_path):
+    countries, states, cities = gazetteer
+    loader = GazetteerLoader()
+    loader.load_countries(read_rows(str(countries)))
+    loader.load_states(read_rows(str(states)))
+    loader.load_cities(read_rows(str(cities)))
+
+    renamed = tmp_path / 'renamed.csv'
+    renamed.write_text('name,iso2,currency\nRepublic of Poland,PL,PLZ\n')
+    result = loader.load_countries(read_rows(str(renamed)))
+    result_cities = loader.load_cities(read_rows(str(cities)))
+
+    assert result.rows == 1
+    assert Country.objects.count() == 2
+    poland = Country.objects.get(iso2='PL')
+    assert (poland.name, poland.currency) == ('Republic of Poland', 'PLZ')
+    # Columns missing from the file keep their values.
+    assert (poland.phone_code, poland.native) == ('48', 'Polska')
+    assert result_cities.rows == 3
+    assert City.objects.count() == 3
+
+
+def test_load_locations_stores_missing_codes_as_null(gazetteer, tmp_path):
+    countries, _, _ = gazetteer
+    states = tmp_path / 'states.csv'
+    states.write_text('name,country_code,state_code\nMonaco,PL,\n')
+    cities = tmp_path / 'cities.csv'
+    cities.write_text('name,country_code,state_code\nMonte Carlo,PL,\n')
+    loader = GazetteerLoader()
+    loader.load_countries(read_rows(str(countries)))
+    loader.load_states(read_rows(str(states)))
+    loader.load_cities(read_rows(str(cities)))
+    # A second load matches the NULL codes instead of adding duplicates.
+    loader.load_states(read_rows(str(states)))
+
+    assert list(State.objects.values_list('iso2', flat=True)) == [None]
+    assert list(City.objects.values_list('state_code', 'state__name')) == [(None, 'Monaco')]
+
+
+@pytest.fixture
+def registry():
+    countries.clear()
+    yield countries
+    countries.clear()
+
+
+def test_country_registry_serves_cached_countries(registry, django_assert_num_queries):
+    poland = Country.objects.create(name='Poland', iso2='PL')
+    Country.objects.create(name='Atlantis', iso2='AT', accept_signup=False)
+    registry.invalidate()
+
+    assert registry.get(iso2='pl') == poland
+    with django_assert_num_queries(0):
+        assert registry.get(pk=poland.pk).name == 'Poland'
+        assert [country.iso2 for country in registry.signup_countries()] == ['PL']
+        with pytest.raises(Country.DoesNotExist):
+            registry.get(iso2='XX')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_country_registry_invalidated_on_save(registry):
+    poland = Country.objects.create(name='Poland', iso2='PL')
+    assert registry.get(iso2='PL').name == 'Poland'
+
+    poland.name = 'Republic of Poland'
+    poland.save()
+
+    assert registry.get(iso2='PL').name == 'Republic of Poland'
+
+
+def test_country_choice_field(registry, django_assert_num_queries):
+    poland = Country.objects.create(name='Poland', iso2='PL')
+    banned = Country.objects.create(name='Atlantis', iso2='AT', accept_signup=False)
+    registry.invalidate()
+    field = CountryChoiceField(signup_only=True, empty_label='Country')
+
+    assert field.clean(str(poland.pk)) == poland
+    with django_assert_num_queries(0):
+        assert list(field.choices)[1][0].value == poland.pk
+        with pytest.raises(ValidationError):
+            field.clean(str(banned.pk))
+
+
+def test_city_typeahead(registry, admin_client):
+    poland = Country.objects.create(name='Poland', iso2='PL')
+    masovia = State.objects.create(name='Masovia', iso2='14', country_code='PL', country=poland)
+    silesia = State.objects.create(name='Silesia', iso2='24', country_code='PL', country=poland)
+    City.objects.create(name='Łódź', country_code='PL', state_code='10', country=poland, state=masovia)
+    for name in ('Żyrardów', 'Zielonka', 'Ząbki'):
+        City.objects.create(name=name, country_code='PL', state_code='14', country=poland, state=masovia)
+    City.objects.create(name='Zabrze', country_code='PL', state_code='24', country=poland, state=silesia)
+    registry.invalidate()
+
+    response = admin_client.get('/api/cities/', {'q': 'ZA', 'country': 'pl', 'page_size': 1})
+    assert response.status_code == 200
+    assert [city['name'] for city in response.data['results']] == ['Ząbki']
+
+    response = admin_client.get(response.data['next'])
+    assert [city['name'] for city in response.data['results']] == ['Zabrze']
+
+    response = admin_client.get('/api/cities/', {'q': 'z', 'country': 'PL', 'state': '14'})
+    assert [city['name'] for city in response.data['results']] == ['Ząbki', 'Zielonka', 'Żyrardów']
+
+    response = admin_client.get('/api/states/', {'q': 'sil'})
+    assert [state['iso2'] for state in response.data['results']] == ['24']
+
+    # Cities sharing a name are paged through by id.
+    twin = City.objects.create(name='Ząbki', country_code='PL', state_code='24', country=poland, state=silesia)
+    seen, url = [], '/api/cities/?q=zab&page_size=1'
+    while url:
+        response = admin_client.get(url)
+        seen += [city['id'] for city in response.data['results']]
+        url = response.data['next']
+    assert seen == list(City.objects.filter(search_name__startswith='zab').order_by('search_name', 'id')
+                        .values_list('id', flat=True))
+    assert twin.pk in seen and len(seen) == 3
+
+
+def test_check_locations_repairs_drift():
+    poland = Country.objects.create(name='Poland', iso2='PL')
+    # State codes can be longer than a country code.
+    masovia = State.objects.create(name='Masovia', iso2='PL-MAZOWIECKIE', country=poland)
+    for name in ('Warsaw', 'Radom', 'Płock'):
+        City.objects.create(name=name, country=poland, state=masovia)
+    City.objects.filter(name='Radom').update(country_code='DE', state_code=None)
+    State.objects.update(country_code='')
+
+    assert check_locations(batch_size=2) == {State: 1, City: 1}
+    assert check_locations(repair=True, batch_size=2) == {State: 1, City: 1}
+    assert check_locations() == {State: 0, City: 0}
+    assert City.objects.get(name='Radom').state_code == 'PL-MAZOWIECKIE'
+
+
+def test_city_admin_changelist(admin_client):
+    poland = Country.objects.create(name='Poland', iso2='PL')
+    masovia = State.objects.create(name='Masovia', iso2='14', country=poland)
+    City.objects.create(name='Warsaw', country=poland, state=masovia)
+
+    response = admin_client.get('/admin/locations/city/', {'country__id__exact': poland.pk})
+    assert response.status_code == 200
+    assert 'Warsaw' in response.content.decode()
+
+
+def test_geo_snapshot(tmp_path, django_assert_num_queries):
+    poland = Country.objects.create(name='Poland', iso2='PL')
+    germany = Country.objects.create(name='Germany', iso2='DE')
+    masovia = State.objects.create(name='Masovia', iso2='14', country=poland)
+    State.objects.create(name='Silesia', iso2='24', country=poland)
+    bavaria = State.objects.create(name='Bavaria', iso2='BY', country=germany)
+    for name in ('Warsaw', 'Radom', 'Płock', 'Żyrardów'):
+        City.objects.create(name=name, country=poland, state=masovia)
+    City.objects.create(name='München', country=germany, state=bavaria)
+
+    path = str(tmp_path / 'locations.snapshot')
+    assert export_snapshot(path) == (2, 3, 5)
+
+    snapshot = GeoSnapshot(path)
+    with django_assert_num_queries(0):
+        assert snapshot.is_valid('pl')
+        assert not snapshot.is_valid('FR')
+        assert snapshot.is_valid('PL', 'masovia')
+        assert snapshot.is_valid('PL', '24')
+        assert not snapshot.is_valid('DE', 'Masovia')
+        assert snapshot.is_valid('PL', '14', 'zyrardow')
+        assert snapshot.is_valid('DE', 'Bavaria', 'MÜNCHEN')
+        assert not snapshot.is_valid('PL', 'Silesia', 'Warsaw')
+    snapshot.close()
+
+
+def test_validate_address(settings, tmp_path, django_assert_num_queries):
+    settings.LOCATIONS_SNAPSHOT_PATH = str(tmp_path / 'locations.snapshot')
+    poland = Country.objects.create(name='Poland', iso2='PL')
+    masovia = State.objects.create(name='Masovia', iso2='14', country=poland)
+    City.objects.create(name='Warsaw', country=poland, state=masovia)
+
+    # Without a snapshot, the database is queried.
+    assert get_snapshot() is None
+    validate_address(poland, 'Masovia', 'warsaw')
+    with pytest.raises(ValidationError) as error:
+        validate_address(poland, '14', 'Kraków')
+    assert set(error.value.message_dict) == {'city'}
+
+    export_snapshot()
+    with django_assert_num_queries(0):
+        validate_address(poland, '14', 'Warsaw')
+        with pytest.raises(ValidationError) as error:
+            validate_address(poland, 'Bavaria', 'Munich')
+    assert set(error.value.message_dict) == {'state'}
+
+    # A new export is picked up without restarting the process.
+    City.objects.create(name='Kraków', country=poland, state=masovia)
+    export_snapshot()
+    validate_address(poland, 'Masovia', 'Krakow')
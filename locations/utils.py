@@ -0,0 +1,11 @@
+import unicodedata
+
+
+def normalize_name(value):
+    """
+    Return the case- and accent-insensitive form of a place name, as stored in
+    the ``search_name`` columns and used for prefix search.
+    """
+    decomposed = unicodedata.normalize('NFKD', value or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
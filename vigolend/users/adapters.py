@@ -5,11 +5,23 @@ from allauth.socialaccount.adapter import DefaultSocialAccountAdapter
 from django.conf import settings
 from django.http import HttpRequest
 
+from vigolend.users.tasks import send_email_message, serialize_email
+from vigolend.utils.tasks import PRIORITY_HIGH, enqueue_on_commit
+
 
 class AccountAdapter(DefaultAccountAdapter):
     def is_open_for_signup(self, request: HttpRequest):
         return getattr(settings, "ACCOUNT_ALLOW_REGISTRATION", True)
 
+    def send_mail(self, template_prefix, email, context):
+        # Render in the request, where the context is available, and leave the
+        # SMTP round trip to a worker. Users wait on these (confirmations,
+        # password resets), so they go ahead of other tasks.
+        message = self.render_mail(template_prefix, email, context)
+        enqueue_on_commit(
+            send_email_message, serialize_email(message), priority=PRIORITY_HIGH
+        )
+
 
 class SocialAccountAdapter(DefaultSocialAccountAdapter):
     def is_open_for_signup(self, request: HttpRequest, sociallogin: Any):
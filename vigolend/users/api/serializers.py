@@ -4,11 +4,42 @@ from rest_framework import serializers
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Restrict the serialized fields to the comma separated ``?fields=`` query
+    parameter, e.g. ``?fields=id,email``. Unknown names are ignored.
+    """
+
+    fields_query_param = "fields"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        query_params = getattr(request, "query_params", getattr(request, "GET", {}))
+        requested = query_params.get(self.fields_query_param)
+        if requested:
+            allowed = {name.strip() for name in requested.split(",")}
+            for name in set(self.fields) - allowed:
+                self.fields.pop(name)
+
+    def get_model_fields(self):
+        """Names of the model fields needed to serialize the selected fields."""
+        model_fields = {"pk"}
+        for field in self.fields.values():
+            if field.source != "*":
+                model_fields.add(field.source.split(".")[0])
+        return model_fields
+
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ["username", "name", "url"]
+        fields = ["id", "email", "name", "account_type", "kyc_status", "date_joined", "url"]
 
         extra_kwargs = {
-            "url": {"view_name": "api:user-detail", "lookup_field": "username"}
+            "url": {
+                "view_name": "api:user-detail",
+                "lookup_field": "pk",
+                "lookup_url_kwarg": "username",
+            }
         }
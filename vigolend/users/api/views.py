@@ -1,24 +1,72 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, UpdateModelMixin
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from vigolend.utils.pagination import KeysetPagination
+
 from .serializers import UserSerializer
 
 User = get_user_model()
 
+ME_CACHE_TIMEOUT = 60 * 60
+
+
+class UserPagination(KeysetPagination):
+    """Users in sign-up order, along `user_date_joined_idx`."""
+
+    ordering = ("date_joined", "id")
+
 
 class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericViewSet):
     serializer_class = UserSerializer
     queryset = User.objects.all()
-    lookup_field = "username"
+    pagination_class = UserPagination
+    # The user URLs carry the primary key in their `username` segment.
+    lookup_field = "pk"
+    lookup_url_kwarg = "username"
 
     def get_queryset(self, *args, **kwargs):
-        return self.queryset.filter(id=self.request.user.id)
+        queryset = self.queryset
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(id=self.request.user.id)
+        if self.request.method == "GET":
+            # Only load the columns of the requested fields and the pagination keys.
+            fields = self.get_serializer().get_model_fields()
+            queryset = queryset.only(*fields.union(UserPagination.ordering) - {"pk"})
+        return queryset
 
     @action(detail=False, methods=["GET"])
     def me(self, request):
-        serializer = UserSerializer(request.user, context={"request": request})
-        return Response(status=status.HTTP_200_OK, data=serializer.data)
+        """
+        Serve the current user, versioned by ``User.modified_date``.
+
+        The user is already loaded by authentication, so a matching
+        ``If-None-Match``/``If-Modified-Since`` is answered with a 304 straight
+        away, and otherwise the serialized data costs one cache GET.
+        """
+        user = request.user
+        version = f"{user.pk}-{user.modified_date.timestamp():.6f}"
+        etag = quote_etag(version)
+        last_modified = int(user.modified_date.timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            # Hyperlinks in the payload depend on the requested host.
+            key = f"users:me:{version}:{request.get_host()}:{request.GET.get('fields', '')}"
+            data = cache.get(key)
+            if data is None:
+                data = UserSerializer(user, context={"request": request}).data
+                cache.set(key, data, ME_CACHE_TIMEOUT)
+            response = Response(status=status.HTTP_200_OK, data=data)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -4,7 +4,7 @@ from django.utils.translation import gettext_lazy as _
 
 from django import forms
 
-from locations.models import Country
+from locations.forms import CountryChoiceField
 User = get_user_model()
 
 ACCOUNT_TYPE = (
@@ -22,8 +22,8 @@ class CustomSignupForm(forms.Form):
 
     last_name = forms.CharField(max_length=30, label='Last Names')
 
-    country_of_residence = forms.ModelChoiceField(
-        queryset=Country.objects.filter(accept_signup=True).order_by('name'),
+    country_of_residence = CountryChoiceField(
+        signup_only=True,
         empty_label=_('Country of Residence'),
         help_text=_('A proof of residence will be required.'))
 
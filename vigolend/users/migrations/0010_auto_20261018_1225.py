@@ -0,0 +1,26 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:25
+
+from django.db import migrations
+import django.db.models.deletion
+import locations.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('users', '0009_auto_20210528_1449'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='country_of_residence',
+            field=locations.fields.CountryForeignKey(blank=True, help_text='The country of residence of the customer. KYC Verification will be applied to this country and customer must provide proof of such residence as relevant in the country of jurisdiction.', null=True, on_delete=django.db.models.deletion.SET_NULL, to='locations.country', verbose_name='Country of Residence'),
+        ),
+        migrations.AlterField(
+            model_name='useraddress',
+            name='country',
+            field=locations.fields.CountryForeignKey(help_text='Enter field documentation', on_delete=django.db.models.deletion.PROTECT, to='locations.country', verbose_name='Country'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.1.14 on 2026-10-18 11:02
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_user_date_joined_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='modified_date',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, help_text='Timestamp when the record was modified. Serves as the version stamp of cached user data.', verbose_name='Modified Date'),
+            preserve_default=False,
+        ),
+    ]
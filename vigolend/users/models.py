@@ -1,5 +1,7 @@
 import uuid
+from locations.fields import CountryForeignKey
 from locations.models import Country
+from locations.snapshot import validate_address
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.db import models
@@ -64,7 +66,7 @@ class UserAddress(models.Model):
         max_length=20,
         help_text=_("The zip or Postal code of the address of the user."))
 
-    country = models.ForeignKey(
+    country = CountryForeignKey(
         Country,
         verbose_name=_("Country"),
         on_delete=models.PROTECT,
@@ -80,6 +82,10 @@ class UserAddress(models.Model):
     def __str__(self):
         return self.user.first_name
 
+    def clean(self):
+        super().clean()
+        validate_address(self.country, self.state, self.city)
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -276,7 +282,7 @@ class User(AbstractUser):
         help_text=_("The IP address recorded at the time of registration.")
     )
 
-    country_of_residence = models.ForeignKey(
+    country_of_residence = CountryForeignKey(
         Country,
         verbose_name=_("Country of Residence"),
         blank=True, null=True,
@@ -299,6 +305,12 @@ class User(AbstractUser):
         help_text=_("The job title of the customer.")
     )
 
+    modified_date = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Modified Date"),
+        help_text=_("Timestamp when the record was modified. Serves as the version stamp of cached user data.")
+    )
+
     # pending_cash_balance
     # time_zone
     # salutation
@@ -312,6 +324,10 @@ class User(AbstractUser):
     class Meta:
         verbose_name = _("Register User")
         verbose_name_plural = _("Registered Users")
+        indexes = [
+            # Keyset pagination order of the users API.
+            models.Index(fields=["date_joined", "id"], name="user_date_joined_idx"),
+        ]
 
     def __str__(self):
         return self.email
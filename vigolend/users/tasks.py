@@ -0,0 +1,38 @@
+from smtplib import SMTPException
+
+from django.core.mail import EmailMultiAlternatives
+
+from config import celery_app
+
+
+def serialize_email(message):
+    """JSON-serializable form of an ``EmailMessage``, for ``send_email_message``."""
+    return {
+        "subject": message.subject,
+        "body": message.body,
+        "from_email": message.from_email,
+        "to": message.to,
+        "cc": message.cc,
+        "bcc": message.bcc,
+        "reply_to": message.reply_to,
+        "headers": message.extra_headers,
+        "content_subtype": message.content_subtype,
+        "alternatives": getattr(message, "alternatives", []),
+    }
+
+
+@celery_app.task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    retry_jitter=True,
+    max_retries=6,
+)
+def send_email_message(message):
+    """Send an email serialized with ``serialize_email``."""
+    alternatives = message.pop("alternatives")
+    content_subtype = message.pop("content_subtype")
+    email = EmailMultiAlternatives(**message)
+    email.content_subtype = content_subtype
+    for content, mimetype in alternatives:
+        email.attach_alternative(content, mimetype)
+    email.send()
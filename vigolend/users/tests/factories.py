@@ -7,7 +7,6 @@ from factory.django import DjangoModelFactory
 
 class UserFactory(DjangoModelFactory):
 
-    username = Faker("user_name")
     email = Faker("email")
     name = Faker("name")
 
@@ -29,4 +28,4 @@ class UserFactory(DjangoModelFactory):
 
     class Meta:
         model = get_user_model()
-        django_get_or_create = ["username"]
+        django_get_or_create = ["email"]
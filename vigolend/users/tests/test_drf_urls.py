@@ -8,10 +8,10 @@ pytestmark = pytest.mark.django_db
 
 def test_user_detail(user: User):
     assert (
-        reverse("api:user-detail", kwargs={"username": user.username})
-        == f"/api/users/{user.username}/"
+        reverse("api:user-detail", kwargs={"username": user.pk})
+        == f"/api/users/{user.pk}/"
     )
-    assert resolve(f"/api/users/{user.username}/").view_name == "api:user-detail"
+    assert resolve(f"/api/users/{user.pk}/").view_name == "api:user-detail"
 
 
 def test_user_list():
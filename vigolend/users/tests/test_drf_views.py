@@ -1,8 +1,12 @@
+import base64
+
 import pytest
 from django.test import RequestFactory
+from rest_framework.request import Request
 
 from vigolend.users.api.views import UserViewSet
 from vigolend.users.models import User
+from vigolend.users.tests.factories import UserFactory
 
 pytestmark = pytest.mark.django_db
 
@@ -13,9 +17,11 @@ class TestUserViewSet:
         request = rf.get("/fake-url/")
         request.user = user
 
-        view.request = request
+        view.request = Request(request)
+        view.request.user = user
+        view.format_kwarg = None
 
-        assert user in view.get_queryset()
+        assert list(view.get_queryset()) == [user]
 
     def test_me(self, user: User, rf: RequestFactory):
         view = UserViewSet()
@@ -27,7 +33,84 @@ class TestUserViewSet:
         response = view.me(request)
 
         assert response.data == {
-            "username": user.username,
+            "id": str(user.pk),
+            "email": user.email,
             "name": user.name,
-            "url": f"http://testserver/api/users/{user.username}/",
+            "account_type": user.account_type,
+            "kyc_status": user.kyc_status,
+            "date_joined": response.data["date_joined"],
+            "url": f"http://testserver/api/users/{user.pk}/",
         }
+
+    def test_list_keyset_pagination(self, admin_client, admin_user: User):
+        # Users joining at the same instant are told apart by their id.
+        UserFactory.create_batch(4, date_joined=admin_user.date_joined)
+        seen, pages = [], []
+        url = "/api/users/?page_size=2&fields=id,email"
+        while url:
+            response = admin_client.get(url)
+            assert response.status_code == 200
+            assert all(set(row) == {"id", "email"} for row in response.data["results"])
+            pages.append([row["id"] for row in response.data["results"]])
+            seen += pages[-1]
+            previous, url = response.data["previous"], response.data["next"]
+
+        expected = User.objects.order_by("date_joined", "id").values_list("id", flat=True)
+        assert seen == [str(pk) for pk in expected]
+
+        # The previous links lead back through the same pages.
+        for page in reversed(pages[:-1]):
+            response = admin_client.get(previous)
+            assert [row["id"] for row in response.data["results"]] == page
+            previous = response.data["previous"]
+        assert previous is None
+
+    def test_list_rejects_invalid_cursor(self, admin_client):
+        for position in (b'p=["2021-01-01", "not-a-uuid"]', b"p=not-json", b'p=["2021-01-01"]'):
+            cursor = base64.b64encode(position).decode("ascii")
+            response = admin_client.get("/api/users/", {"cursor": cursor})
+            assert response.status_code == 404
+
+    def test_list_only_loads_requested_fields(self, user: User, rf: RequestFactory):
+        view = UserViewSet()
+        request = rf.get("/fake-url/", {"fields": "email"})
+        request.user = user
+
+        view.request = Request(request)
+        view.request.user = user
+        view.format_kwarg = None
+
+        loaded = view.get_queryset().query.deferred_loading
+        assert loaded == ({"id", "email", "date_joined"}, False)
+
+    def test_me_conditional_get(self, user: User, rf: RequestFactory):
+        view = UserViewSet()
+        response = view.me(self._request(rf, user))
+        etag = response["ETag"]
+        assert response.status_code == 200
+        assert response["Last-Modified"]
+
+        response = view.me(self._request(rf, user, HTTP_IF_NONE_MATCH=etag))
+        assert response.status_code == 304
+
+        user.name = "Renamed"
+        user.save()
+        response = view.me(self._request(rf, user, HTTP_IF_NONE_MATCH=etag))
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert response.data["name"] == "Renamed"
+
+    def test_me_served_from_cache(
+        self, user: User, rf: RequestFactory, django_assert_num_queries
+    ):
+        view = UserViewSet()
+        view.me(self._request(rf, user))
+
+        with django_assert_num_queries(0):
+            response = view.me(self._request(rf, user))
+        assert response.data["email"] == user.email
+
+    def _request(self, rf: RequestFactory, user: User, **headers):
+        request = rf.get("/fake-url/", **headers)
+        request.user = user
+        return request
@@ -6,4 +6,4 @@ pytestmark = pytest.mark.django_db
 
 
 def test_user_get_absolute_url(user: User):
-    assert user.get_absolute_url() == f"/users/{user.username}/"
+    assert user.get_absolute_url() == f"/users/{user.pk}/"
@@ -0,0 +1,44 @@
+import pytest
+from django.contrib.sites.models import Site
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.test import RequestFactory
+
+from vigolend.users.adapters import AccountAdapter
+from vigolend.users.tasks import send_email_message, serialize_email
+from vigolend.utils.tasks import PRIORITY_HIGH
+
+
+def test_send_email_message_roundtrip():
+    message = EmailMultiAlternatives("Subject", "Body", "from@example.com", ["to@example.com"])
+    message.attach_alternative("<p>Body</p>", "text/html")
+
+    send_email_message.delay(serialize_email(message))
+
+    assert len(mail.outbox) == 1
+    sent = mail.outbox[0]
+    assert (sent.subject, sent.body, sent.to) == ("Subject", "Body", ["to@example.com"])
+    assert sent.alternatives == [("<p>Body</p>", "text/html")]
+
+
+# The message is queued on commit, which needs a real transaction.
+@pytest.mark.django_db(transaction=True)
+def test_account_adapter_sends_mail_through_task_queue(rf: RequestFactory, monkeypatch):
+    queued = []
+    monkeypatch.setattr(
+        send_email_message,
+        "apply_async",
+        lambda args, kwargs, priority=None: queued.append((args, priority)),
+    )
+    adapter = AccountAdapter(rf.get("/"))
+
+    adapter.send_mail(
+        "account/email/password_reset_key",
+        "user@example.com",
+        {"current_site": Site(domain="example.com", name="Vigolend"), "password_reset_url": "/reset/"},
+    )
+
+    [((message,), priority)] = queued
+    assert message["to"] == ["user@example.com"]
+    assert priority == PRIORITY_HIGH
+    assert not mail.outbox
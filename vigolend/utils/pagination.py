@@ -0,0 +1,100 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination, by default on the primary key.
+
+    The cursor holds the values of every ordering field of the last row, and
+    the next page is fetched with a row comparison on all of them, e.g.
+    ``(date_joined, id) > (%s, %s)``, so every page is one range scan of an
+    index on the ordering whatever its depth, ties included. The ordering must
+    end with a unique field and go in one direction. Cursor positions are
+    checked against the fields, so a tampered cursor is a 404 rather than a
+    database error.
+    """
+
+    ordering = ("id",)
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [queryset.model._meta.get_field(order.lstrip("-")) for order in self.ordering]
+        directions = {order.startswith("-") for order in self.ordering}
+        assert len(directions) == 1, "Keyset pagination needs all the ordering fields in one direction."
+
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.cursor.position
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+        if position is not None:
+            queryset = queryset.filter(self._beyond(queryset, position, backwards=reverse != directions.pop()))
+
+        # Fetch one extra row to know whether another page follows.
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.next_position = True, position
+            self.has_previous, self.previous_position = following is not None, following
+        else:
+            self.has_next, self.next_position = following is not None, following
+            self.has_previous, self.previous_position = position is not None, position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+        self._values(cursor.position)
+        # Positions are unique, so the offset DRF uses for ties is never needed.
+        return Cursor(offset=0, reverse=cursor.reverse, position=cursor.position)
+
+    def _values(self, position):
+        """The ordering field values encoded in ``position``, or a 404."""
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError(position)
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _beyond(self, queryset, position, backwards):
+        """Condition on the rows after ``position`` in the ordering, or before it if ``backwards``."""
+        quote_name = connections[queryset.db].ops.quote_name
+        table = quote_name(queryset.model._meta.db_table)
+        sql = "({}) {} ({})".format(
+            ", ".join("{}.{}".format(table, quote_name(field.column)) for field in self.fields),
+            "<" if backwards else ">",
+            ", ".join(["%s"] * len(self.fields)),
+        )
+        return RawSQL(sql, self._values(position), output_field=BooleanField())
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            values = [instance[field.name] for field in self.fields]
+        else:
+            values = [getattr(instance, field.attname) for field in self.fields]
+        return json.dumps([str(value) for value in values])
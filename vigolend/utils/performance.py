@@ -0,0 +1,196 @@
+"""
+Request performance instrumentation.
+
+``PerformanceMiddleware`` profiles a ``PERFORMANCE_SAMPLE_RATE`` share of the
+requests; the others only cost a random number. For a profiled request it
+records the view name, the total time, the number and time of the SQL
+queries (through a database ``execute_wrapper``), the cache hits and misses
+and the template render time (which includes the queries run while
+rendering). The profile is:
+
+* logged as one JSON object by the ``vigolend.utils.performance`` logger;
+* if ``PERFORMANCE_SERVER_TIMING`` is on, sent in a ``Server-Timing``
+  header (shown by the browser developer tools) to staff users. Never on
+  publicly cacheable responses, which a CDN would serve to anyone.
+
+The same SQL statement (placeholders included, so with any parameters)
+running ``PERFORMANCE_N_PLUS_ONE_THRESHOLD`` times or more in one request is
+most likely a query per row of an earlier result: these statements are
+listed under ``n_plus_one`` and the profile is logged as a warning.
+"""
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template.base import Template
+from django.utils.cache import cc_delim_re
+
+logger = logging.getLogger(__name__)
+
+# Longest SQL statement logged, in characters.
+SQL_LOG_LENGTH = 300
+_profile = ContextVar("performance_profile", default=None)
+_missing = object()
+
+
+class Profile:
+    """What a request spent its time on."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.statements = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.render_time = 0.0
+        self.rendering = False
+
+    def execute(self, execute, sql, params, many, context):
+        """Database ``execute_wrapper``."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    def repeated_statements(self, threshold):
+        """``[(sql, count)]`` of the statements run at least ``threshold`` times, most run first."""
+        return [(sql, count) for sql, count in self.statements.most_common() if count >= threshold]
+
+
+# region Templates
+_render = Template.render
+
+
+def _profiled_render(self, context):
+    profile = _profile.get()
+    # Included templates are rendered within their parent's time.
+    if profile is None or profile.rendering:
+        return _render(self, context)
+    profile.rendering = True
+    started = time.perf_counter()
+    try:
+        return _render(self, context)
+    finally:
+        profile.render_time += time.perf_counter() - started
+        profile.rendering = False
+
+
+def install_template_timing():
+    """Time ``Template.render`` for profiled requests. Does nothing for the others."""
+    Template.render = _profiled_render
+# endregion
+
+
+# region Caches
+def _counted_get(cache, profile):
+    get = type(cache).get
+
+    def counted(key, default=None, version=None):
+        value = get(cache, key, _missing, version=version)
+        if value is _missing:
+            profile.cache_misses += 1
+            return default
+        profile.cache_hits += 1
+        return value
+
+    return counted
+
+
+def _counted_get_many(cache, profile):
+    get_many = type(cache).get_many
+
+    def counted(keys, version=None):
+        keys = list(keys)
+        values = get_many(cache, keys, version=version)
+        profile.cache_hits += len(values)
+        profile.cache_misses += len(keys) - len(values)
+        return values
+
+    return counted
+
+
+@contextmanager
+def counting_cache_hits(profile):
+    """
+    Count the hits and misses of the caches in ``profile``. Cache instances
+    are per thread, so the counting methods set on them only see this request.
+    """
+    instances = [caches[alias] for alias in settings.CACHES]
+    for cache in instances:
+        cache.get = _counted_get(cache, profile)
+        cache.get_many = _counted_get_many(cache, profile)
+    try:
+        yield
+    finally:
+        for cache in instances:
+            del cache.get, cache.get_many
+# endregion
+
+
+def server_timing(profile, total):
+    return ", ".join([
+        "total;dur={:.1f}".format(total * 1000),
+        'db;dur={:.1f};desc="{} queries"'.format(profile.sql_time * 1000, profile.queries),
+        "render;dur={:.1f}".format(profile.render_time * 1000),
+        'cache;desc="{} hits, {} misses"'.format(profile.cache_hits, profile.cache_misses),
+    ])
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_template_timing()
+
+    @staticmethod
+    def shows_timing(request, response):
+        """Timings reveal the work done per request: only for staff, on responses cached for them only."""
+        directives = {directive.strip().lower() for directive in cc_delim_re.split(response.get("Cache-Control", ""))}
+        user = getattr(request, "user", None)
+        return "public" not in directives and user is not None and user.is_staff
+
+    def __call__(self, request):
+        if random.random() >= settings.PERFORMANCE_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = Profile()
+        token = _profile.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.execute))
+                stack.enter_context(counting_cache_hits(profile))
+                response = self.get_response(request)
+        finally:
+            _profile.reset(token)
+        total = time.perf_counter() - profile.started
+
+        match = request.resolver_match
+        repeated = profile.repeated_statements(settings.PERFORMANCE_N_PLUS_ONE_THRESHOLD)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "duration_ms": round(total * 1000, 1),
+            "queries": profile.queries,
+            "sql_ms": round(profile.sql_time * 1000, 1),
+            "cache_hits": profile.cache_hits,
+            "cache_misses": profile.cache_misses,
+            "render_ms": round(profile.render_time * 1000, 1),
+            "n_plus_one": [{"sql": sql[:SQL_LOG_LENGTH], "count": count} for sql, count in repeated],
+        }
+        logger.log(logging.WARNING if repeated else logging.INFO, json.dumps(record), extra={"performance": record})
+        if settings.PERFORMANCE_SERVER_TIMING and self.shows_timing(request, response):
+            response["Server-Timing"] = server_timing(profile, total)
+        return response
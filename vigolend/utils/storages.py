@@ -9,3 +9,20 @@ class StaticRootS3Boto3Storage(S3Boto3Storage):
 class MediaRootS3Boto3Storage(S3Boto3Storage):
     location = "media"
     file_overwrite = False
+
+    def presigned_post(self, name, content_type, expires_in, max_size):
+        """
+        URL and form fields a client can POST the content of ``name`` to,
+        bypassing Django. The policy pins the key and content type and caps
+        the size at ``max_size`` bytes, which a presigned PUT cannot do.
+        """
+        return self.bucket.meta.client.generate_presigned_post(
+            self.bucket.name,
+            self._normalize_name(self._clean_name(name)),
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_size],
+            ],
+            ExpiresIn=expires_in,
+        )
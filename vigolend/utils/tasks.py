@@ -0,0 +1,19 @@
+from django.db import transaction
+
+# Celery message priorities on the Redis broker: 0 is served first.
+PRIORITY_HIGH = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_LOW = 9
+
+
+def enqueue_on_commit(task, *args, priority=None, **kwargs):
+    """
+    Queue ``task`` once the current transaction commits.
+
+    Requests run inside a transaction (``ATOMIC_REQUESTS``); a task queued
+    straight away could run before its rows are visible, or for a request
+    that ends up rolled back.
+    """
+    transaction.on_commit(
+        lambda: task.apply_async(args, kwargs, priority=priority)
+    )
@@ -0,0 +1,88 @@
+import json
+import logging
+
+import pytest
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from vigolend.users.models import User
+from vigolend.utils.performance import PerformanceMiddleware
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def profile_every_request(settings):
+    settings.PERFORMANCE_SAMPLE_RATE = 1
+    settings.PERFORMANCE_SERVER_TIMING = True
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def capture_profiles(caplog):
+    # The profiles logger does not propagate to the root logger, where caplog listens.
+    logger = logging.getLogger("vigolend.utils.performance")
+    logger.addHandler(caplog.handler)
+    yield
+    logger.removeHandler(caplog.handler)
+
+
+def _records(caplog):
+    return [json.loads(record.getMessage()) for record in caplog.records if record.name == "vigolend.utils.performance"]
+
+
+def test_profiles_are_logged(client, caplog):
+    caplog.set_level(logging.INFO, logger="vigolend.utils.performance")
+
+    client.get(reverse("about_us"))
+    client.get(reverse("about_us"))
+
+    first, second = _records(caplog)
+    assert first["view"] == "about_us"
+    assert first["status"] == 200
+    assert first["queries"] >= 1
+    assert first["render_ms"] > 0
+    assert first["cache_misses"] > 0
+    # The page is served from the cache the second time.
+    assert second["cache_hits"] > 0
+    assert second["render_ms"] == 0
+    assert first["n_plus_one"] == []
+
+
+def test_server_timing_is_only_sent_to_staff(client, admin_client):
+    response = admin_client.get(reverse("admin:index"))
+    assert response["Server-Timing"].startswith("total;dur=")
+    assert "db;dur=" in response["Server-Timing"]
+
+    # Publicly cacheable pages never carry it, even for staff.
+    assert "Server-Timing" not in admin_client.get(reverse("about_us"))
+    assert "Server-Timing" not in client.get(reverse("account_login"))
+
+
+def test_repeated_statements_are_flagged(settings, caplog, user):
+    settings.PERFORMANCE_N_PLUS_ONE_THRESHOLD = 5
+
+    def view(request):
+        for _ in range(6):
+            User.objects.get(pk=user.pk)
+        return HttpResponse()
+
+    PerformanceMiddleware(view)(RequestFactory().get("/"))
+
+    (record,) = [record for record in caplog.records if record.name == "vigolend.utils.performance"]
+    assert record.levelno == logging.WARNING
+    profile = json.loads(record.getMessage())
+    assert profile["queries"] == 6
+    assert profile["n_plus_one"][0]["count"] == 6
+    assert '"users_user"' in profile["n_plus_one"][0]["sql"]
+
+
+def test_unsampled_requests_are_not_profiled(settings, client, caplog):
+    settings.PERFORMANCE_SAMPLE_RATE = 0
+
+    response = client.get(reverse("about_us"))
+
+    assert "Server-Timing" not in response
+    assert _records(caplog) == []